@@ -0,0 +1,211 @@
+# backend/admission.py
+
+"""
+ADMISSION CONTROL
+- Caps concurrent interview sessions per node
+- Extra sessions wait in a bounded FIFO queue with an estimated wait time,
+  and are rejected when the queue is full or the wait times out
+- A queued session whose client disconnects leaves the queue at once,
+  so slots are never handed to closed sockets
+- Per-session token buckets limit audio and upload bytes per second
+All limits come from backend/config.py and are exported as metrics.
+"""
+
+import asyncio
+import math
+import time
+from collections import deque
+from typing import Awaitable, Callable, Deque, Optional
+
+from backend.config import (
+    MAX_ACTIVE_SESSIONS,
+    MAX_QUEUED_SESSIONS,
+    QUEUE_TIMEOUT,
+    QUEUE_UPDATE_INTERVAL,
+    AUDIO_BYTES_PER_SEC,
+    AUDIO_BURST_BYTES,
+    UPLOAD_BYTES_PER_SEC,
+    UPLOAD_BURST_BYTES,
+    MAX_RESUME_BYTES,
+)
+from backend.metrics import Counter, Gauge
+
+ADMITTED_SESSIONS = Gauge(
+    "admission_admitted_sessions",
+    "Sessions currently holding an admission slot"
+)
+
+QUEUED_SESSIONS = Gauge(
+    "admission_queued_sessions",
+    "Sessions waiting for an admission slot"
+)
+
+ADMISSION_DECISIONS = Counter(
+    "admission_decisions_total",
+    "Admission outcomes for new sessions",
+    labels=["outcome"]
+)
+
+THROTTLED_BYTES = Counter(
+    "admission_throttled_bytes_total",
+    "Bytes dropped or refused by per-session rate limits",
+    labels=["kind"]
+)
+
+LIMITS = Gauge(
+    "admission_limit",
+    "Configured admission and rate limits",
+    labels=["name"]
+)
+
+for _name, _value in [
+    ("max_active_sessions", MAX_ACTIVE_SESSIONS),
+    ("max_queued_sessions", MAX_QUEUED_SESSIONS),
+    ("queue_timeout_seconds", QUEUE_TIMEOUT),
+    ("audio_bytes_per_sec", AUDIO_BYTES_PER_SEC),
+    ("audio_burst_bytes", AUDIO_BURST_BYTES),
+    ("upload_bytes_per_sec", UPLOAD_BYTES_PER_SEC),
+    ("upload_burst_bytes", UPLOAD_BURST_BYTES),
+    ("max_resume_bytes", MAX_RESUME_BYTES),
+]:
+    LIMITS.set(_value, name=_name)
+
+
+class TokenBucket:
+    """
+    Classic token bucket: `rate` tokens/second, holding at most `burst`.
+    """
+
+    def __init__(self, rate: float, burst: float):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = burst
+        self.updated = time.monotonic()
+
+    def consume(self, amount: float) -> bool:
+        now = time.monotonic()
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+        if amount > self.tokens:
+            return False
+        self.tokens -= amount
+        return True
+
+
+class ClientGone(Exception):
+    pass
+
+
+class AdmissionController:
+    """
+    Semaphore-like slot pool with a bounded FIFO wait queue.
+    """
+
+    def __init__(self, max_active: int = MAX_ACTIVE_SESSIONS,
+                 max_queued: int = MAX_QUEUED_SESSIONS,
+                 queue_timeout: float = QUEUE_TIMEOUT):
+        self.max_active = max_active
+        self.max_queued = max_queued
+        self.queue_timeout = queue_timeout
+        self.active = 0
+        self._waiters: Deque[asyncio.Future] = deque()
+        # Running average of session length, for wait estimates
+        self.avg_session_seconds = 300.0
+
+    def estimated_wait(self, position: int) -> float:
+        """Seconds until the session at queue `position` (1-based) is admitted."""
+        rounds = math.ceil(position / max(1, self.max_active))
+        return round(rounds * self.avg_session_seconds, 1)
+
+    async def acquire(self, on_update: Callable[[int, float], Awaitable[None]],
+                      watch: Optional[Callable[[], Awaitable[None]]] = None) -> Optional[float]:
+        """
+        Wait for a slot. on_update(position, estimated_wait) is awaited while
+        queued. Returns None when admitted, or the estimated wait in seconds
+        when the session is rejected.
+        watch() runs only while queued and returns when the client has
+        disconnected; the session then leaves the queue with ClientGone.
+        """
+        if self.active < self.max_active and not self._waiters:
+            self._admit()
+            return None
+
+        if len(self._waiters) >= self.max_queued:
+            ADMISSION_DECISIONS.inc(outcome="rejected")
+            return self.estimated_wait(len(self._waiters) + 1)
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        QUEUED_SESSIONS.inc()
+        ADMISSION_DECISIONS.inc(outcome="queued")
+        deadline = time.monotonic() + self.queue_timeout
+        gone = asyncio.ensure_future(watch()) if watch else None
+
+        try:
+            while not waiter.done():
+                if gone is not None and gone.done():
+                    raise ClientGone("client disconnected while queued")
+
+                position = self._waiters.index(waiter) + 1
+                await on_update(position, self.estimated_wait(position))
+
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+
+                await asyncio.wait(
+                    [f for f in (waiter, gone) if f is not None],
+                    timeout=min(QUEUE_UPDATE_INTERVAL, remaining),
+                    return_when=asyncio.FIRST_COMPLETED
+                )
+
+            if waiter.done():
+                if gone is not None and gone.done():
+                    # Handed a slot just as the client left: pass it on
+                    raise ClientGone("client disconnected while queued")
+                return None
+
+            ADMISSION_DECISIONS.inc(outcome="timed_out")
+            return self.estimated_wait(self._waiters.index(waiter) + 1)
+
+        except BaseException:
+            # Caller is leaving (disconnect / cancel) after being handed a slot
+            if waiter.done() and not waiter.cancelled():
+                self.release(0)
+            raise
+
+        finally:
+            if gone is not None:
+                if not gone.done():
+                    gone.cancel()
+                elif not gone.cancelled():
+                    gone.exception()    # a failed receive also means the client is gone
+            QUEUED_SESSIONS.dec()
+            if waiter in self._waiters:
+                self._waiters.remove(waiter)
+            if not waiter.done():
+                waiter.cancel()
+
+    def release(self, session_seconds: float):
+        """Free a slot and hand it to the next waiter."""
+        if session_seconds > 0:
+            self.avg_session_seconds = 0.9 * self.avg_session_seconds + 0.1 * session_seconds
+
+        self.active -= 1
+        ADMITTED_SESSIONS.dec()
+
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                self._admit()
+                waiter.set_result(True)
+                return
+
+    def _admit(self):
+        self.active += 1
+        ADMITTED_SESSIONS.inc()
+        ADMISSION_DECISIONS.inc(outcome="admitted")
+
+
+admission = AdmissionController()
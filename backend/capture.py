@@ -0,0 +1,86 @@
+# backend/capture.py
+
+"""
+SESSION CAPTURE (OPT-IN)
+Records a session's INBOUND WebSocket messages so the session can be
+replayed later by benchmarks/replay.py.
+
+- Only when CAPTURE_ENABLED and the client connects with /ws?capture=1
+- JSON lines in CAPTURE_DIR/capture-<session_id>.jsonl:
+    {"capture_version": 1, "session_id": ..., "started_at": ...}   header
+    {"t": <seconds since connect>, "text": "<JSON message>"}       text frame
+    {"t": <seconds since connect>, "bytes": "<base64>"}            audio frame
+- Capped at CAPTURE_MAX_BYTES per session; the rest is dropped
+"""
+
+import base64
+import json
+import os
+import time
+from typing import Optional
+
+from backend.config import CAPTURE_ENABLED, CAPTURE_DIR, CAPTURE_MAX_BYTES
+
+CAPTURE_VERSION = 1
+
+
+class SessionCapture:
+    """
+    Append-only recorder for ONE session's inbound messages.
+    """
+
+    def __init__(self, session_id: str, directory: str = CAPTURE_DIR,
+                 max_bytes: int = CAPTURE_MAX_BYTES):
+        os.makedirs(directory, exist_ok=True)
+        self.path = os.path.join(directory, f"capture-{session_id}.jsonl")
+        self.max_bytes = max_bytes
+        self.written = 0
+        self.truncated = False
+        self.start = time.monotonic()
+
+        self._file = open(self.path, "w", encoding="utf-8")
+        self._write({
+            "capture_version": CAPTURE_VERSION,
+            "session_id": session_id,
+            "started_at": time.time(),
+        })
+
+    def record(self, message: dict):
+        """Record one ASGI websocket.receive message (text or bytes)."""
+        if self._file is None or self.truncated:
+            return
+
+        entry = {"t": round(time.monotonic() - self.start, 4)}
+        if message.get("text") is not None:
+            entry["text"] = message["text"]
+        elif message.get("bytes") is not None:
+            entry["bytes"] = base64.b64encode(message["bytes"]).decode("ascii")
+        else:
+            return
+
+        self._write(entry)
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def _write(self, entry: dict):
+        line = json.dumps(entry) + "\n"
+        if self.written + len(line) > self.max_bytes:
+            self.truncated = True
+            print(f"Capture truncated at {self.written} bytes: {self.path}")
+            return
+        self._file.write(line)
+        self.written += len(line)
+
+
+def maybe_start(requested: Optional[str], session_id: str) -> Optional[SessionCapture]:
+    """Start a capture if enabled server-side and requested by the client."""
+    if not CAPTURE_ENABLED or requested != "1":
+        return None
+    try:
+        return SessionCapture(session_id)
+    except Exception as e:
+        print(f"Session capture unavailable: {e}")
+        return None
@@ -1,8 +1,118 @@
 # backend/config.py
 
+import os
+
 WHISPER_MODEL = "small"
-OLLAMA_URL = "http://localhost:11434/api/generate"
+OLLAMA_URL = os.getenv("OLLAMA_URL", "http://localhost:11434/api/generate")
+# Several Ollama nodes: comma-separated /api/generate URLs (default: OLLAMA_URL only)
+OLLAMA_URLS = [u.strip() for u in os.getenv("OLLAMA_URLS", OLLAMA_URL).split(",") if u.strip()]
 OLLAMA_MODEL = "llama3"
+OLLAMA_KEEP_ALIVE = "30m"              # keep the model and its KV cache loaded between answers
+OLLAMA_TIMEOUT = 30                    # seconds per /api/generate call
+OLLAMA_MAX_ATTEMPTS = 2                # nodes tried per evaluation before falling back
+
+# Per-node circuit breaker around Ollama (evaluation/ollama_client.py)
+LLM_BREAKER_FAILURES = 3               # consecutive failures / slow calls before opening
+LLM_BREAKER_SLOW_SECONDS = 20.0        # a call at least this slow counts as a failure
+LLM_BREAKER_PROBE_INTERVAL = 5.0       # seconds between /api/tags probes while open
+
+# "whisper" for real transcription, "stub" for load tests without a model
+STT_BACKEND = os.getenv("STT_BACKEND", "whisper")
+STT_STUB_DELAY = float(os.getenv("STT_STUB_DELAY", "0"))   # simulated seconds per chunk
+# Whisper replicas, each owned by one worker thread (speech/model_manager.py).
+# Every replica holds its own copy of each model: memory grows per replica.
+STT_REPLICAS = int(os.getenv("STT_REPLICAS", "1"))
+# torch threads per replica; replicas x threads should not exceed the cores
+STT_THREADS_PER_REPLICA = int(os.getenv(
+    "STT_THREADS_PER_REPLICA", str(max(1, (os.cpu_count() or 1) // STT_REPLICAS))
+))
+# Whisper segments dropped as hallucinations (see speech/stt.py is_reliable)
+STT_NO_SPEECH_THRESHOLD = 0.6          # with avg_logprob below STT_LOGPROB_THRESHOLD
+STT_LOGPROB_THRESHOLD = -1.0           # 0.5 below this drops a segment on its own
+STT_COMPRESSION_RATIO_THRESHOLD = 2.4  # gzip ratio of repetition loops
 
 HOST = "0.0.0.0"
 PORT = 8000
+# permessage-deflate on /ws (uvicorn's default). Set 0 to trade bandwidth
+# for CPU: TTS audio frames are already compressed and gain nothing.
+WS_PER_MESSAGE_DEFLATE = os.getenv("WS_PER_MESSAGE_DEFLATE", "1") == "1"
+
+# Live transcript protocol: full snapshot every N transcript messages
+TRANSCRIPT_SNAPSHOT_EVERY = 20
+
+# Text-to-speech for questions
+TTS_ENABLED = os.getenv("TTS_ENABLED", "1") == "1"
+TTS_ENGINE = "edge"                    # "edge" (network) or "local" (espeak-ng, offline)
+TTS_VOICE = "en-US-AriaNeural"         # Edge TTS voice
+TTS_LOCAL_VOICE = "en-us"              # espeak-ng voice
+TTS_CACHE_DIR = ".cache/tts"
+TTS_CACHE_MAX_BYTES = 200 * 1024 * 1024
+TTS_CHUNK_BYTES = 32 * 1024            # size of each binary frame sent to the browser
+TTS_TIMEOUT = 10.0                     # seconds; after that the question goes out without audio
+
+# Per-session sampling profiler (/ws?profile=<token>); empty token disables it
+PROFILE_TOKEN = os.getenv("PROFILE_TOKEN", "")
+PROFILE_DIR = ".cache/profiles"
+PROFILE_INTERVAL = 0.005               # seconds between samples (200 Hz)
+PROFILE_MAX_OVERHEAD = 0.02            # sampler backs off above 2% of wall time
+PROFILE_MAX_SECONDS = 30 * 60
+PROFILE_MAX_STACKS = 5000              # distinct stacks kept; the rest count as [truncated]
+PROFILE_MAX_BYTES = 2 * 1024 * 1024
+PROFILE_MAX_SESSIONS = 2               # sessions profiled at the same time
+
+# Admission control and per-session rate limits
+MAX_ACTIVE_SESSIONS = int(os.getenv("MAX_ACTIVE_SESSIONS", "20"))   # interviews per node
+MAX_QUEUED_SESSIONS = int(os.getenv("MAX_QUEUED_SESSIONS", "50"))  # waiting sessions before new ones are rejected
+QUEUE_TIMEOUT = float(os.getenv("QUEUE_TIMEOUT", "120"))   # seconds a session may wait for a slot
+QUEUE_UPDATE_INTERVAL = 5              # seconds between queue position updates
+AUDIO_BYTES_PER_SEC = int(os.getenv("AUDIO_BYTES_PER_SEC", str(256 * 1024)))
+AUDIO_BURST_BYTES = int(os.getenv("AUDIO_BURST_BYTES", str(1024 * 1024)))
+UPLOAD_BYTES_PER_SEC = int(os.getenv("UPLOAD_BYTES_PER_SEC", str(2 * 1024 * 1024)))
+UPLOAD_BURST_BYTES = int(os.getenv("UPLOAD_BURST_BYTES", str(12 * 1024 * 1024)))
+MAX_RESUME_BYTES = 10 * 1024 * 1024    # matches the 10MB limit in the frontend
+
+# Load-aware degradation tiers (see backend/degradation.py)
+WHISPER_FALLBACK_MODEL = "base"        # cheaper model used under STT load
+STT_DEGRADED_HOP = 3                   # chunks batched per transcription under STT load
+# Thresholds are floats: "inf" pins a component to its normal tier
+DEGRADE_MIN_DWELL = float(os.getenv("DEGRADE_MIN_DWELL", "30"))    # seconds in a tier before switching back
+DEGRADE_STT_QUEUE_HIGH = float(os.getenv("DEGRADE_STT_QUEUE_HIGH", "8"))   # chunks waiting / in transcription, per replica
+DEGRADE_STT_QUEUE_LOW = float(os.getenv("DEGRADE_STT_QUEUE_LOW", "2"))
+DEGRADE_STT_LATENCY_HIGH = float(os.getenv("DEGRADE_STT_LATENCY_HIGH", "3.0"))   # seconds (EWMA, includes queueing)
+DEGRADE_STT_LATENCY_LOW = float(os.getenv("DEGRADE_STT_LATENCY_LOW", "1.5"))
+DEGRADE_LLM_INFLIGHT_HIGH = float(os.getenv("DEGRADE_LLM_INFLIGHT_HIGH", "4"))  # concurrent Ollama requests per node
+DEGRADE_LLM_INFLIGHT_LOW = float(os.getenv("DEGRADE_LLM_INFLIGHT_LOW", "1"))
+DEGRADE_LLM_LATENCY_HIGH = float(os.getenv("DEGRADE_LLM_LATENCY_HIGH", "15.0"))
+DEGRADE_LLM_LATENCY_LOW = float(os.getenv("DEGRADE_LLM_LATENCY_LOW", "6.0"))
+
+# Opt-in audio archive (speech/audio_store.py). Sessions are archived only
+# when this is on AND the client connects with /ws?archive=1
+AUDIO_STORE_ENABLED = os.getenv("AUDIO_STORE_ENABLED", "0") == "1"
+AUDIO_STORE_DIR = "data/audio"
+AUDIO_STORE_SESSION_BYTES = 64 * 1024 * 1024     # ~35 min of 16 kHz PCM per session
+AUDIO_STORE_MAX_BYTES = 5 * 1024 * 1024 * 1024   # whole archive; oldest sessions go first
+AUDIO_STORE_RETENTION_DAYS = 7
+AUDIO_VAD_THRESHOLD = 500              # int16 RMS of a 30 ms frame counted as voice
+
+# Opt-in capture of inbound messages for benchmarks/replay.py
+# (backend/capture.py). Needs this on AND /ws?capture=1
+CAPTURE_ENABLED = os.getenv("CAPTURE_ENABLED", "0") == "1"
+CAPTURE_DIR = "data/captures"
+CAPTURE_MAX_BYTES = 50 * 1024 * 1024
+
+# Interview records for offline re-scoring (evaluation/records.py)
+RECORDS_ENABLED = True
+RECORDS_DIR = "data/interviews"
+
+# End-of-interview report (evaluation/report.py): sent to the client,
+# and written to REPORTS_DIR when enabled
+REPORTS_ENABLED = True
+REPORTS_DIR = "data/reports"
+REPORT_HTML_CHUNK_CHARS = 16 * 1024   # report_html message size
+
+# Rules-first decision layer (evaluation/decision.py): skip the LLM when
+# the rule classifier is confident either way. Enable only after fitting
+# the classifier on LLM-graded records (python -m evaluation.decision --fit)
+DECISION_ENABLED = os.getenv("DECISION_ENABLED", "0") == "1"
+DECISION_ACCEPT_THRESHOLD = 0.95       # P(acceptable) at or above: graded by rules
+DECISION_REJECT_THRESHOLD = 0.05       # P(acceptable) at or below: graded by rules
@@ -0,0 +1,113 @@
+# backend/degradation.py
+
+"""
+LOAD-AWARE DEGRADATION
+Switches STT and evaluation to cheaper tiers when their backends are
+saturated, and back when load drops:
+
+  STT:        "full"    -> WHISPER_MODEL, every chunk transcribed
+              "reduced" -> WHISPER_FALLBACK_MODEL, STT_DEGRADED_HOP chunks per call
+  EVALUATION: "llm"     -> evaluate_with_llm (Ollama)
+              "rules"   -> fallback_evaluation, marked for deferred LLM re-scoring
+
+Signals are queue depth / in-flight count and an EWMA of recent latency.
+Hysteresis (separate enter/exit thresholds + minimum dwell time) keeps the
+tier from flapping.
+"""
+
+import time
+
+from backend.config import (
+    OLLAMA_URLS,
+    STT_REPLICAS,
+    DEGRADE_MIN_DWELL,
+    DEGRADE_STT_QUEUE_HIGH,
+    DEGRADE_STT_QUEUE_LOW,
+    DEGRADE_STT_LATENCY_HIGH,
+    DEGRADE_STT_LATENCY_LOW,
+    DEGRADE_LLM_INFLIGHT_HIGH,
+    DEGRADE_LLM_INFLIGHT_LOW,
+    DEGRADE_LLM_LATENCY_HIGH,
+    DEGRADE_LLM_LATENCY_LOW,
+)
+from backend.metrics import Counter, Gauge
+
+DEGRADED = Gauge(
+    "degradation_active",
+    "1 when a component runs in its cheaper tier",
+    labels=["component"]
+)
+
+TIER_SWITCHES = Counter(
+    "degradation_switches_total",
+    "Tier changes per component and direction",
+    labels=["component", "direction"]
+)
+
+
+class TierSwitch:
+    """
+    Two-state switch (normal / degraded) driven by load and latency.
+    """
+
+    def __init__(self, component: str, normal_tier: str, degraded_tier: str,
+                 load_high: float, load_low: float,
+                 latency_high: float, latency_low: float,
+                 min_dwell: float = DEGRADE_MIN_DWELL, alpha: float = 0.2):
+        self.component = component
+        self.normal_tier = normal_tier
+        self.degraded_tier = degraded_tier
+        self.load_high = load_high
+        self.load_low = load_low
+        self.latency_high = latency_high
+        self.latency_low = latency_low
+        self.min_dwell = min_dwell
+        self.alpha = alpha
+
+        self.degraded = False
+        self.latency_ewma = 0.0
+        self.changed_at = 0.0
+        DEGRADED.set(0, component=component)
+
+    def record_latency(self, seconds: float):
+        """Feed the latency of a completed call at the normal tier."""
+        self.latency_ewma += self.alpha * (seconds - self.latency_ewma)
+
+    def tier(self, load: float) -> str:
+        """Current tier name, given the current queue depth / in-flight count."""
+        now = time.monotonic()
+
+        if not self.degraded:
+            if load >= self.load_high or self.latency_ewma >= self.latency_high:
+                self._switch(True, now)
+        elif now - self.changed_at >= self.min_dwell:
+            if load <= self.load_low:
+                # No fresh latency samples arrive while degraded,
+                # so start from the exit threshold when recovering
+                self.latency_ewma = min(self.latency_ewma, self.latency_low)
+                self._switch(False, now)
+
+        return self.degraded_tier if self.degraded else self.normal_tier
+
+    def _switch(self, degraded: bool, now: float):
+        self.degraded = degraded
+        self.changed_at = now
+        DEGRADED.set(1 if degraded else 0, component=self.component)
+        TIER_SWITCHES.inc(component=self.component, direction="down" if degraded else "up")
+        print(f"Degradation: {self.component} -> "
+              f"{self.degraded_tier if degraded else self.normal_tier}")
+
+
+# Queue thresholds are per STT replica
+stt_policy = TierSwitch(
+    "stt", "full", "reduced",
+    DEGRADE_STT_QUEUE_HIGH * STT_REPLICAS, DEGRADE_STT_QUEUE_LOW * STT_REPLICAS,
+    DEGRADE_STT_LATENCY_HIGH, DEGRADE_STT_LATENCY_LOW
+)
+
+# In-flight thresholds are per Ollama node
+llm_policy = TierSwitch(
+    "evaluation", "llm", "rules",
+    DEGRADE_LLM_INFLIGHT_HIGH * len(OLLAMA_URLS), DEGRADE_LLM_INFLIGHT_LOW * len(OLLAMA_URLS),
+    DEGRADE_LLM_LATENCY_HIGH, DEGRADE_LLM_LATENCY_LOW
+)
@@ -1,11 +1,13 @@
 # backend/main.py
 
-from fastapi import FastAPI, WebSocket
-from fastapi.responses import HTMLResponse
-from fastapi.staticfiles import StaticFiles
+from fastapi import FastAPI, Request, WebSocket
+from fastapi.responses import HTMLResponse, Response
 from fastapi.middleware.cors import CORSMiddleware
 
 from backend.websocket import interview_socket
+from backend.metrics import render_metrics, CONTENT_TYPE
+from backend.static import load_assets, serve, INDEX
+from evaluation import ollama_client
 
 app = FastAPI()
 
@@ -18,38 +20,59 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Serve frontend static files
-app.mount("/frontend", StaticFiles(directory="frontend"), name="frontend")
+# Frontend files, read and pre-compressed ONCE at startup
+assets = load_assets("frontend")
 
 
 @app.get("/")
-def home():
+def home(request: Request):
     """
     HTTP is used only to LOAD the frontend.
     """
-    try:
-        with open("frontend/index.html", "r", encoding="utf-8") as f:
-            return HTMLResponse(f.read())
-    except FileNotFoundError:
+    if INDEX not in assets:
         return HTMLResponse(
             "<h1>Error: frontend/index.html not found</h1>"
             "<p>Please ensure the frontend directory exists with index.html</p>",
             status_code=500
         )
+    return serve(request, assets[INDEX])
+
+
+@app.get("/frontend/{name}")
+def frontend_file(name: str, request: Request):
+    """
+    Other frontend assets (protocol.js), from memory.
+    """
+    asset = assets.get(name)
+    if asset is None:
+        return Response("Not Found", status_code=404)
+    return serve(request, asset)
 
 
 @app.get("/health")
 def health_check():
     """
-    Simple health check endpoint
+    Health check endpoint.
+    "degraded" while the Ollama circuit breaker is not closed
+    (answers are then graded by rules).
     """
+    llm = ollama_client.health()
     return {
-        "status": "ok",
+        "status": "ok" if llm["state"] == "closed" else "degraded",
         "service": "AI Interview System",
-        "version": "1.0.0"
+        "version": "1.0.0",
+        "llm": llm
     }
 
 
+@app.get("/metrics")
+def metrics():
+    """
+    Prometheus scrape endpoint (stage latency histograms + load gauges)
+    """
+    return Response(render_metrics(), media_type=CONTENT_TYPE)
+
+
 @app.websocket("/ws")
 async def websocket_endpoint(ws: WebSocket):
     """
@@ -0,0 +1,217 @@
+# backend/profiler.py
+
+"""
+PER-SESSION SAMPLING PROFILER
+- Opt-in per WebSocket session: /ws?profile=<PROFILE_TOKEN>
+- A background thread samples the event-loop thread's stack
+- Only samples where THIS session's interview_socket frame is on the
+  stack are kept, so other sessions sharing the loop are excluded
+- Work the session hands to other threads (Whisper, Ollama) is run
+  through run_tagged(); those threads are sampled while the job runs,
+  under a "[worker]" root
+- Output is collapsed-stack text (flamegraph.pl / speedscope compatible)
+- Hard caps on sampler overhead, duration, distinct stacks and file size
+"""
+
+import hmac
+import os
+import sys
+import threading
+import time
+from types import FrameType
+from typing import Callable, Dict, Optional, Set
+
+from backend.config import (
+    PROFILE_TOKEN,
+    PROFILE_DIR,
+    PROFILE_INTERVAL,
+    PROFILE_MAX_OVERHEAD,
+    PROFILE_MAX_SECONDS,
+    PROFILE_MAX_STACKS,
+    PROFILE_MAX_BYTES,
+    PROFILE_MAX_SESSIONS,
+)
+
+TRUNCATED = "[truncated]"
+WORKER_ROOT = "[worker]"
+
+_active_lock = threading.Lock()
+_active_count = 0
+
+_profiled: Set[str] = set()      # session ids being profiled
+_workers: Dict[int, str] = {}    # thread id -> session id of the job it runs
+
+
+def run_tagged(session_id: Optional[str], fn: Callable, *args, **kwargs):
+    """
+    Run fn on a worker thread on behalf of a session. If that session is
+    being profiled, this thread is sampled until fn returns.
+    """
+    if session_id not in _profiled:
+        return fn(*args, **kwargs)
+
+    ident = threading.get_ident()
+    _workers[ident] = session_id
+    try:
+        return fn(*args, **kwargs)
+    finally:
+        _workers.pop(ident, None)
+
+
+_RUN_TAGGED_CODE = run_tagged.__code__
+
+
+def _frame_name(frame: FrameType) -> str:
+    code = frame.f_code
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+
+class SessionProfiler:
+    """
+    Samples one thread's stack, keeping only samples under target_frame.
+    """
+
+    def __init__(self, session_id: str, target_frame: FrameType, thread_id: int):
+        self.session_id = session_id
+        self.target_frame = target_frame
+        self.thread_id = thread_id
+
+        self.interval = PROFILE_INTERVAL
+        self.stacks: Dict[str, int] = {}
+        self.samples = 0
+        self.sampler_seconds = 0.0
+        self.path: Optional[str] = None
+
+        self._stop = threading.Event()
+        self._thread = threading.Thread(
+            target=self._run, name=f"profiler-{session_id}", daemon=True
+        )
+
+    def start(self):
+        self._started = time.perf_counter()
+        self._thread.start()
+
+    def stop(self) -> Optional[str]:
+        """Stop sampling and write the collapsed-stack file. Returns its path."""
+        self._stop.set()
+        if self._thread.is_alive() and self._thread is not threading.current_thread():
+            self._thread.join()
+        return self._write()
+
+    # ---------------------------
+    # SAMPLING
+    # ---------------------------
+
+    def _sample(self):
+        frames = sys._current_frames()
+        self._record(frames.get(self.thread_id))
+
+        for ident, session_id in list(_workers.items()):
+            if session_id == self.session_id:
+                self._record(frames.get(ident), worker=True)
+
+    def _record(self, frame: Optional[FrameType], worker: bool = False):
+        names = []
+
+        while frame is not None:
+            if worker and frame.f_code is _RUN_TAGGED_CODE:
+                names.append(WORKER_ROOT)
+                break
+            names.append(_frame_name(frame))
+            if frame is self.target_frame:
+                break
+            frame = frame.f_back
+        else:
+            # Target frame not on the stack: another session or idle loop
+            # (or the worker finished its job since the snapshot)
+            return
+
+        stack = ";".join(reversed(names))
+        if stack not in self.stacks and len(self.stacks) >= PROFILE_MAX_STACKS:
+            stack = TRUNCATED
+        self.stacks[stack] = self.stacks.get(stack, 0) + 1
+        self.samples += 1
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            start = time.perf_counter()
+            self._sample()
+            self.sampler_seconds += time.perf_counter() - start
+
+            elapsed = start - self._started
+            if elapsed > PROFILE_MAX_SECONDS:
+                print(f"Profiler {self.session_id}: max duration reached")
+                return
+
+            # Back off when the sampler itself costs too much
+            if elapsed > 0 and self.sampler_seconds / elapsed > PROFILE_MAX_OVERHEAD:
+                self.interval = min(self.interval * 2, 1.0)
+
+    # ---------------------------
+    # OUTPUT
+    # ---------------------------
+
+    def _write(self) -> Optional[str]:
+        if not self.stacks:
+            return None
+
+        os.makedirs(PROFILE_DIR, exist_ok=True)
+        self.path = os.path.join(PROFILE_DIR, f"session-{self.session_id}.folded")
+
+        written = 0
+        with open(self.path, "w", encoding="utf-8") as f:
+            # Heaviest stacks first so the size cap drops the long tail
+            for stack, count in sorted(self.stacks.items(), key=lambda kv: -kv[1]):
+                line = f"{stack} {count}\n"
+                written += len(line.encode("utf-8"))
+                if written > PROFILE_MAX_BYTES:
+                    break
+                f.write(line)
+
+        overhead = self.sampler_seconds / max(1e-9, time.perf_counter() - self._started)
+        print(f"Profiler {self.session_id}: {self.samples} samples, "
+              f"{overhead:.2%} overhead -> {self.path}")
+        return self.path
+
+
+def maybe_start(token: Optional[str], session_id: str, target_frame: FrameType) -> Optional[SessionProfiler]:
+    """
+    Start profiling the calling session if the request carried a valid token
+    and the concurrent profile limit is not reached.
+    """
+    global _active_count
+
+    # Constant-time comparison: the token must not leak through timing
+    if not PROFILE_TOKEN or not token or not hmac.compare_digest(
+        token.encode("utf-8"), PROFILE_TOKEN.encode("utf-8")
+    ):
+        return None
+
+    with _active_lock:
+        if _active_count >= PROFILE_MAX_SESSIONS:
+            print(f"Profiler: limit of {PROFILE_MAX_SESSIONS} sessions reached, skipping {session_id}")
+            return None
+        _active_count += 1
+
+    profiler = SessionProfiler(session_id, target_frame, threading.get_ident())
+    _profiled.add(session_id)
+    profiler.start()
+    return profiler
+
+
+def finish(profiler: Optional[SessionProfiler]) -> Optional[str]:
+    """
+    Stop a profiler started by maybe_start() and release its slot.
+    Blocking (joins the sampler, writes the file): call it from a worker thread.
+    """
+    global _active_count
+
+    if profiler is None:
+        return None
+
+    _profiled.discard(profiler.session_id)
+    try:
+        return profiler.stop()
+    finally:
+        with _active_lock:
+            _active_count -= 1
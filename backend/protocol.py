@@ -0,0 +1,91 @@
+# backend/protocol.py
+
+"""
+WEBSOCKET PROTOCOL
+- Message type names, kept in sync with frontend/protocol.js
+- Server → client encoding is negotiated at connect time:
+    /ws                     JSON text frames (default)
+    /ws?encoding=msgpack    MessagePack binary frames
+- The first message (hello) is always JSON so the client learns the encoding
+- Client → server messages stay JSON text; binary frames from the client are audio
+"""
+
+import json
+from typing import Dict
+
+from fastapi import WebSocket
+
+try:
+    import msgpack
+except ImportError:  # optional dependency, JSON still works
+    msgpack = None
+
+
+# ---------------------------
+# MESSAGE TYPES
+# ---------------------------
+
+# Server → client
+HELLO = "hello"
+QUEUED = "queued"
+STATUS = "status"
+QUESTION = "question"
+AUDIO_START = "audio_start"
+AUDIO_CHUNK = "audio_chunk"      # msgpack only; JSON mode sends raw binary frames
+AUDIO_END = "audio_end"
+TRANSCRIPT_DELTA = "transcript_delta"
+TRANSCRIPT_SNAPSHOT = "transcript_snapshot"
+RESULT = "result"
+REPORT = "report"                # final report JSON
+REPORT_HTML = "report_html"      # rendered report, in chunks; last has "final": true
+
+# Client → server
+RESUME_PDF = "resume_pdf"
+RESUME = "resume"
+PROCESS = "process"
+TRANSCRIPT_RESYNC = "transcript_resync"
+
+SERVER_TYPES = (
+    HELLO, QUEUED, STATUS, QUESTION, AUDIO_START, AUDIO_CHUNK, AUDIO_END,
+    TRANSCRIPT_DELTA, TRANSCRIPT_SNAPSHOT, RESULT, REPORT, REPORT_HTML
+)
+CLIENT_TYPES = (RESUME_PDF, RESUME, PROCESS, TRANSCRIPT_RESYNC)
+
+JSON = "json"
+MSGPACK = "msgpack"
+
+
+def negotiate(ws: WebSocket) -> str:
+    """Pick the encoding requested in the query string, if supported."""
+    requested = ws.query_params.get("encoding", JSON)
+    if requested == MSGPACK and msgpack is not None:
+        return MSGPACK
+    return JSON
+
+
+class Channel:
+    """
+    Sends protocol messages over one WebSocket in the negotiated encoding.
+    """
+
+    def __init__(self, ws: WebSocket, encoding: str = JSON):
+        self.ws = ws
+        self.encoding = encoding
+
+    async def hello(self):
+        await self.ws.send_text(json.dumps({"type": HELLO, "encoding": self.encoding}))
+
+    async def send(self, message: Dict):
+        if self.encoding == MSGPACK:
+            await self.ws.send_bytes(msgpack.packb(message, use_bin_type=True))
+        else:
+            await self.ws.send_text(json.dumps(message, separators=(",", ":")))
+
+    async def send_audio(self, chunk: bytes):
+        if self.encoding == MSGPACK:
+            await self.send({"type": AUDIO_CHUNK, "data": chunk})
+        else:
+            await self.ws.send_bytes(chunk)
+
+    async def status(self, message: str):
+        await self.send({"type": STATUS, "message": message})
@@ -0,0 +1,131 @@
+# backend/static.py
+
+"""
+STATIC FRONTEND
+- frontend/ files are read ONCE at startup and served from memory
+- Each file is pre-compressed: gzip always, brotli when installed
+- Variant chosen from Accept-Encoding (br > gzip > identity), Vary set
+- ETag per variant; If-None-Match -> 304 Not Modified
+- index.html links other assets with ?v=<hash>, so those are cached
+  as immutable; index.html itself is revalidated on every load
+"""
+
+import gzip
+import hashlib
+import mimetypes
+import os
+import re
+from typing import Dict, Optional
+
+from starlette.requests import Request
+from starlette.responses import Response
+
+try:
+    import brotli
+except ImportError:  # optional dependency, gzip still works
+    brotli = None
+
+INDEX = "index.html"
+
+REVALIDATE = "no-cache"
+IMMUTABLE = "public, max-age=31536000, immutable"
+
+# Below this size compression is not worth the extra round of headers
+MIN_COMPRESS_BYTES = 512
+
+
+class StaticAsset:
+    """
+    One file in memory, with its compressed variants.
+    """
+
+    def __init__(self, name: str, body: bytes):
+        self.name = name
+        # text/* types get "; charset=utf-8" from the Response class
+        self.media_type = mimetypes.guess_type(name)[0] or "application/octet-stream"
+
+        self.version = hashlib.sha256(body).hexdigest()[:16]
+        self.variants: Dict[str, bytes] = {"identity": body}
+
+        if len(body) >= MIN_COMPRESS_BYTES:
+            self.variants["gzip"] = gzip.compress(body, compresslevel=9, mtime=0)
+            if brotli is not None:
+                self.variants["br"] = brotli.compress(body, quality=11)
+
+    def etag(self, encoding: str) -> str:
+        return f'"{self.version}-{encoding}"' if encoding != "identity" else f'"{self.version}"'
+
+
+def load_assets(directory: str = "frontend") -> Dict[str, StaticAsset]:
+    """
+    Read every file in the frontend directory. Asset links in index.html
+    get a ?v=<content hash> suffix so they can be cached forever.
+    """
+    files = {}
+    for name in sorted(os.listdir(directory)):
+        path = os.path.join(directory, name)
+        if os.path.isfile(path):
+            with open(path, "rb") as f:
+                files[name] = f.read()
+
+    assets = {name: StaticAsset(name, body) for name, body in files.items() if name != INDEX}
+
+    if INDEX in files:
+        html = files[INDEX].decode("utf-8")
+        for name, asset in assets.items():
+            html = re.sub(
+                rf'(["\'])/frontend/{re.escape(name)}\1',
+                rf'\1/frontend/{name}?v={asset.version}\1',
+                html
+            )
+        assets[INDEX] = StaticAsset(INDEX, html.encode("utf-8"))
+
+    return assets
+
+
+def _accepted(accept_encoding: str) -> Dict[str, float]:
+    """Accept-Encoding -> {coding: q}"""
+    accepted = {}
+    for part in accept_encoding.split(","):
+        coding, _, params = part.strip().partition(";")
+        if not coding:
+            continue
+        q = 1.0
+        match = re.search(r"q=([0-9.]+)", params)
+        if match:
+            try:
+                q = float(match.group(1))
+            except ValueError:
+                q = 0.0
+        accepted[coding.strip().lower()] = q
+    return accepted
+
+
+def choose_encoding(asset: StaticAsset, accept_encoding: Optional[str]) -> str:
+    accepted = _accepted(accept_encoding or "")
+    for coding in ("br", "gzip"):
+        q = accepted.get(coding, accepted.get("*", 0.0))
+        if coding in asset.variants and q > 0:
+            return coding
+    return "identity"
+
+
+def serve(request: Request, asset: StaticAsset) -> Response:
+    encoding = choose_encoding(asset, request.headers.get("accept-encoding"))
+    etag = asset.etag(encoding)
+
+    versioned = request.query_params.get("v") == asset.version
+    headers = {
+        "ETag": etag,
+        "Cache-Control": IMMUTABLE if versioned else REVALIDATE,
+        "Vary": "Accept-Encoding",
+    }
+
+    if_none_match = request.headers.get("if-none-match", "")
+    if etag in [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")] or if_none_match.strip() == "*":
+        return Response(status_code=304, headers=headers)
+
+    if encoding != "identity":
+        headers["Content-Encoding"] = encoding
+
+    return Response(asset.variants[encoding], media_type=asset.media_type, headers=headers)
@@ -0,0 +1,76 @@
+# backend/transcript.py
+
+"""
+ANSWER TRANSCRIPT
+- Kept as an ordered list of segments with stable ids
+- The client receives only appended / revised segments (transcript_delta)
+- Every message carries a sequence number; a full transcript_snapshot is
+  sent periodically, and on request, so clients can resync
+"""
+
+from typing import Dict, List
+
+from backend.config import TRANSCRIPT_SNAPSHOT_EVERY
+from backend.protocol import TRANSCRIPT_DELTA, TRANSCRIPT_SNAPSHOT
+
+
+class Transcript:
+    def __init__(self, snapshot_every: int = TRANSCRIPT_SNAPSHOT_EVERY):
+        self.snapshot_every = snapshot_every
+        self.segments: List[Dict] = []
+        self.seq = 0
+        self._by_id: Dict[int, Dict] = {}
+        self._next_id = 0
+        self._since_snapshot = 0
+
+    def append(self, text: str) -> Dict:
+        """Add a new segment at the end."""
+        segment = {"id": self._next_id, "text": text.strip()}
+        self._next_id += 1
+        self.segments.append(segment)
+        self._by_id[segment["id"]] = segment
+        return segment
+
+    def revise(self, segment_id: int, text: str) -> Dict:
+        """Replace the text of an existing segment."""
+        segment = self._by_id[segment_id]
+        segment["text"] = text.strip()
+        return segment
+
+    def text(self) -> str:
+        """Full answer text (built once, when the answer is evaluated)."""
+        return " ".join(s["text"] for s in self.segments if s["text"])
+
+    def clear(self):
+        """Start a new answer. Ids and seq keep increasing."""
+        self.segments = []
+        self._by_id = {}
+
+    # ---------------------------
+    # PROTOCOL MESSAGES
+    # ---------------------------
+
+    def delta_message(self, changed: List[Dict]) -> Dict:
+        """
+        Message for changed segments, or a full snapshot when one is due.
+        """
+        if self._since_snapshot + 1 >= self.snapshot_every:
+            return self.snapshot_message()
+
+        self.seq += 1
+        self._since_snapshot += 1
+        return {
+            "type": TRANSCRIPT_DELTA,
+            "seq": self.seq,
+            "segments": [dict(s) for s in changed]
+        }
+
+    def snapshot_message(self) -> Dict:
+        """Message carrying every segment of the current answer."""
+        self.seq += 1
+        self._since_snapshot = 0
+        return {
+            "type": TRANSCRIPT_SNAPSHOT,
+            "seq": self.seq,
+            "segments": [dict(s) for s in self.segments]
+        }
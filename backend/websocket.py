@@ -4,14 +4,95 @@ import json
 import base64
 import tempfile
 import os
+import sys
+import uuid
+import time
+import asyncio
 from fastapi import WebSocket
-from typing import Optional
+from typing import Dict, Optional, Tuple
 
+from backend.config import TTS_ENABLED, TTS_CHUNK_BYTES, TTS_TIMEOUT, MAX_RESUME_BYTES
+from backend.config import (
+    AUDIO_BYTES_PER_SEC, AUDIO_BURST_BYTES, UPLOAD_BYTES_PER_SEC, UPLOAD_BURST_BYTES
+)
+from backend.config import WHISPER_MODEL, WHISPER_FALLBACK_MODEL, STT_DEGRADED_HOP
+from backend.config import RECORDS_ENABLED, AUDIO_STORE_ENABLED
+from backend.config import REPORTS_ENABLED, REPORT_HTML_CHUNK_CHARS
+from backend.metrics import timer, STAGE_SECONDS, ACTIVE_SESSIONS, STT_QUEUE_DEPTH, OLLAMA_INFLIGHT
+from backend import profiler
+from backend import capture
+from backend.transcript import Transcript
+from backend import protocol
+from backend.protocol import Channel, negotiate
+from backend.admission import admission, TokenBucket, THROTTLED_BYTES
+from backend.degradation import stt_policy, llm_policy
 from interview.resume_parser import parse_resume, pdf_to_text
-from interview.question_generator import generate_questions
-from speech.stt import transcribe_chunk
+from interview.question_generator import generate_question_plan
+from speech.stt import transcribe_async, filter_segments, speech_seconds
+from speech.audio_store import AudioStore
 from evaluation.rules import run_rules
-from evaluation.llm_eval import evaluate_with_llm
+from evaluation.llm_eval import evaluate_with_llm, fallback_evaluation, PROMPT_VERSION
+from evaluation.records import build_record, write_record
+from evaluation.report import ReportBuilder, write_report
+from speech import tts
+
+
+async def send_question(channel: Channel, text: str):
+    """
+    Send question text, then stream its spoken audio:
+    audio_start -> N audio chunks -> audio_end
+    """
+    await channel.send({
+        "type": protocol.QUESTION,
+        "text": text
+    })
+
+    if not TTS_ENABLED:
+        return
+
+    try:
+        audio, mime = await asyncio.wait_for(tts.synthesize(text), TTS_TIMEOUT)
+    except asyncio.TimeoutError:
+        print(f"TTS timed out after {TTS_TIMEOUT}s; question sent without audio")
+        return
+    except Exception as e:
+        print(f"TTS error: {e}")
+        return
+
+    await channel.send({
+        "type": protocol.AUDIO_START,
+        "mime": mime,
+        "size": len(audio)
+    })
+
+    view = memoryview(audio)
+    for offset in range(0, len(audio), TTS_CHUNK_BYTES):
+        await channel.send_audio(bytes(view[offset:offset + TTS_CHUNK_BYTES]))
+
+    await channel.send({"type": protocol.AUDIO_END})
+
+
+async def send_report(channel: Channel, builder: ReportBuilder) -> Tuple[Dict, str]:
+    """
+    Send the final report: report (JSON) -> N report_html chunks.
+    Totals were kept as answers came in, so this is formatting only.
+    """
+    report = builder.report(completed=True)
+    page = builder.html(report)
+
+    await channel.send({
+        "type": protocol.REPORT,
+        "data": report
+    })
+
+    for offset in range(0, len(page), REPORT_HTML_CHUNK_CHARS):
+        await channel.send({
+            "type": protocol.REPORT_HTML,
+            "data": page[offset:offset + REPORT_HTML_CHUNK_CHARS],
+            "final": offset + REPORT_HTML_CHUNK_CHARS >= len(page)
+        })
+
+    return report, page
 
 
 async def interview_socket(ws: WebSocket):
@@ -22,21 +103,149 @@ async def interview_socket(ws: WebSocket):
 
     await ws.accept()
 
+    channel = Channel(ws, negotiate(ws))
+    await channel.hello()
+
+    # -------- ADMISSION --------
+    async def send_queue_position(position: int, estimated_wait: float):
+        await channel.send({
+            "type": protocol.QUEUED,
+            "position": position,
+            "estimated_wait": estimated_wait
+        })
+
+    # Messages that arrive while queued (e.g. an early resume upload),
+    # handled once admitted
+    early_messages = []
+
+    async def watch_disconnect():
+        """Receive while queued; returns when the client disconnects."""
+        buffered = 0
+        while True:
+            message = await ws.receive()
+            if message["type"] == "websocket.disconnect":
+                return
+            buffered += len(message.get("text") or message.get("bytes") or "")
+            if buffered > MAX_RESUME_BYTES:
+                return      # more than a resume while queued: drop the client
+            early_messages.append(message)
+
+    try:
+        rejected_wait = await admission.acquire(send_queue_position, watch_disconnect)
+    except Exception:
+        # Client left while queued (ClientGone) or a queue update failed
+        return
+
+    if rejected_wait is not None:
+        await channel.status(f"Error: Server is busy. Please try again in about {int(rejected_wait)} seconds.")
+        await ws.close(code=1013)   # Try Again Later
+        return
+
+    session_start = time.monotonic()
+    session_started_at = time.time()
+    session_id = uuid.uuid4().hex[:12]
+    session_profiler = None
+    session_capture = None
+
     # -------- SESSION STATE --------
     resume_text: Optional[str] = None
+    parsed_resume = None
     questions = []
     current_question_index = 0
 
-    transcript = ""   # accumulated TEXT (not audio)
+    transcript = Transcript()   # answer TEXT as segments (not audio)
+    pending_audio = []          # chunks not yet transcribed (batched under STT load)
+    answer_stt_tiers = set()    # STT tiers used for the current answer
+    answer_speech = {"seconds": 0.0, "dropped": 0}   # word-timed speech, dropped STT segments
 
-    await ws.send_json({
-        "type": "status",
-        "message": "Interview session started. Please upload your resume PDF."
-    })
+    answers = []                # one record per processed question (incl. grading tiers)
+    report_builder: Optional[ReportBuilder] = None   # per-question results, aggregated as they come
+    final_report: Optional[Tuple[Dict, str]] = None  # (JSON, HTML) once sent
+
+    prefetch_task: Optional[asyncio.Task] = None   # warms TTS cache for all questions
+
+    # Opt-in archive of this session's decoded audio
+    audio_store: Optional[AudioStore] = None
+
+    audio_bucket = TokenBucket(AUDIO_BYTES_PER_SEC, AUDIO_BURST_BYTES)
+    upload_bucket = TokenBucket(UPLOAD_BYTES_PER_SEC, UPLOAD_BURST_BYTES)
+    audio_throttle_notified = False
+
+    async def flush_audio(stt_tier: str):
+        """Transcribe buffered audio chunks in one call and send the new segment."""
+        if not pending_audio:
+            return
+
+        # Separate files (WAV/WebM each): decoded one by one, never byte-joined
+        audio = list(pending_audio)
+        pending_audio.clear()
+        answer_stt_tiers.add(stt_tier)
+        model_name = WHISPER_FALLBACK_MODEL if stt_tier == "reduced" else WHISPER_MODEL
+
+        try:
+            start = time.perf_counter()
+            # Queue depth counts chunks, not calls (a reduced-tier call carries several)
+            STT_QUEUE_DEPTH.inc(len(audio))
+            try:
+                with timer("transcribe_chunk"):
+                    stt_segments = await transcribe_async(
+                        audio, model_name, audio_store, current_question_index, session_id
+                    )
+            finally:
+                STT_QUEUE_DEPTH.dec(len(audio))
+            if stt_tier == "full":
+                stt_policy.record_latency(time.perf_counter() - start)
+
+            # Drop no-speech / low-confidence hallucinations before they
+            # reach the transcript (and the evaluator)
+            stt_segments, dropped = filter_segments(stt_segments)
+            answer_speech["dropped"] += dropped
+            answer_speech["seconds"] += speech_seconds(stt_segments)
+            chunk_text = " ".join(seg["text"] for seg in stt_segments)
+
+            if chunk_text:
+                segment = transcript.append(chunk_text)
 
+                # Send only the new segment (periodic full snapshot)
+                await channel.send(transcript.delta_message([segment]))
+        except Exception as e:
+            print(f"Transcription error: {e}")
+            # Don't send error to client for transcription failures
+
+    # Everything from here on runs under the finally that frees the slot
+    ACTIVE_SESSIONS.inc()
     try:
+        session_profiler = profiler.maybe_start(
+            ws.query_params.get("profile"), session_id, sys._getframe()
+        )
+        session_capture = capture.maybe_start(ws.query_params.get("capture"), session_id)
+
+        if AUDIO_STORE_ENABLED and ws.query_params.get("archive") == "1":
+            try:
+                audio_store = AudioStore(session_id)
+            except Exception as e:
+                print(f"Audio archive unavailable: {e}")
+
+        await channel.status("Interview session started. Please upload your resume PDF.")
+
+        handling_since = None
         while True:
-            message = await ws.receive()
+            # Handling cost of the previous message (every `continue` path
+            # included); time spent waiting for the candidate is not counted
+            if handling_since is not None:
+                STAGE_SECONDS.observe(time.perf_counter() - handling_since, stage="ws_message")
+
+            if early_messages:
+                message = early_messages.pop(0)
+            else:
+                message = await ws.receive()
+            handling_since = time.perf_counter()
+
+            if message["type"] == "websocket.disconnect":
+                break
+
+            if session_capture:
+                session_capture.record(message)
 
             # ==============================
             # TEXT MESSAGES (JSON)
@@ -47,20 +256,29 @@ async def interview_socket(ws: WebSocket):
                     msg_type = data.get("type")
 
                     # ---------- RESUME PDF ----------
-                    if msg_type == "resume_pdf":
+                    if msg_type == protocol.RESUME_PDF:
                         filename = data.get("filename", "resume.pdf")
                         base64_data = data.get("data", "")
                         
                         if not base64_data:
-                            await ws.send_json({
-                                "type": "status",
-                                "message": "Error: No PDF data received"
-                            })
+                            await channel.status("Error: No PDF data received")
+                            continue
+
+                        # Check size BEFORE decoding (base64 is 4/3 of the raw size)
+                        pdf_size = len(base64_data) * 3 // 4
+                        if pdf_size > MAX_RESUME_BYTES:
+                            await channel.status(f"Error: PDF too large. Maximum size is {MAX_RESUME_BYTES // (1024 * 1024)}MB")
+                            continue
+
+                        if not upload_bucket.consume(pdf_size):
+                            THROTTLED_BYTES.inc(pdf_size, kind="upload")
+                            await channel.status("Error: Too many uploads. Please wait a moment and retry.")
                             continue
 
                         try:
                             # Decode base64 to bytes
-                            pdf_bytes = base64.b64decode(base64_data)
+                            with timer("base64_decode"):
+                                pdf_bytes = base64.b64decode(base64_data)
                             
                             # Save to temporary file
                             with tempfile.NamedTemporaryFile(suffix=".pdf", delete=False) as tmp:
@@ -70,39 +288,34 @@ async def interview_socket(ws: WebSocket):
                             
                             try:
                                 # Extract text from PDF
-                                await ws.send_json({
-                                    "type": "status",
-                                    "message": f"Processing {filename}..."
-                                })
+                                await channel.status(f"Processing {filename}...")
                                 
-                                resume_text = pdf_to_text(tmp_path)
+                                with timer("pdf_to_text"):
+                                    resume_text = pdf_to_text(tmp_path)
                                 
                                 if not resume_text or len(resume_text.strip()) < 50:
-                                    await ws.send_json({
-                                        "type": "status",
-                                        "message": "Error: Could not extract text from PDF. Please ensure it's not a scanned image."
-                                    })
+                                    await channel.status("Error: Could not extract text from PDF. Please ensure it's not a scanned image.")
                                     continue
                                 
                                 # Parse + generate questions
-                                await ws.send_json({
-                                    "type": "status",
-                                    "message": "Analyzing your resume..."
-                                })
+                                await channel.status("Analyzing your resume...")
                                 
-                                parsed_resume = parse_resume(resume_text)
-                                questions = generate_questions(parsed_resume)
+                                with timer("parse_resume"):
+                                    parsed_resume = parse_resume(resume_text)
+                                with timer("generate_questions"):
+                                    plan = generate_question_plan(parsed_resume)
+                                questions = [item["text"] for item in plan]
+                                report_builder = ReportBuilder(session_id, plan, parsed_resume, session_started_at)
                                 current_question_index = 0
 
-                                await ws.send_json({
-                                    "type": "status",
-                                    "message": f"Generated {len(questions)} questions from your resume!"
-                                })
+                                if TTS_ENABLED:
+                                    if prefetch_task:
+                                        prefetch_task.cancel()
+                                    prefetch_task = asyncio.create_task(tts.prefetch(questions))
 
-                                await ws.send_json({
-                                    "type": "question",
-                                    "text": questions[current_question_index]
-                                })
+                                await channel.status(f"Generated {len(questions)} questions from your resume!")
+
+                                await send_question(channel, questions[current_question_index])
                                 
                             finally:
                                 # Clean up temp file
@@ -113,106 +326,139 @@ async def interview_socket(ws: WebSocket):
                                     
                         except Exception as e:
                             print(f"PDF processing error: {e}")
-                            await ws.send_json({
-                                "type": "status",
-                                "message": f"Error processing PDF: {str(e)}"
-                            })
+                            await channel.status(f"Error processing PDF: {str(e)}")
 
                     # ---------- RESUME TEXT (fallback) ----------
-                    elif msg_type == "resume":
+                    elif msg_type == protocol.RESUME:
                         resume_text = data.get("text", "").strip()
                         
                         if not resume_text:
-                            await ws.send_json({
-                                "type": "status",
-                                "message": "Error: Resume text is empty"
-                            })
+                            await channel.status("Error: Resume text is empty")
+                            continue
+
+                        text_size = len(message["text"])
+                        if text_size > MAX_RESUME_BYTES or not upload_bucket.consume(text_size):
+                            THROTTLED_BYTES.inc(text_size, kind="upload")
+                            await channel.status("Error: Resume too large or sent too often")
                             continue
 
                         try:
                             # Parse + generate questions ONCE
-                            parsed_resume = parse_resume(resume_text)
-                            questions = generate_questions(parsed_resume)
+                            with timer("parse_resume"):
+                                parsed_resume = parse_resume(resume_text)
+                            with timer("generate_questions"):
+                                plan = generate_question_plan(parsed_resume)
+                            questions = [item["text"] for item in plan]
+                            report_builder = ReportBuilder(session_id, plan, parsed_resume, session_started_at)
                             current_question_index = 0
 
-                            await ws.send_json({
-                                "type": "status",
-                                "message": f"Generated {len(questions)} questions from your resume"
-                            })
+                            if TTS_ENABLED:
+                                if prefetch_task:
+                                    prefetch_task.cancel()
+                                prefetch_task = asyncio.create_task(tts.prefetch(questions))
+
+                            await channel.status(f"Generated {len(questions)} questions from your resume")
 
-                            await ws.send_json({
-                                "type": "question",
-                                "text": questions[current_question_index]
-                            })
+                            await send_question(channel, questions[current_question_index])
                         except Exception as e:
                             print(f"Resume parsing error: {e}")
-                            await ws.send_json({
-                                "type": "status",
-                                "message": f"Error processing resume: {str(e)}"
-                            })
+                            await channel.status(f"Error processing resume: {str(e)}")
+
+                    # ---------- TRANSCRIPT RESYNC ----------
+                    elif msg_type == protocol.TRANSCRIPT_RESYNC:
+                        await channel.send(transcript.snapshot_message())
 
                     # ---------- PROCESS ANSWER ----------
-                    elif msg_type == "process":
-                        if not transcript.strip():
-                            await ws.send_json({
-                                "type": "result",
-                                "data": {
-                                    "score": 0,
-                                    "clarity": "low",
-                                    "depth": "low",
-                                    "feedback": "No answer provided. Please record your answer."
-                                }
-                            })
+                    elif msg_type == protocol.PROCESS:
+                        # Transcribe audio still buffered by a longer STT hop
+                        await flush_audio(stt_policy.tier(STT_QUEUE_DEPTH.value()))
+
+                        answer_text = transcript.text()
+                        answer_seconds = round(answer_speech["seconds"], 2) or None
+                        rules_result = None
+                        evaluation_tier = None
+
+                        if not answer_text:
+                            llm_result = {
+                                "score": 0,
+                                "clarity": "low",
+                                "depth": "low",
+                                "feedback": "No answer provided. Please record your answer."
+                            }
                         else:
                             try:
                                 # RULES FIRST (non-negotiable)
-                                rules_result = run_rules(transcript)
-
-                                # LLM evaluation (local Ollama)
-                                llm_result = evaluate_with_llm(
-                                    transcript=transcript,
-                                    rules=rules_result
-                                )
-
-                                # Send evaluation result
-                                await ws.send_json({
-                                    "type": "result",
-                                    "data": llm_result
-                                })
+                                with timer("run_rules"):
+                                    rules_result = run_rules(
+                                        answer_text,
+                                        duration_seconds=answer_seconds,
+                                        skills=(parsed_resume or {}).get("skills")
+                                    )
+
+                                evaluation_tier = llm_policy.tier(OLLAMA_INFLIGHT.value())
+
+                                if evaluation_tier == "rules":
+                                    # Ollama saturated: grade with rules now, LLM re-scores later
+                                    llm_result = fallback_evaluation(answer_text, rules_result)
+                                    llm_result["deferred_rescore"] = True
+                                else:
+                                    # LLM evaluation (local Ollama), off the event loop
+                                    start = time.perf_counter()
+                                    with timer("evaluate_with_llm"):
+                                        llm_result = await asyncio.to_thread(
+                                            profiler.run_tagged, session_id,
+                                            evaluate_with_llm,
+                                            transcript=answer_text,
+                                            rules=rules_result
+                                        )
+                                    if llm_result.get("graded_by") == "llm":
+                                        llm_policy.record_latency(time.perf_counter() - start)
                             except Exception as e:
                                 print(f"Evaluation error: {e}")
-                                await ws.send_json({
-                                    "type": "result",
-                                    "data": {
-                                        "score": 0,
-                                        "clarity": "low",
-                                        "depth": "low",
-                                        "feedback": f"Evaluation failed: {str(e)}"
-                                    }
-                                })
+                                llm_result = {
+                                    "score": 0,
+                                    "clarity": "low",
+                                    "depth": "low",
+                                    "feedback": f"Evaluation failed: {str(e)}"
+                                }
+
+                        # Send evaluation result
+                        await channel.send({
+                            "type": protocol.RESULT,
+                            "data": llm_result
+                        })
+
+                        answers.append({
+                            "question_index": current_question_index,
+                            "question": questions[current_question_index] if current_question_index < len(questions) else None,
+                            "transcript": answer_text,
+                            "speech_seconds": answer_seconds,
+                            "dropped_segments": answer_speech["dropped"],
+                            "rules": rules_result,
+                            "result": llm_result,
+                            "stt_tier": "reduced" if "reduced" in answer_stt_tiers else "full",
+                            "evaluation_tier": evaluation_tier,
+                        })
+                        if report_builder:
+                            report_builder.add(current_question_index, answer_text, llm_result)
 
                         # Clear transcript AFTER evaluation
-                        transcript = ""
+                        transcript.clear()
+                        answer_stt_tiers.clear()
+                        answer_speech.update(seconds=0.0, dropped=0)
 
                         # Move to next question
                         current_question_index += 1
                         if current_question_index < len(questions):
-                            await ws.send_json({
-                                "type": "question",
-                                "text": questions[current_question_index]
-                            })
+                            await send_question(channel, questions[current_question_index])
                         else:
-                            await ws.send_json({
-                                "type": "status",
-                                "message": "Interview completed! Thank you."
-                            })
+                            await channel.status("Interview completed! Thank you.")
+                            if report_builder and current_question_index == len(questions):
+                                final_report = await send_report(channel, report_builder)
 
                 except json.JSONDecodeError as e:
                     print(f"JSON decode error: {e}")
-                    await ws.send_json({
-                        "type": "status",
-                        "message": "Invalid message format"
-                    })
+                    await channel.status("Invalid message format")
 
             # ==============================
             # BINARY MESSAGES (AUDIO)
@@ -220,25 +466,61 @@ async def interview_socket(ws: WebSocket):
             elif "bytes" in message:
                 audio_bytes = message["bytes"]
 
-                try:
-                    # Transcribe EACH chunk independently
-                    chunk_text = transcribe_chunk(audio_bytes)
+                if not audio_bucket.consume(len(audio_bytes)):
+                    THROTTLED_BYTES.inc(len(audio_bytes), kind="audio")
+                    if not audio_throttle_notified:
+                        audio_throttle_notified = True
+                        await channel.status("Error: Audio is arriving faster than allowed; some audio was dropped.")
+                    continue
 
-                    if chunk_text:
-                        transcript += " " + chunk_text
+                # Transcribe EACH chunk independently, or every
+                # STT_DEGRADED_HOP chunks while the STT pool is saturated
+                stt_tier = stt_policy.tier(STT_QUEUE_DEPTH.value())
+                pending_audio.append(audio_bytes)
 
-                        # Send FULL accumulated transcript
-                        await ws.send_json({
-                            "type": "transcript",
-                            "text": transcript.strip()
-                        })
-                except Exception as e:
-                    print(f"Transcription error: {e}")
-                    # Don't send error to client for transcription failures
+                hop = STT_DEGRADED_HOP if stt_tier == "reduced" else 1
+                if len(pending_audio) >= hop:
+                    await flush_audio(stt_tier)
 
     except Exception as e:
         print(f"WebSocket error: {e}")
     finally:
+        ACTIVE_SESSIONS.dec()
+        admission.release(time.monotonic() - session_start)
+        if session_profiler:
+            # Sampler join + file write: off the event loop
+            await asyncio.to_thread(profiler.finish, session_profiler)
+        if session_capture:
+            session_capture.close()
+        if prefetch_task:
+            prefetch_task.cancel()
+        if audio_store:
+            try:
+                await asyncio.to_thread(audio_store.close)
+            except Exception as e:
+                print(f"Audio archive close error: {e}")
+
+        # Persist the interview for offline re-scoring
+        if RECORDS_ENABLED and answers:
+            try:
+                record = build_record(
+                    session_id, session_started_at, questions, answers,
+                    parsed_resume, PROMPT_VERSION
+                )
+                await asyncio.to_thread(write_record, record)
+            except Exception as e:
+                print(f"Record write error: {e}")
+
+        # Save the report; a session that ended early gets a partial one
+        if REPORTS_ENABLED and report_builder and report_builder.questions:
+            try:
+                if final_report is None:
+                    report = report_builder.report(completed=False)
+                    final_report = (report, report_builder.html(report))
+                await asyncio.to_thread(write_report, *final_report)
+            except Exception as e:
+                print(f"Report write error: {e}")
+
         try:
             await ws.close()
         except:
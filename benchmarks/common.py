@@ -0,0 +1,215 @@
+# benchmarks/common.py
+
+"""
+Shared helpers for the benchmark tools:
+- latency summaries (p50/p95/p99)
+- CPU / RSS sampling of the server process
+- spawning the server with local stand-ins (stub STT, fake Ollama)
+- synthetic fixtures (resume text, 1 s WAV chunks)
+"""
+
+import io
+import math
+import os
+import struct
+import subprocess
+import sys
+import threading
+import time
+import urllib.request
+import wave
+from typing import Dict, List, Optional
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+# ---------------------------
+# STATISTICS
+# ---------------------------
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(pct / 100 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+def summarize(samples: List[float]) -> Dict[str, float]:
+    """Summary of latency samples given in seconds, reported in ms."""
+    values = sorted(samples)
+    if not values:
+        return {"count": 0}
+    return {
+        "count": len(values),
+        "mean_ms": round(sum(values) / len(values) * 1000, 3),
+        "p50_ms": round(percentile(values, 50) * 1000, 3),
+        "p95_ms": round(percentile(values, 95) * 1000, 3),
+        "p99_ms": round(percentile(values, 99) * 1000, 3),
+        "max_ms": round(values[-1] * 1000, 3),
+    }
+
+
+# ---------------------------
+# PROCESS SAMPLING
+# ---------------------------
+
+class ProcessSampler:
+    """
+    Samples CPU% and RSS of a process in a background thread.
+    Uses psutil when installed, otherwise /proc (Linux only).
+    """
+
+    def __init__(self, pid: int, interval: float = 0.5):
+        self.pid = pid
+        self.interval = interval
+        self.cpu_samples: List[float] = []
+        self.rss_samples: List[int] = []
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def stop(self) -> Dict[str, Optional[float]]:
+        self._stop.set()
+        self._thread.join()
+        if not self.rss_samples:
+            return {"cpu_percent_avg": None, "cpu_percent_max": None, "rss_peak_mb": None}
+        return {
+            "cpu_percent_avg": round(sum(self.cpu_samples) / max(1, len(self.cpu_samples)), 1),
+            "cpu_percent_max": round(max(self.cpu_samples, default=0.0), 1),
+            "rss_peak_mb": round(max(self.rss_samples) / (1024 * 1024), 1),
+        }
+
+    def _read(self):
+        try:
+            import psutil
+            proc = psutil.Process(self.pid)
+            times = proc.cpu_times()
+            return times.user + times.system, proc.memory_info().rss
+        except ImportError:
+            pass
+
+        with open(f"/proc/{self.pid}/stat") as f:
+            fields = f.read().rsplit(")", 1)[1].split()
+        ticks = os.sysconf("SC_CLK_TCK")
+        cpu = (int(fields[11]) + int(fields[12])) / ticks
+        rss = int(fields[21]) * os.sysconf("SC_PAGE_SIZE")
+        return cpu, rss
+
+    def _run(self):
+        try:
+            last_cpu, _ = self._read()
+        except Exception:
+            return
+        last_time = time.monotonic()
+
+        while not self._stop.wait(self.interval):
+            try:
+                cpu, rss = self._read()
+            except Exception:
+                return
+            now = time.monotonic()
+            self.cpu_samples.append((cpu - last_cpu) / (now - last_time) * 100)
+            self.rss_samples.append(rss)
+            last_cpu, last_time = cpu, now
+
+
+# ---------------------------
+# SERVER WITH LOCAL STAND-INS
+# ---------------------------
+
+def spawn_server(port: int, env_overrides: Dict[str, str], timeout: float = 60.0) -> subprocess.Popen:
+    """
+    Start the FastAPI app with uvicorn in a child process and wait for /health.
+    """
+    env = dict(os.environ)
+    env.update(env_overrides)
+
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "backend.main:app",
+         "--host", "127.0.0.1", "--port", str(port), "--log-level", "warning",
+         "--ws-per-message-deflate", "true" if env.get("WS_PER_MESSAGE_DEFLATE", "1") == "1" else "false"],
+        cwd=REPO_ROOT,
+        env=env
+    )
+
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if proc.poll() is not None:
+            raise RuntimeError(f"Server exited with code {proc.returncode}")
+        try:
+            with urllib.request.urlopen(f"http://127.0.0.1:{port}/health", timeout=1):
+                return proc
+        except OSError:
+            time.sleep(0.2)
+
+    proc.terminate()
+    raise RuntimeError("Server did not become healthy in time")
+
+
+def stop_server(proc: subprocess.Popen):
+    proc.terminate()
+    try:
+        proc.wait(timeout=10)
+    except subprocess.TimeoutExpired:
+        proc.kill()
+
+
+# ---------------------------
+# FIXTURES
+# ---------------------------
+
+SAMPLE_RESUME = """
+Jane Candidate
+Backend Engineer
+
+SKILLS
+Python, FastAPI, PostgreSQL, Docker, Kubernetes, machine learning
+
+PROJECTS
+Built a real-time interview platform using FastAPI and WebSockets
+Designed a distributed job scheduler with Redis and Python
+Created a machine learning pipeline for resume ranking
+
+EXPERIENCE
+Software Engineer at Example Corp (2021-2024)
+Backend Intern at Startup Inc (2020)
+"""
+
+
+def synthetic_wav_chunk(seconds: float = 1.0, sample_rate: int = 16000, freq: float = 220.0) -> bytes:
+    """A mono 16-bit WAV tone; stands in for a recorded 1 s audio chunk."""
+    frames = int(seconds * sample_rate)
+    samples = (
+        int(8000 * math.sin(2 * math.pi * freq * i / sample_rate))
+        for i in range(frames)
+    )
+    buffer = io.BytesIO()
+    with wave.open(buffer, "wb") as w:
+        w.setnchannels(1)
+        w.setsampwidth(2)
+        w.setframerate(sample_rate)
+        w.writeframes(struct.pack(f"<{frames}h", *samples))
+    return buffer.getvalue()
+
+
+def load_audio_fixtures(directory: Optional[str]) -> List[bytes]:
+    """
+    Load *.wav / *.webm files from a directory (each file = one chunk).
+    Falls back to a synthetic 1 s WAV when no directory is given.
+    """
+    if not directory:
+        return [synthetic_wav_chunk()]
+
+    chunks = []
+    for name in sorted(os.listdir(directory)):
+        if name.lower().endswith((".wav", ".webm")):
+            with open(os.path.join(directory, name), "rb") as f:
+                chunks.append(f.read())
+
+    if not chunks:
+        raise ValueError(f"No .wav or .webm fixtures found in {directory}")
+    return chunks
@@ -0,0 +1,89 @@
+# benchmarks/corpus.py
+
+"""
+SYNTHETIC CORPUS
+Deterministic resumes, transcripts and LLM responses of a target size,
+used by the micro-benchmarks to draw scaling curves.
+"""
+
+import json
+import random
+from typing import List
+
+SIZES = [1_000, 4_000, 16_000, 64_000, 256_000, 1_000_000]
+
+_WORDS = (
+    "designed implemented service latency throughput database cache queue "
+    "deployed pipeline api endpoint scaled users reduced improved tested "
+    "monitoring team feature migration refactor model training inference "
+    "the a and with for of to in on using built"
+).split()
+
+_SKILLS = [
+    "python", "java", "javascript", "fastapi", "django", "flask", "sql",
+    "postgresql", "mongodb", "docker", "kubernetes", "linux", "git",
+    "machine learning", "deep learning", "react", "node", "express"
+]
+
+_FILLERS = ["um", "uh", "like", "you know", "basically"]
+
+
+def _sentence(rng: random.Random, words: int) -> str:
+    return " ".join(rng.choice(_WORDS) for _ in range(words)).capitalize() + "."
+
+
+def resume(size: int, seed: int = 0) -> str:
+    """A multi-section resume of roughly `size` characters."""
+    rng = random.Random(seed)
+    lines: List[str] = ["Jane Candidate", "Software Engineer", ""]
+    sections = ["SKILLS", "PROJECTS", "EXPERIENCE", "EDUCATION"]
+    length = 0
+    i = 0
+
+    while length < size:
+        header = sections[i % len(sections)]
+        lines.append(header)
+        for _ in range(rng.randint(3, 8)):
+            if header == "SKILLS":
+                line = ", ".join(rng.sample(_SKILLS, 5))
+            else:
+                line = "- " + _sentence(rng, rng.randint(8, 20))
+                if rng.random() < 0.3:
+                    line += " Used " + rng.choice(_SKILLS) + "."
+            lines.append(line)
+            length += len(line) + 1
+        lines.append("")
+        i += 1
+
+    return "\n".join(lines)[:size]
+
+
+def transcript(size: int, seed: int = 0) -> str:
+    """A spoken-style answer of roughly `size` characters."""
+    rng = random.Random(seed)
+    parts: List[str] = []
+    length = 0
+
+    while length < size:
+        if rng.random() < 0.1:
+            word = rng.choice(_FILLERS)
+        elif rng.random() < 0.1:
+            word = rng.choice(_SKILLS)
+        else:
+            word = rng.choice(_WORDS)
+        parts.append(word)
+        length += len(word) + 1
+
+    return " ".join(parts)[:size]
+
+
+def llm_response(size: int, seed: int = 0) -> str:
+    """Raw LLM output (format="json"): an evaluation JSON whose feedback fills `size`."""
+    rng = random.Random(seed)
+    feedback = transcript(max(0, size - 200), seed)
+    return json.dumps({
+        "score": rng.randint(0, 10),
+        "clarity": rng.choice(["low", "medium", "high"]),
+        "depth": rng.choice(["low", "medium", "high"]),
+        "feedback": feedback,
+    })
@@ -0,0 +1,141 @@
+# benchmarks/fake_ollama.py
+
+"""
+FAKE OLLAMA SERVER
+- Local stand-in for the Ollama HTTP API used by evaluation/llm_eval.py
+- POST /api/generate returns a valid evaluation JSON after a configurable delay
+- GET  /api/tags lists a single model (used by health probes)
+- Deterministic: the same prompt always gets the same score
+- Mimics Ollama's prompt cache: tokens (words) shared with the start of
+  the previous request (system + prompt) are not re-evaluated; the rest
+  count as prompt_eval tokens (1 ms each, reported but not slept)
+
+Usage:
+    python -m benchmarks.fake_ollama --port 11500 --latency 0.8 --jitter 0.2
+"""
+
+import argparse
+import hashlib
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class FakeOllamaHandler(BaseHTTPRequestHandler):
+    # Set per server instance through make_server()
+    latency = 0.0
+    jitter = 0.0
+    failure_rate = 0.0
+    model = "llama3"
+    cache = None        # {"tokens": [...], "lock": Lock} per server
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send_json(self, status: int, body: dict):
+        payload = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def do_GET(self):
+        if self.path == "/api/tags":
+            self._send_json(200, {"models": [{"name": f"{self.model}:latest"}]})
+        else:
+            self._send_json(404, {"error": "not found"})
+
+    def do_POST(self):
+        if self.path != "/api/generate":
+            self._send_json(404, {"error": "not found"})
+            return
+
+        length = int(self.headers.get("Content-Length", 0))
+        request = json.loads(self.rfile.read(length) or b"{}")
+        prompt = request.get("prompt", "")
+        tokens = request.get("system", "").split() + prompt.split()
+        with self.cache["lock"]:
+            cached = 0
+            for a, b in zip(tokens, self.cache["tokens"]):
+                if a != b:
+                    break
+                cached += 1
+            self.cache["tokens"] = tokens
+        new_tokens = len(tokens) - cached
+
+        delay = self.latency + random.uniform(-self.jitter, self.jitter)
+        time.sleep(max(0.0, delay))
+
+        if self.failure_rate and random.random() < self.failure_rate:
+            self._send_json(500, {"error": "simulated failure"})
+            return
+
+        digest = int(hashlib.sha256(prompt.encode("utf-8")).hexdigest(), 16)
+        levels = ["low", "medium", "high"]
+        evaluation = {
+            "score": digest % 11,
+            "clarity": levels[digest % 3],
+            "depth": levels[(digest // 3) % 3],
+            "feedback": "Simulated feedback from the fake Ollama server."
+        }
+
+        self._send_json(200, {
+            "model": request.get("model", self.model),
+            "response": json.dumps(evaluation),
+            "done": True,
+            "context": list(range(len(tokens) + 40)),
+            "prompt_eval_count": new_tokens,
+            "prompt_eval_duration": new_tokens * 1_000_000,
+            "eval_count": 40
+        })
+
+
+def make_server(port: int = 0, latency: float = 0.0, jitter: float = 0.0,
+                failure_rate: float = 0.0, host: str = "127.0.0.1") -> ThreadingHTTPServer:
+    """
+    Create (but do not start) a fake server. port=0 picks a free port.
+    """
+    handler = type("Handler", (FakeOllamaHandler,), {
+        "latency": latency,
+        "jitter": jitter,
+        "failure_rate": failure_rate,
+        "cache": {"tokens": [], "lock": threading.Lock()},
+    })
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    return server
+
+
+def start_in_background(**kwargs) -> ThreadingHTTPServer:
+    """
+    Start a fake server on a daemon thread. Returns the server;
+    its URL is http://127.0.0.1:<server.server_address[1]>.
+    """
+    server = make_server(**kwargs)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Fake Ollama server for benchmarks")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=11500)
+    parser.add_argument("--latency", type=float, default=0.5, help="seconds per generate call")
+    parser.add_argument("--jitter", type=float, default=0.1, help="+/- seconds of random jitter")
+    parser.add_argument("--failure-rate", type=float, default=0.0, help="fraction of HTTP 500s")
+    args = parser.parse_args()
+
+    server = make_server(args.port, args.latency, args.jitter, args.failure_rate, args.host)
+    print(f"Fake Ollama listening on http://{args.host}:{server.server_address[1]}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
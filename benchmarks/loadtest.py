@@ -0,0 +1,277 @@
+# benchmarks/loadtest.py
+
+"""
+LOAD TEST
+Drives N simulated candidates against /ws concurrently:
+  resume upload -> per question: 1 s audio chunks -> "process" -> result
+
+Reports sessions/sec, p50/p95/p99 latency per message type and server
+CPU/RSS, as JSON (so results can be diffed between releases).
+
+Each candidate is closed-loop: after sending an audio chunk it waits for the
+matching transcript before pacing the next one, so latencies are attributed
+to the right message. Chunks that produce no transcript (silence with real
+Whisper) are counted under "audio_no_transcript" after --audio-timeout.
+
+Examples:
+    # Everything local: spawns fake Ollama + server with stub STT
+    python -m benchmarks.loadtest --spawn --sessions 50 --concurrency 10
+
+    # Three fake Ollama nodes behind the server's load balancer
+    python -m benchmarks.loadtest --spawn --llm-nodes 3 --llm-latency 2
+
+    # Cost of permessage-deflate: compare with and without
+    python -m benchmarks.loadtest --spawn --no-deflate
+
+    # Against a running server
+    python -m benchmarks.loadtest --url ws://localhost:8000/ws --server-pid 1234
+"""
+
+import argparse
+import asyncio
+import base64
+import json
+import os
+import platform
+import sys
+import time
+from collections import defaultdict
+from typing import Dict, List, Optional
+
+import websockets
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+from benchmarks.common import (
+    ProcessSampler,
+    SAMPLE_RESUME,
+    load_audio_fixtures,
+    spawn_server,
+    stop_server,
+    summarize,
+)
+from benchmarks import fake_ollama
+
+
+class SessionError(Exception):
+    pass
+
+
+async def next_message(ws, types: tuple, timeout: float) -> Optional[dict]:
+    """
+    Read messages until one of the given types arrives.
+    Raw binary frames (question audio in JSON mode) and other message
+    types are skipped. Returns None on timeout.
+    """
+    deadline = time.perf_counter() + timeout
+    while True:
+        remaining = deadline - time.perf_counter()
+        if remaining <= 0:
+            return None
+        try:
+            raw = await asyncio.wait_for(ws.recv(), remaining)
+        except asyncio.TimeoutError:
+            return None
+        if isinstance(raw, bytes):
+            if not getattr(ws, "msgpack", False):
+                continue
+            message = msgpack.unpackb(raw)
+        else:
+            message = json.loads(raw)
+        if message.get("type") == "hello":
+            ws.msgpack = message.get("encoding") == "msgpack"
+        if message.get("type") in types:
+            return message
+
+
+def build_resume_message(path: Optional[str]) -> str:
+    if path and path.lower().endswith(".pdf"):
+        with open(path, "rb") as f:
+            data = base64.b64encode(f.read()).decode("ascii")
+        return json.dumps({"type": "resume_pdf", "filename": os.path.basename(path), "data": data})
+
+    text = SAMPLE_RESUME
+    if path:
+        with open(path, encoding="utf-8") as f:
+            text = f.read()
+    return json.dumps({"type": "resume", "text": text})
+
+
+async def run_candidate(args, resume_message: str, chunks: List[bytes],
+                        latencies: Dict[str, List[float]], counters: Dict[str, int]):
+    """One simulated candidate, start to finish."""
+    start = time.perf_counter()
+    url = f"{args.url}?encoding={args.encoding}"
+    compression = None if args.no_deflate else "deflate"
+    async with websockets.connect(url, max_size=None, open_timeout=args.timeout,
+                                  compression=compression) as ws:
+        if not await next_message(ws, ("status",), args.timeout):
+            raise SessionError("no welcome status")
+        latencies["connect"].append(time.perf_counter() - start)
+
+        sent = time.perf_counter()
+        await ws.send(resume_message)
+        question = await next_message(ws, ("question",), args.timeout)
+        if not question:
+            raise SessionError("no question after resume")
+        latencies["resume"].append(time.perf_counter() - sent)
+
+        for q in range(args.questions):
+            for c in range(args.chunks):
+                chunk = chunks[(q * args.chunks + c) % len(chunks)]
+                sent = time.perf_counter()
+                await ws.send(chunk)
+                transcript = await next_message(
+                    ws, ("transcript_delta", "transcript_snapshot"), args.audio_timeout
+                )
+                elapsed = time.perf_counter() - sent
+                if transcript:
+                    latencies["audio"].append(elapsed)
+                else:
+                    counters["audio_no_transcript"] += 1
+                if args.chunk_interval > elapsed:
+                    await asyncio.sleep(args.chunk_interval - elapsed)
+
+            sent = time.perf_counter()
+            await ws.send(json.dumps({"type": "process"}))
+            if not await next_message(ws, ("result",), args.timeout):
+                raise SessionError("no result after process")
+            latencies["process"].append(time.perf_counter() - sent)
+
+            follow_up = await next_message(ws, ("question", "status"), args.timeout)
+            if not follow_up or follow_up["type"] != "question":
+                break
+
+    latencies["session"].append(time.perf_counter() - start)
+
+
+async def run_load(args) -> dict:
+    resume_message = build_resume_message(args.resume)
+    chunks = load_audio_fixtures(args.audio_dir)
+
+    latencies: Dict[str, List[float]] = defaultdict(list)
+    counters: Dict[str, int] = defaultdict(int)
+    semaphore = asyncio.Semaphore(args.concurrency)
+
+    async def guarded(index: int):
+        if args.ramp:
+            await asyncio.sleep(args.ramp * index / args.sessions)
+        async with semaphore:
+            try:
+                await run_candidate(args, resume_message, chunks, latencies, counters)
+                counters["completed"] += 1
+            except Exception as e:
+                counters["failed"] += 1
+                if counters["failed"] <= 5:
+                    print(f"Session failed: {e!r}", file=sys.stderr)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(guarded(i) for i in range(args.sessions)))
+    duration = time.perf_counter() - start
+
+    return {
+        "duration_s": round(duration, 3),
+        "sessions": {
+            "requested": args.sessions,
+            "completed": counters["completed"],
+            "failed": counters["failed"],
+            "per_second": round(counters["completed"] / duration, 3) if duration else 0.0,
+        },
+        "audio_no_transcript": counters["audio_no_transcript"],
+        "latency": {name: summarize(values) for name, values in sorted(latencies.items())},
+    }
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Concurrent interview load test")
+    parser.add_argument("--url", default="ws://127.0.0.1:8000/ws")
+    parser.add_argument("--sessions", type=int, default=20, help="total candidates")
+    parser.add_argument("--concurrency", type=int, default=5, help="candidates at once")
+    parser.add_argument("--ramp", type=float, default=0.0, help="spread session starts over N seconds")
+    parser.add_argument("--questions", type=int, default=3, help="questions answered per session")
+    parser.add_argument("--chunks", type=int, default=5, help="audio chunks per answer")
+    parser.add_argument("--chunk-interval", type=float, default=1.0, help="seconds between chunks (0 = max speed)")
+    parser.add_argument("--audio-dir", help="directory of .wav/.webm chunk fixtures")
+    parser.add_argument("--resume", help="resume .pdf or .txt (default: built-in sample)")
+    parser.add_argument("--timeout", type=float, default=60.0)
+    parser.add_argument("--audio-timeout", type=float, default=10.0)
+    parser.add_argument("--encoding", choices=["json", "msgpack"], default="json",
+                        help="server -> client message encoding")
+    parser.add_argument("--no-deflate", action="store_true",
+                        help="do not offer permessage-deflate (with --spawn: server disables it too)")
+    parser.add_argument("--server-pid", type=int, help="sample CPU/RSS of this process")
+    parser.add_argument("--output", help="write JSON report here (default: stdout)")
+
+    spawn = parser.add_argument_group("local stand-ins")
+    spawn.add_argument("--spawn", action="store_true", help="start fake Ollama + server with stub STT")
+    spawn.add_argument("--port", type=int, default=8765)
+    spawn.add_argument("--real-stt", action="store_true", help="use Whisper instead of the stub STT")
+    spawn.add_argument("--stt-delay", type=float, default=0.0, help="stub STT seconds per chunk")
+    spawn.add_argument("--llm-latency", type=float, default=0.5)
+    spawn.add_argument("--llm-jitter", type=float, default=0.1)
+    spawn.add_argument("--llm-nodes", type=int, default=1, help="fake Ollama servers (OLLAMA_URLS)")
+    return parser.parse_args(argv)
+
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+    if args.encoding == "msgpack" and msgpack is None:
+        raise SystemExit("--encoding msgpack requires: pip install msgpack")
+
+    server_proc = None
+    fakes = []
+    if args.spawn:
+        fakes = [
+            fake_ollama.start_in_background(latency=args.llm_latency, jitter=args.llm_jitter)
+            for _ in range(max(1, args.llm_nodes))
+        ]
+        env = {
+            "OLLAMA_URLS": ",".join(
+                f"http://127.0.0.1:{f.server_address[1]}/api/generate" for f in fakes
+            ),
+            "STT_BACKEND": "whisper" if args.real_stt else "stub",
+            "STT_STUB_DELAY": str(args.stt_delay),
+            "TTS_ENABLED": "0",
+            # Canned stub transcripts would all be graded by rules; load the LLM path
+            "DECISION_ENABLED": "0",
+            "WS_PER_MESSAGE_DEFLATE": "0" if args.no_deflate else "1",
+        }
+        server_proc = spawn_server(args.port, env)
+        args.url = f"ws://127.0.0.1:{args.port}/ws"
+        args.server_pid = server_proc.pid
+
+    sampler = ProcessSampler(args.server_pid).start() if args.server_pid else None
+
+    try:
+        results = asyncio.run(run_load(args))
+    finally:
+        server_stats = sampler.stop() if sampler else None
+        if server_proc:
+            stop_server(server_proc)
+        for fake in fakes:
+            fake.shutdown()
+
+    report = {
+        "tool": "loadtest",
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "host": {"python": platform.python_version(), "machine": platform.machine(), "cpus": os.cpu_count()},
+        "config": {k: v for k, v in vars(args).items() if k not in ("output",)},
+        "results": results,
+        "server": server_stats,
+    }
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(output + "\n")
+    else:
+        print(output)
+
+    return 0 if results["sessions"]["failed"] == 0 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,205 @@
+# benchmarks/micro.py
+
+"""
+MICRO-BENCHMARKS
+Times the parsing, rules and evaluation hot paths over synthetic inputs
+from 1 KB to 1 MB and fits a scaling exponent per function:
+  ~1.0 = linear, ~2.0 = quadratic (flagged as a regression)
+
+Benchmarks whose dependencies (spaCy, pdfminer, requests) are not
+installed are reported as skipped instead of failing the run.
+
+Examples:
+    python -m benchmarks.micro
+    python -m benchmarks.micro --only run_rules --max-size 256000 --output micro.json
+"""
+
+import argparse
+import json
+import math
+import statistics
+import sys
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+from benchmarks import corpus
+
+
+# ---------------------------
+# RUNNER
+# ---------------------------
+
+def bench(fn: Callable, args: tuple, min_time: float = 0.2,
+          min_rounds: int = 3, max_rounds: int = 1000) -> Dict[str, float]:
+    """
+    Call fn(*args) repeatedly for about min_time seconds.
+    Same spirit as pytest-benchmark: min is the headline number.
+    """
+    start = time.perf_counter()
+    fn(*args)
+    first = time.perf_counter() - start
+
+    rounds = int(min_time / first) if first > 0 else max_rounds
+    rounds = max(min_rounds, min(max_rounds, rounds))
+
+    times = [first]
+    for _ in range(rounds - 1):
+        start = time.perf_counter()
+        fn(*args)
+        times.append(time.perf_counter() - start)
+
+    return {
+        "rounds": len(times),
+        "min_s": min(times),
+        "mean_s": statistics.fmean(times),
+        "stddev_s": statistics.pstdev(times),
+    }
+
+
+def scaling_exponent(points: List[Tuple[int, float]]) -> Optional[float]:
+    """Least-squares slope of log(time) against log(size)."""
+    if len(points) < 2:
+        return None
+    xs = [math.log(size) for size, _ in points]
+    ys = [math.log(max(t, 1e-9)) for _, t in points]
+    mx, my = statistics.fmean(xs), statistics.fmean(ys)
+    denom = sum((x - mx) ** 2 for x in xs)
+    if denom == 0:
+        return None
+    return sum((x - mx) * (y - my) for x, y in zip(xs, ys)) / denom
+
+
+# ---------------------------
+# CASES
+# ---------------------------
+
+def build_cases() -> Dict[str, Tuple[Callable, Callable]]:
+    """
+    name -> (setup(size) -> args, fn)
+    Setup work is excluded from timing.
+    """
+    cases: Dict[str, Tuple[Callable, Callable]] = {}
+
+    def skip(names, error):
+        for name in names:
+            cases[name] = (None, f"skipped: {error}")
+
+    from evaluation.rules import run_rules, run_rules_batch
+    cases["run_rules"] = (lambda n: (corpus.transcript(n),), run_rules)
+    # size = total characters, spread over 1K-character answers
+    cases["run_rules_batch"] = (
+        lambda n: ([corpus.transcript(1000)] * max(1, n // 1000),), run_rules_batch
+    )
+
+    try:
+        from evaluation.llm_eval import parse_evaluation
+        cases["parse_evaluation"] = (lambda n: (corpus.llm_response(n),), parse_evaluation)
+    except ImportError as e:
+        skip(["parse_evaluation"], e)
+
+    from interview.question_generator import generate_questions
+
+    def questions_setup(n):
+        text = corpus.resume(n)
+        lines = [l for l in text.splitlines() if l.startswith("- ")]
+        return ({"skills": ["python", "docker"], "projects": lines[:3], "experience": lines[3:6]},)
+
+    cases["generate_questions"] = (questions_setup, generate_questions)
+
+    try:
+        from interview import resume_parser
+    except (ImportError, OSError) as e:
+        skip(["clean_text", "extract_skills", "extract_section", "parse_resume"], e)
+        return cases
+
+    cases["clean_text"] = (lambda n: (corpus.resume(n),), resume_parser.clean_text)
+    cases["extract_skills"] = (
+        lambda n: (resume_parser.nlp(corpus.resume(n).lower()),),
+        resume_parser.extract_skills
+    )
+    cases["extract_section"] = (
+        lambda n: (corpus.resume(n), "projects"),
+        resume_parser.extract_section
+    )
+    cases["parse_resume"] = (lambda n: (corpus.resume(n),), resume_parser.parse_resume)
+    return cases
+
+
+def run(names: Optional[List[str]], sizes: List[int], min_time: float,
+        quadratic_threshold: float) -> dict:
+    results = {}
+
+    for name, (setup, fn) in build_cases().items():
+        if names and name not in names:
+            continue
+
+        if setup is None:
+            results[name] = {"status": fn}
+            print(f"{name:20s} {fn}", file=sys.stderr)
+            continue
+
+        points = []
+        rows = []
+        for size in sizes:
+            try:
+                args = setup(size)
+                stats = bench(fn, args, min_time=min_time)
+            except Exception as e:
+                rows.append({"size": size, "error": f"{type(e).__name__}: {e}"})
+                continue
+            stats["size"] = size
+            stats["us_per_kb"] = stats["min_s"] * 1e6 / (size / 1000)
+            rows.append(stats)
+            points.append((size, stats["min_s"]))
+            print(f"{name:20s} {size:>9d} B  min {stats['min_s'] * 1000:10.3f} ms  "
+                  f"({stats['rounds']} rounds)", file=sys.stderr)
+
+        exponent = scaling_exponent(points)
+        results[name] = {
+            "status": "ok",
+            "points": rows,
+            "scaling_exponent": round(exponent, 3) if exponent is not None else None,
+            "superlinear": exponent is not None and exponent > quadratic_threshold,
+        }
+
+    return results
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Hot-path micro-benchmarks")
+    parser.add_argument("--only", action="append", help="benchmark name (repeatable)")
+    parser.add_argument("--max-size", type=int, default=corpus.SIZES[-1])
+    parser.add_argument("--min-time", type=float, default=0.2, help="seconds per measurement")
+    parser.add_argument("--threshold", type=float, default=1.3,
+                        help="flag scaling exponents above this as superlinear")
+    parser.add_argument("--output", help="write JSON here (default: stdout)")
+    args = parser.parse_args(argv)
+
+    sizes = [s for s in corpus.SIZES if s <= args.max_size]
+    results = run(args.only, sizes, args.min_time, args.threshold)
+
+    flagged = [name for name, r in results.items() if r.get("superlinear")]
+    report = {
+        "tool": "micro",
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "sizes": sizes,
+        "threshold": args.threshold,
+        "superlinear": flagged,
+        "benchmarks": results,
+    }
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(output + "\n")
+    else:
+        print(output)
+
+    if flagged:
+        print(f"Superlinear scaling detected: {', '.join(flagged)}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,296 @@
+# benchmarks/replay.py
+
+"""
+SESSION REPLAY
+Replays captured sessions (backend/capture.py) against /ws:
+the exact inbound message stream of a real interview, with its original
+inter-arrival times, at 1x, Nx or max speed, many copies in parallel.
+
+With --spawn the server runs with stub STT and fake Ollama, both
+degradation tiers pinned to normal and the admission and rate limits
+lifted, so runs are deterministic: every copy of a capture must produce
+the same results. "distinct_result_sequences" must be 1 per capture,
+otherwise the run fails (exit code 1).
+
+Capture a session:
+    CAPTURE_ENABLED=1 python run.py      # then open http://host:8000/?capture=1
+                                          # (the page passes it on to /ws)
+
+Examples:
+    python -m benchmarks.replay data/captures/capture-<id>.jsonl --spawn
+    python -m benchmarks.replay data/captures --spawn --speed 4 --copies 20 --concurrency 10
+    python -m benchmarks.replay capture.jsonl --url ws://localhost:8000/ws --speed 0
+"""
+
+import argparse
+import asyncio
+import base64
+import json
+import os
+import platform
+import sys
+import time
+from collections import defaultdict
+from typing import Dict, List, Optional, Tuple
+
+import websockets
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+from benchmarks.common import ProcessSampler, spawn_server, stop_server, summarize
+from benchmarks import fake_ollama
+
+Event = Tuple[float, object]    # (seconds since connect, str | bytes)
+
+
+class ReplayError(Exception):
+    pass
+
+
+def load_capture(path: str) -> List[Event]:
+    events = []
+    with open(path, encoding="utf-8") as f:
+        header = json.loads(f.readline())
+        if header.get("capture_version") != 1:
+            raise ReplayError(f"{path}: unsupported capture version {header.get('capture_version')}")
+        for line in f:
+            entry = json.loads(line)
+            if "text" in entry:
+                events.append((entry["t"], entry["text"]))
+            else:
+                events.append((entry["t"], base64.b64decode(entry["bytes"])))
+    return events
+
+
+def capture_files(path: str) -> List[str]:
+    if os.path.isdir(path):
+        return [
+            os.path.join(path, name)
+            for name in sorted(os.listdir(path))
+            if name.endswith(".jsonl")
+        ]
+    return [path]
+
+
+def decode(raw) -> Optional[dict]:
+    if isinstance(raw, bytes):
+        return msgpack.unpackb(raw) if msgpack is not None else None
+    return json.loads(raw)
+
+
+async def replay_session(args, events: List[Event]) -> Dict:
+    """
+    Replay one capture. Sends on the original schedule (scaled by --speed)
+    while a reader task records server messages, so slow server replies
+    never hold back the send side (same as a real browser).
+    """
+    url = f"{args.url}?encoding={args.encoding}"
+    outcome = {"results": [], "latency": defaultdict(list)}
+    process_sent: List[float] = []
+    resume_sent: List[float] = []
+
+    async with websockets.connect(url, max_size=None, open_timeout=args.timeout) as ws:
+        done = asyncio.Event()
+        expected_results = sum(
+            1 for _, payload in events
+            if isinstance(payload, str) and json.loads(payload).get("type") == "process"
+        )
+
+        async def reader():
+            async for raw in ws:
+                message = decode(raw)
+                if not message:
+                    continue
+                kind = message.get("type")
+                now = time.perf_counter()
+
+                if kind == "question" and resume_sent:
+                    outcome["latency"]["resume"].append(now - resume_sent.pop(0))
+                elif kind == "result":
+                    if process_sent:
+                        outcome["latency"]["process"].append(now - process_sent.pop(0))
+                    data = message.get("data", {})
+                    outcome["results"].append((data.get("score"), data.get("graded_by")))
+                    if len(outcome["results"]) >= expected_results:
+                        done.set()
+
+        # Admission: the capture clock starts once the session is admitted
+        while True:
+            message = decode(await asyncio.wait_for(ws.recv(), args.timeout))
+            if message and message.get("type") == "status":
+                break
+
+        reader_task = asyncio.create_task(reader())
+        start = time.perf_counter()
+
+        try:
+            for t, payload in events:
+                if args.speed:
+                    delay = start + t / args.speed - time.perf_counter()
+                    if delay > 0:
+                        await asyncio.sleep(delay)
+
+                if isinstance(payload, str):
+                    kind = json.loads(payload).get("type")
+                    if kind == "process":
+                        process_sent.append(time.perf_counter())
+                    elif kind in ("resume", "resume_pdf"):
+                        resume_sent.append(time.perf_counter())
+                await ws.send(payload)
+
+            if expected_results:
+                try:
+                    await asyncio.wait_for(done.wait(), args.timeout)
+                except asyncio.TimeoutError:
+                    raise ReplayError(
+                        f"got {len(outcome['results'])}/{expected_results} results"
+                    )
+        finally:
+            reader_task.cancel()
+
+        outcome["latency"]["session"].append(time.perf_counter() - start)
+
+    return outcome
+
+
+async def run_replay(args) -> dict:
+    captures = {path: load_capture(path) for path in capture_files(args.capture)}
+    if not captures:
+        raise ReplayError(f"no captures in {args.capture}")
+
+    semaphore = asyncio.Semaphore(args.concurrency)
+    latencies: Dict[str, List[float]] = defaultdict(list)
+    sequences: Dict[str, set] = defaultdict(set)
+    counters: Dict[str, int] = defaultdict(int)
+
+    async def guarded(path: str, events: List[Event]):
+        async with semaphore:
+            try:
+                outcome = await replay_session(args, events)
+            except Exception as e:
+                counters["failed"] += 1
+                if counters["failed"] <= 5:
+                    print(f"Replay of {os.path.basename(path)} failed: {e!r}", file=sys.stderr)
+                return
+            counters["completed"] += 1
+            for name, values in outcome["latency"].items():
+                latencies[name].extend(values)
+            sequences[path].add(tuple(outcome["results"]))
+
+    start = time.perf_counter()
+    await asyncio.gather(*(
+        guarded(path, events)
+        for path, events in captures.items()
+        for _ in range(args.copies)
+    ))
+    duration = time.perf_counter() - start
+
+    return {
+        "duration_s": round(duration, 3),
+        "sessions": {
+            "requested": len(captures) * args.copies,
+            "completed": counters["completed"],
+            "failed": counters["failed"],
+            "per_second": round(counters["completed"] / duration, 3) if duration else 0.0,
+        },
+        "distinct_result_sequences": {
+            os.path.basename(path): len(seqs) for path, seqs in sorted(sequences.items())
+        },
+        "latency": {name: summarize(values) for name, values in sorted(latencies.items())},
+    }
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Replay captured interview sessions")
+    parser.add_argument("capture", help="capture .jsonl file or directory of captures")
+    parser.add_argument("--url", default="ws://127.0.0.1:8000/ws")
+    parser.add_argument("--speed", type=float, default=1.0, help="time scale: 1 = real time, 4 = 4x, 0 = max speed")
+    parser.add_argument("--copies", type=int, default=1, help="replays of each capture")
+    parser.add_argument("--concurrency", type=int, default=5, help="replays at once")
+    parser.add_argument("--timeout", type=float, default=60.0)
+    parser.add_argument("--encoding", choices=["json", "msgpack"], default="json")
+    parser.add_argument("--server-pid", type=int, help="sample CPU/RSS of this process")
+    parser.add_argument("--output", help="write JSON report here (default: stdout)")
+
+    spawn = parser.add_argument_group("local stand-ins")
+    spawn.add_argument("--spawn", action="store_true", help="start fake Ollama + server with stub STT")
+    spawn.add_argument("--port", type=int, default=8766)
+    spawn.add_argument("--stt-delay", type=float, default=0.0, help="stub STT seconds per chunk")
+    spawn.add_argument("--llm-latency", type=float, default=0.5)
+    return parser.parse_args(argv)
+
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+    if args.encoding == "msgpack" and msgpack is None:
+        raise SystemExit("--encoding msgpack requires: pip install msgpack")
+
+    server_proc = None
+    fake = None
+    if args.spawn:
+        # No jitter: replays must be deterministic
+        fake = fake_ollama.start_in_background(latency=args.llm_latency)
+        env = {
+            "OLLAMA_URLS": f"http://127.0.0.1:{fake.server_address[1]}/api/generate",
+            "STT_BACKEND": "stub",
+            "STT_STUB_DELAY": str(args.stt_delay),
+            "TTS_ENABLED": "0",
+            "CAPTURE_ENABLED": "0",
+            "DECISION_ENABLED": "0",
+            # Load must not change results: no tier switches, no queueing,
+            # no rate-limit errors however many copies run at once
+            "DEGRADE_STT_QUEUE_HIGH": "inf",
+            "DEGRADE_STT_LATENCY_HIGH": "inf",
+            "DEGRADE_LLM_INFLIGHT_HIGH": "inf",
+            "DEGRADE_LLM_LATENCY_HIGH": "inf",
+            "MAX_ACTIVE_SESSIONS": str(10 * args.concurrency + 100),
+            "AUDIO_BYTES_PER_SEC": str(2 ** 40),
+            "AUDIO_BURST_BYTES": str(2 ** 40),
+            "UPLOAD_BYTES_PER_SEC": str(2 ** 40),
+            "UPLOAD_BURST_BYTES": str(2 ** 40),
+        }
+        server_proc = spawn_server(args.port, env)
+        args.url = f"ws://127.0.0.1:{args.port}/ws"
+        args.server_pid = server_proc.pid
+
+    sampler = ProcessSampler(args.server_pid).start() if args.server_pid else None
+
+    try:
+        results = asyncio.run(run_replay(args))
+    finally:
+        server_stats = sampler.stop() if sampler else None
+        if server_proc:
+            stop_server(server_proc)
+        if fake:
+            fake.shutdown()
+
+    report = {
+        "tool": "replay",
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "host": {"python": platform.python_version(), "machine": platform.machine(), "cpus": os.cpu_count()},
+        "config": {k: v for k, v in vars(args).items() if k not in ("output",)},
+        "results": results,
+        "server": server_stats,
+    }
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(output + "\n")
+    else:
+        print(output)
+
+    nondeterministic = [
+        name for name, count in results["distinct_result_sequences"].items() if count > 1
+    ]
+    if args.spawn and nondeterministic:
+        print(f"Results differ between copies of: {', '.join(nondeterministic)}", file=sys.stderr)
+        return 1
+    return 1 if results["sessions"]["failed"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,245 @@
+# evaluation/decision.py
+
+"""
+RULES-FIRST DECISION LAYER
+Sits between run_rules and the LLM.
+
+- A small logistic regression (coefficients in evaluation/models/)
+  estimates P(answer is acceptable) from the rule features
+- p >= DECISION_ACCEPT_THRESHOLD or p <= DECISION_REJECT_THRESHOLD:
+  the answer is graded by rules, no Ollama call
+- Anything in between is escalated to the LLM
+- Outcomes are counted so the escalation rate can be tuned
+- Off by default. A coefficients file with "training_answers": 0
+  (the placeholder shipped in the repo) is refused: fit it first
+
+Fit the coefficients from LLM-graded interview records, then enable:
+    python -m evaluation.decision --fit data/interviews
+    DECISION_ENABLED=1 python run.py
+"""
+
+import argparse
+import json
+import math
+import os
+import sys
+import threading
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from backend.config import (
+    DECISION_ENABLED,
+    DECISION_ACCEPT_THRESHOLD,
+    DECISION_REJECT_THRESHOLD,
+)
+from backend.metrics import Counter, Gauge
+
+MODEL_PATH = os.path.join(os.path.dirname(__file__), "models", "answer_classifier.json")
+
+# An LLM score at or above this counts as "acceptable" when fitting
+ACCEPTABLE_SCORE = 6
+
+# Feedback headlines when the classifier's verdict overrides the word-count band
+ACCEPTED_HEADLINE = "Solid answer with relevant detail."
+REJECTED_HEADLINE = "This answer needs more substance: explain what you did, how, and why."
+
+DECISIONS = Counter(
+    "evaluation_decisions_total",
+    "Rules-first decisions: accepted/rejected by rules or escalated to the LLM",
+    labels=["outcome"]
+)
+
+ESCALATION_RATE = Gauge(
+    "evaluation_escalation_rate",
+    "Fraction of decided answers escalated to the LLM"
+)
+
+FEATURES = (
+    "log_word_count", "filler_rate", "lexical_diversity",
+    "technical_density", "repetition_rate", "has_structure", "too_long"
+)
+
+_model: Optional[Dict] = None
+_model_lock = threading.Lock()
+
+
+def feature_vector(rules: Dict) -> List[float]:
+    """Rule features in the order expected by the classifier."""
+    return [
+        math.log1p(rules.get("word_count", 0)),
+        rules.get("filler_rate", 0.0),
+        rules.get("lexical_diversity", 0.0),
+        rules.get("technical_density", 0.0),
+        rules.get("repetition_rate", 0.0),
+        1.0 if rules.get("has_structure") else 0.0,
+        1.0 if rules.get("too_long") else 0.0,
+    ]
+
+
+def load_model(path: str = MODEL_PATH) -> Optional[Dict]:
+    """Load (once) and validate the coefficients file. None disables the layer."""
+    global _model
+
+    with _model_lock:
+        if _model is not None:
+            return _model or None
+
+        try:
+            with open(path, encoding="utf-8") as f:
+                model = json.load(f)
+            if list(model["features"]) != list(FEATURES):
+                raise ValueError(f"feature mismatch: {model['features']}")
+            if not model.get("training_answers"):
+                raise ValueError("coefficients were never fitted (run --fit)")
+            model["coefficients"] = np.array(model["coefficients"], dtype=np.float64)
+            model["mean"] = np.array(model["mean"], dtype=np.float64)
+            model["scale"] = np.array(model["scale"], dtype=np.float64)
+            _model = model
+        except Exception as e:
+            print(f"Decision model unavailable, escalating every answer: {e}")
+            _model = {}
+
+        return _model or None
+
+
+def acceptable_probability(rules: Dict, model: Dict) -> float:
+    x = (np.array(feature_vector(rules)) - model["mean"]) / model["scale"]
+    z = float(model["intercept"] + x @ model["coefficients"])
+    return _sigmoid(z)
+
+
+def _sigmoid(z: float) -> float:
+    """Logistic function; never calls exp() on a large positive value."""
+    if z >= 0:
+        return 1.0 / (1.0 + math.exp(-z))
+    e = math.exp(z)
+    return e / (1.0 + e)
+
+
+def decide(transcript: str, rules: Dict) -> Optional[dict]:
+    """
+    Returns a rules-graded result when the classifier is confident,
+    or None when the answer should go to the LLM.
+    """
+    from evaluation.llm_eval import rules_assessment
+
+    model = load_model() if DECISION_ENABLED else None
+    if model is None:
+        return None
+
+    p = acceptable_probability(rules, model)
+
+    if p >= DECISION_ACCEPT_THRESHOLD:
+        outcome = "accepted"
+    elif p <= DECISION_REJECT_THRESHOLD:
+        outcome = "rejected"
+    else:
+        outcome = "escalated"
+
+    DECISIONS.inc(outcome=outcome)
+    total = sum(DECISIONS.value(outcome=o) for o in ("accepted", "rejected", "escalated"))
+    ESCALATION_RATE.set(DECISIONS.value(outcome="escalated") / total)
+
+    if outcome == "escalated":
+        return None
+
+    # Word-count band grade; where the verdict moves the score out of
+    # that band, headline, clarity and depth follow the verdict
+    assessment = rules_assessment(rules)
+    score, clarity, depth, headline = (
+        assessment["score"], assessment["clarity"], assessment["depth"], assessment["headline"]
+    )
+
+    if outcome == "accepted" and score < ACCEPTABLE_SCORE + 1:
+        score = ACCEPTABLE_SCORE + 1
+        clarity = "medium" if clarity == "low" else clarity
+        depth = "medium" if depth == "low" else depth
+        headline = ACCEPTED_HEADLINE
+    elif outcome == "rejected" and score > ACCEPTABLE_SCORE - 2:
+        score = ACCEPTABLE_SCORE - 2
+        clarity = "medium" if clarity == "high" else clarity
+        depth = "low"
+        headline = REJECTED_HEADLINE
+
+    return {
+        "score": score,
+        "clarity": clarity,
+        "depth": depth,
+        "feedback": " ".join([headline] + assessment["tips"]),
+        "graded_by": "rules",
+        "confidence": round(p if outcome == "accepted" else 1.0 - p, 3),
+    }
+
+
+# ==============================
+# FITTING
+# ==============================
+
+def fit(X: np.ndarray, y: np.ndarray, l2: float = 0.01,
+        learning_rate: float = 0.5, epochs: int = 2000) -> Dict:
+    """Standardized logistic regression by batch gradient descent."""
+    mean = X.mean(axis=0)
+    scale = X.std(axis=0)
+    scale[scale == 0] = 1.0
+    Z = (X - mean) / scale
+
+    w = np.zeros(Z.shape[1])
+    b = 0.0
+    for _ in range(epochs):
+        p = 1.0 / (1.0 + np.exp(-np.clip(Z @ w + b, -500, 500)))
+        error = p - y
+        w -= learning_rate * (Z.T @ error / len(y) + l2 * w)
+        b -= learning_rate * error.mean()
+
+    return {
+        "features": list(FEATURES),
+        "intercept": round(float(b), 6),
+        "coefficients": [round(float(v), 6) for v in w],
+        "mean": [round(float(v), 6) for v in mean],
+        "scale": [round(float(v), 6) for v in scale],
+        "training_answers": int(len(y)),
+        "acceptable_score": ACCEPTABLE_SCORE,
+    }
+
+
+def training_data(path: str):
+    """(X, y) from stored answers whose final grade came from the LLM."""
+    from evaluation.records import iter_records
+
+    rows, labels = [], []
+    for record in iter_records(path):
+        for answer in record.get("answers", []):
+            result = answer.get("result") or {}
+            rules = answer.get("rules")
+            if not rules or result.get("graded_by") != "llm":
+                continue
+            rows.append(feature_vector(rules))
+            labels.append(1.0 if result.get("score", 0) >= ACCEPTABLE_SCORE else 0.0)
+
+    return np.array(rows, dtype=np.float64), np.array(labels, dtype=np.float64)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Fit the rules-first answer classifier")
+    parser.add_argument("--fit", required=True, help="records .jsonl file or directory")
+    parser.add_argument("--output", default=MODEL_PATH)
+    parser.add_argument("--min-answers", type=int, default=50)
+    args = parser.parse_args(argv)
+
+    X, y = training_data(args.fit)
+    if len(y) < args.min_answers or y.min() == y.max():
+        print(f"Not enough LLM-graded answers with both labels ({len(y)} found)")
+        return 1
+
+    model = fit(X, y)
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(model, f, indent=2)
+        f.write("\n")
+
+    print(json.dumps({"answers": len(y), "acceptable": int(y.sum()), "output": args.output}))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -7,15 +7,33 @@ STRICT JSON OUTPUT
 
 import json
 import requests
-from typing import Dict
+from typing import Dict, List, Optional
 
-from backend.config import OLLAMA_URL, OLLAMA_MODEL
+from backend.metrics import Counter, Histogram
+from evaluation.decision import decide
+from evaluation.ollama_client import generate, CircuitOpenError
+from evaluation.prompts import answer_prompt, generate_payload
 
+# Bump whenever the prompt changes, so stored grades can be re-scored
+PROMPT_VERSION = "v4"
 
-def evaluate_with_llm(transcript: str, rules: dict) -> dict:
+PROMPT_EVAL_SECONDS = Histogram(
+    "ollama_prompt_eval_seconds",
+    "Ollama prefill time per evaluation (drops when the prompt cache hits)"
+)
+
+PROMPT_EVAL_TOKENS = Counter(
+    "ollama_prompt_eval_tokens_total",
+    "Prompt tokens Ollama had to evaluate (cached prefix tokens excluded)"
+)
+
+
+def evaluate_with_llm(transcript: str, rules: dict, allow_rules_decision: bool = True) -> dict:
     """
     Evaluates the user's answer using local LLM.
     RULES are injected to guide evaluation.
+    Confidently-scored answers are graded by rules (evaluation/decision.py)
+    unless allow_rules_decision is False.
     """
 
     # Check for empty or very short answers
@@ -24,7 +42,8 @@ def evaluate_with_llm(transcript: str, rules: dict) -> dict:
             "score": 0,
             "clarity": "low",
             "depth": "low",
-            "feedback": "No answer provided. Please speak your response."
+            "feedback": "No answer provided. Please speak your response.",
+            "graded_by": "rules"
         }
     
     if rules.get("too_short"):
@@ -32,76 +51,38 @@ def evaluate_with_llm(transcript: str, rules: dict) -> dict:
             "score": 2,
             "clarity": "low",
             "depth": "low",
-            "feedback": "Answer is too brief. Please provide more detail and explanation."
+            "feedback": "Answer is too brief. Please provide more detail and explanation.",
+            "graded_by": "rules"
         }
 
-    prompt = f"""You are a strict technical interviewer evaluating a candidate's answer.
-
-Candidate's Answer:
-\"\"\"{transcript}\"\"\"
-
-Analysis:
-- Word count: {rules.get('word_count', 0)}
-- Too long: {rules.get('too_long', False)}
-- Has structure: {rules.get('has_structure', False)}
+    if allow_rules_decision:
+        decided = decide(transcript, rules)
+        if decided is not None:
+            return decided
 
-Evaluate this answer and return ONLY valid JSON in this EXACT format (no other text):
-{{
-  "score": <number 0-10>,
-  "clarity": "<low/medium/high>",
-  "depth": "<low/medium/high>",
-  "feedback": "<2-3 sentence constructive feedback>"
-}}"""
+    payload = generate_payload(answer_prompt(transcript, rules))
 
     try:
-        response = requests.post(
-            OLLAMA_URL,
-            json={
-                "model": OLLAMA_MODEL,
-                "prompt": prompt,
-                "stream": False,
-                "options": {
-                    "temperature": 0.7,
-                    "num_predict": 300
-                }
-            },
-            timeout=30
-        )
+        response = generate(payload)
 
         if response.status_code != 200:
             print(f"Ollama API error: {response.status_code}")
             return fallback_evaluation(transcript, rules)
 
-        raw = response.json().get("response", "")
-
-        # Defensive JSON extraction
-        # Find JSON object in response
-        start = raw.find("{")
-        end = raw.rfind("}") + 1
-
-        if start == -1 or end == 0:
-            print(f"No JSON found in response: {raw[:200]}")
-            return fallback_evaluation(transcript, rules)
-
-        json_str = raw[start:end]
-        result = json.loads(json_str)
+        body = response.json()
+        record_prompt_eval(body)
 
-        # Validate required fields
-        required_fields = ["score", "clarity", "depth", "feedback"]
-        if not all(field in result for field in required_fields):
-            print(f"Missing required fields in LLM response")
+        result = parse_evaluation(body.get("response", ""))
+        if result is None:
             return fallback_evaluation(transcript, rules)
 
-        # Validate field types and values
-        if not isinstance(result["score"], (int, float)) or not (0 <= result["score"] <= 10):
-            result["score"] = 5
-        
-        if result["clarity"] not in ["low", "medium", "high"]:
-            result["clarity"] = "medium"
-        
-        if result["depth"] not in ["low", "medium", "high"]:
-            result["depth"] = "medium"
+        result["graded_by"] = "llm"
+        return result
 
+    except CircuitOpenError:
+        # Ollama known to be down: answer immediately from rules, re-score later
+        result = fallback_evaluation(transcript, rules)
+        result["deferred_rescore"] = True
         return result
 
     except requests.exceptions.Timeout:
@@ -114,7 +95,8 @@ Evaluate this answer and return ONLY valid JSON in this EXACT format (no other t
             "score": 5,
             "clarity": "medium",
             "depth": "medium",
-            "feedback": "Evaluation service unavailable. Please ensure Ollama is running with: ollama serve"
+            "feedback": "Evaluation service unavailable. Please ensure Ollama is running with: ollama serve",
+            "graded_by": "unavailable"
         }
     
     except json.JSONDecodeError as e:
@@ -126,36 +108,117 @@ Evaluate this answer and return ONLY valid JSON in this EXACT format (no other t
         return fallback_evaluation(transcript, rules)
 
 
+def parse_evaluation(raw: str) -> Optional[dict]:
+    """
+    Validate the evaluation JSON returned with format="json".
+    Returns None when no usable result is found.
+    Raises json.JSONDecodeError on malformed JSON.
+    """
+    result = json.loads(raw)
+    if not isinstance(result, dict):
+        print(f"Unexpected LLM response: {raw[:200]}")
+        return None
+
+    # Validate required fields
+    required_fields = ["score", "clarity", "depth", "feedback"]
+    if not all(field in result for field in required_fields):
+        print(f"Missing required fields in LLM response")
+        return None
+
+    # Validate field types and values
+    if not isinstance(result["score"], (int, float)) or not (0 <= result["score"] <= 10):
+        result["score"] = 5
+
+    if result["clarity"] not in ["low", "medium", "high"]:
+        result["clarity"] = "medium"
+
+    if result["depth"] not in ["low", "medium", "high"]:
+        result["depth"] = "medium"
+
+    return result
+
+
 def fallback_evaluation(transcript: str, rules: Dict) -> dict:
     """
-    Simple rule-based fallback when LLM fails
+    Simple rule-based fallback when LLM fails.
+    Word-count bands, adjusted by the delivery/content features.
+    """
+    assessment = rules_assessment(rules)
+    return {
+        "score": assessment["score"],
+        "clarity": assessment["clarity"],
+        "depth": assessment["depth"],
+        "feedback": " ".join([assessment["headline"]] + assessment["tips"]),
+        "graded_by": "rules"
+    }
+
+
+def rules_assessment(rules: Dict) -> Dict:
+    """
+    The parts of a rules grade: score, clarity, depth, a headline for
+    the word-count band and delivery tips (kept apart so a caller that
+    overrides the score can replace the headline but keep the tips).
     """
     word_count = rules.get("word_count", 0)
+    tips: List[str] = []
     
     if word_count < 20:
         score = 2
         clarity = "low"
         depth = "low"
-        feedback = "Very brief answer. Provide more details and examples."
+        headline = "Very brief answer. Provide more details and examples."
     elif word_count < 50:
         score = 4
         clarity = "medium"
         depth = "low"
-        feedback = "Good start, but expand on your answer with more context."
+        headline = "Good start, but expand on your answer with more context."
     elif word_count > 500:
         score = 6
         clarity = "medium"
         depth = "high"
-        feedback = "Very detailed answer. Try to be more concise while maintaining key points."
+        headline = "Very detailed answer. Try to be more concise while maintaining key points."
     else:
         score = 7
         clarity = "medium"
         depth = "medium"
-        feedback = "Reasonable answer. Consider adding specific examples to strengthen your response."
-    
+        headline = "Reasonable answer. Consider adding specific examples to strengthen your response."
+
+    if word_count >= 20:
+        if rules.get("technical_density", 0) >= 0.03:
+            score += 1
+            if depth == "low":
+                depth = "medium"
+        elif rules.get("technical_terms", 0) == 0:
+            tips.append("Connect your answer to the technologies on your resume.")
+
+        if rules.get("filler_rate", 0) > 0.08:
+            score -= 1
+            clarity = "low"
+            tips.append("Reduce filler words like \"um\" and \"you know\".")
+
+        if rules.get("repetition_rate", 0) > 0.25 or rules.get("lexical_diversity", 1) < 0.35:
+            score -= 1
+            tips.append("Avoid repeating the same phrases.")
+
+        rate = rules.get("speaking_rate_wpm")
+        if rate and rate > 190:
+            tips.append("Slow down a little; you are speaking quickly.")
+        elif rate and rate < 90:
+            tips.append("Try to speak a bit more fluently.")
+
+        score = max(0, min(10, score))
+
     return {
         "score": score,
         "clarity": clarity,
         "depth": depth,
-        "feedback": feedback
-    }
\ No newline at end of file
+        "headline": headline,
+        "tips": tips,
+    }
+
+
+def record_prompt_eval(body: Dict):
+    if body.get("prompt_eval_count") is not None:
+        PROMPT_EVAL_TOKENS.inc(body["prompt_eval_count"])
+    if body.get("prompt_eval_duration") is not None:
+        PROMPT_EVAL_SECONDS.observe(body["prompt_eval_duration"] / 1e9)
@@ -0,0 +1,307 @@
+# evaluation/ollama_client.py
+
+"""
+OLLAMA HTTP CLIENT
+Every call to Ollama goes through here.
+
+ROUTING (OLLAMA_URLS, one or more nodes):
+- Least outstanding requests first, ties broken by latency EWMA
+- Nodes whose breaker is open are skipped
+- A failed call (connection error, timeout, HTTP 5xx) is retried once
+  on another node (OLLAMA_MAX_ATTEMPTS)
+
+Each node has its own circuit breaker:
+
+  closed    -> requests pass; consecutive failures or slow calls are counted
+  open      -> requests fail fast (CircuitOpenError), callers fall back to rules;
+               a background thread probes GET /api/tags
+  half_open -> a probe succeeded; ONE trial request is let through,
+               success closes the breaker, failure opens it again
+
+Per-node state is exported as metrics and reported by /health.
+"""
+
+import threading
+import time
+from typing import Dict, List, Optional
+from urllib.parse import urlsplit
+
+import requests
+
+from backend.config import (
+    OLLAMA_URLS,
+    OLLAMA_TIMEOUT,
+    OLLAMA_MAX_ATTEMPTS,
+    LLM_BREAKER_FAILURES,
+    LLM_BREAKER_SLOW_SECONDS,
+    LLM_BREAKER_PROBE_INTERVAL,
+)
+from backend.metrics import OLLAMA_INFLIGHT, Counter, Gauge
+
+CLOSED, HALF_OPEN, OPEN = "closed", "half_open", "open"
+_STATE_VALUES = {CLOSED: 0, HALF_OPEN: 1, OPEN: 2}
+
+BREAKER_STATE = Gauge(
+    "llm_breaker_state",
+    "Ollama circuit breaker state (0 closed, 1 half-open, 2 open)",
+    labels=["endpoint"]
+)
+
+BREAKER_TRIPS = Counter(
+    "llm_breaker_trips_total",
+    "Times the Ollama circuit breaker opened",
+    labels=["endpoint"]
+)
+
+BREAKER_REJECTED = Counter(
+    "llm_breaker_rejected_total",
+    "Requests failed fast because the breaker was open",
+    labels=["endpoint"]
+)
+
+ENDPOINT_OUTSTANDING = Gauge(
+    "ollama_endpoint_outstanding",
+    "Requests in flight per Ollama node",
+    labels=["endpoint"]
+)
+
+ENDPOINT_REQUESTS = Counter(
+    "ollama_endpoint_requests_total",
+    "Requests per Ollama node and outcome",
+    labels=["endpoint", "outcome"]
+)
+
+
+class CircuitOpenError(Exception):
+    pass
+
+
+class CircuitBreaker:
+    """
+    Thread-safe breaker for one Ollama endpoint.
+    """
+
+    def __init__(self, endpoint: str, probe_url: str,
+                 failure_threshold: int = LLM_BREAKER_FAILURES,
+                 slow_call_seconds: float = LLM_BREAKER_SLOW_SECONDS,
+                 probe_interval: float = LLM_BREAKER_PROBE_INTERVAL):
+        self.endpoint = endpoint
+        self.probe_url = probe_url
+        self.failure_threshold = failure_threshold
+        self.slow_call_seconds = slow_call_seconds
+        self.probe_interval = probe_interval
+
+        self.state = CLOSED
+        self.consecutive_failures = 0
+        self.opened_at: Optional[float] = None
+        self.last_error: Optional[str] = None
+
+        self._trial_in_flight = False
+        self._probe_thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        BREAKER_STATE.set(0, endpoint=endpoint)
+
+    def available(self) -> bool:
+        """Whether allow() would let a request through (no side effects)."""
+        with self._lock:
+            return self.state == CLOSED or (self.state == HALF_OPEN and not self._trial_in_flight)
+
+    def allow(self) -> bool:
+        with self._lock:
+            if self.state == CLOSED:
+                return True
+            if self.state == HALF_OPEN and not self._trial_in_flight:
+                self._trial_in_flight = True
+                return True
+
+        BREAKER_REJECTED.inc(endpoint=self.endpoint)
+        return False
+
+    def record_success(self, latency: float):
+        if latency >= self.slow_call_seconds:
+            self.record_failure(f"slow call: {latency:.1f}s")
+            return
+
+        with self._lock:
+            self.consecutive_failures = 0
+            self._trial_in_flight = False
+            if self.state != CLOSED:
+                self._set_state(CLOSED)
+
+    def record_failure(self, error: str):
+        with self._lock:
+            self.consecutive_failures += 1
+            self.last_error = error
+            self._trial_in_flight = False
+
+            if self.state == HALF_OPEN or (
+                self.state == CLOSED and self.consecutive_failures >= self.failure_threshold
+            ):
+                self._trip()
+
+    def snapshot(self) -> Dict:
+        with self._lock:
+            return {
+                "state": self.state,
+                "consecutive_failures": self.consecutive_failures,
+                "open_for": round(time.monotonic() - self.opened_at, 1) if self.opened_at else None,
+                "last_error": self.last_error,
+            }
+
+    # ---------- internals (call with _lock held) ----------
+
+    def _set_state(self, state: str):
+        self.state = state
+        self.opened_at = time.monotonic() if state == OPEN else None
+        BREAKER_STATE.set(_STATE_VALUES[state], endpoint=self.endpoint)
+        print(f"LLM circuit breaker ({self.endpoint}): {state}")
+
+    def _trip(self):
+        self._set_state(OPEN)
+        BREAKER_TRIPS.inc(endpoint=self.endpoint)
+
+        if self._probe_thread is None or not self._probe_thread.is_alive():
+            self._probe_thread = threading.Thread(
+                target=self._probe_loop, name=f"ollama-probe-{self.endpoint}", daemon=True
+            )
+            self._probe_thread.start()
+
+    def _probe_loop(self):
+        """Runs while the breaker is open; moves it to half-open once Ollama answers."""
+        while True:
+            time.sleep(self.probe_interval)
+
+            with self._lock:
+                if self.state != OPEN:
+                    return
+
+            try:
+                requests.get(self.probe_url, timeout=min(self.probe_interval, 5)).raise_for_status()
+            except Exception as e:
+                with self._lock:
+                    self.last_error = f"probe: {e}"
+                continue
+
+            with self._lock:
+                if self.state == OPEN:
+                    self._set_state(HALF_OPEN)
+                return
+
+
+class Endpoint:
+    """
+    One Ollama node: its URLs, breaker, outstanding requests and latency.
+    """
+
+    def __init__(self, generate_url: str, alpha: float = 0.2):
+        parts = urlsplit(generate_url)
+        self.name = f"{parts.scheme}://{parts.netloc}"
+        self.generate_url = generate_url
+        self.breaker = CircuitBreaker(self.name, self.name + "/api/tags")
+        self.outstanding = 0
+        self.latency_ewma = 0.0
+        self.alpha = alpha
+
+    def record_latency(self, seconds: float):
+        self.latency_ewma += self.alpha * (seconds - self.latency_ewma)
+
+    def snapshot(self) -> Dict:
+        return dict(
+            self.breaker.snapshot(),
+            endpoint=self.name,
+            outstanding=self.outstanding,
+            latency_ewma=round(self.latency_ewma, 3),
+        )
+
+
+endpoints: List[Endpoint] = [Endpoint(url) for url in OLLAMA_URLS]
+
+_route_lock = threading.Lock()
+
+
+def _acquire(exclude: List[Endpoint]) -> Optional[Endpoint]:
+    """Pick the least-loaded available node and count a request on it."""
+    with _route_lock:
+        candidates = sorted(
+            (e for e in endpoints if e not in exclude and e.breaker.available()),
+            key=lambda e: (e.outstanding, e.latency_ewma)
+        )
+        for endpoint in candidates:
+            if endpoint.breaker.allow():
+                endpoint.outstanding += 1
+                ENDPOINT_OUTSTANDING.set(endpoint.outstanding, endpoint=endpoint.name)
+                return endpoint
+
+    return None
+
+
+def _release(endpoint: Endpoint):
+    with _route_lock:
+        endpoint.outstanding -= 1
+        ENDPOINT_OUTSTANDING.set(endpoint.outstanding, endpoint=endpoint.name)
+
+
+def generate(payload: Dict, timeout: float = OLLAMA_TIMEOUT) -> requests.Response:
+    """
+    POST /api/generate to the least-loaded healthy node, retrying on
+    another node on failure.
+    Raises CircuitOpenError without calling Ollama when every node is open.
+    """
+    tried: List[Endpoint] = []
+    last_error: Optional[Exception] = None
+    last_response: Optional[requests.Response] = None
+
+    for _ in range(min(OLLAMA_MAX_ATTEMPTS, len(endpoints))):
+        endpoint = _acquire(tried)
+        if endpoint is None:
+            break
+        tried.append(endpoint)
+
+        start = time.perf_counter()
+        try:
+            with OLLAMA_INFLIGHT.track_inprogress():
+                response = requests.post(endpoint.generate_url, json=payload, timeout=timeout)
+        except requests.exceptions.RequestException as e:
+            endpoint.breaker.record_failure(str(e) or type(e).__name__)
+            ENDPOINT_REQUESTS.inc(endpoint=endpoint.name, outcome="error")
+            last_error = e
+            continue
+        finally:
+            _release(endpoint)
+
+        latency = time.perf_counter() - start
+        if response.status_code >= 500:
+            endpoint.breaker.record_failure(f"HTTP {response.status_code}")
+            ENDPOINT_REQUESTS.inc(endpoint=endpoint.name, outcome="error")
+            last_response = response
+            continue
+
+        endpoint.breaker.record_success(latency)
+        endpoint.record_latency(latency)
+        ENDPOINT_REQUESTS.inc(endpoint=endpoint.name, outcome="ok")
+        return response
+
+    if not tried:
+        raise CircuitOpenError("All Ollama circuits open")
+    if last_response is not None:
+        # Let the caller handle the node's HTTP error as before
+        return last_response
+    raise last_error
+
+
+def health() -> Dict:
+    """
+    "closed" when every node is healthy, "open" when none is,
+    "degraded" otherwise.
+    """
+    nodes = [e.snapshot() for e in endpoints]
+    closed = sum(1 for n in nodes if n["state"] == CLOSED)
+
+    if closed == len(nodes):
+        state = CLOSED
+    elif closed == 0 and all(n["state"] == OPEN for n in nodes):
+        state = OPEN
+    else:
+        state = "degraded"
+
+    return {"state": state, "endpoints": nodes}
@@ -0,0 +1,71 @@
+# evaluation/prompts.py
+
+"""
+PROMPT CONSTRUCTION FOR OLLAMA
+Laid out so the model can reuse its KV cache between answers:
+
+- SYSTEM_PROMPT (instructions + output schema) is fixed and goes FIRST,
+  as `system`: every request starts with the same tokens, so Ollama's
+  prompt cache reuses them and only prefills the per-answer part
+- Only the per-answer part follows: rule analysis, then the transcript LAST
+- `format: "json"` makes Ollama emit a bare JSON object
+- `keep_alive` keeps the model (and its cache) loaded between answers
+
+Any change here must bump PROMPT_VERSION in evaluation/llm_eval.py.
+"""
+
+from typing import Dict, Optional
+
+from backend.config import OLLAMA_MODEL, OLLAMA_KEEP_ALIVE
+
+SYSTEM_PROMPT = """You are a strict technical interviewer evaluating a candidate's spoken answer.
+
+Each message contains an automatic analysis of the answer followed by the
+transcript of the answer itself. Grade the answer on correctness, depth and
+clarity. Use the analysis as supporting evidence, not as the grade.
+
+Return ONLY a JSON object in this EXACT format:
+{
+  "score": <number 0-10>,
+  "clarity": "<low/medium/high>",
+  "depth": "<low/medium/high>",
+  "feedback": "<2-3 sentence constructive feedback>"
+}"""
+
+OPTIONS = {
+    "temperature": 0.7,
+    "num_predict": 300
+}
+
+
+def answer_prompt(transcript: str, rules: Dict) -> str:
+    """The per-answer part of the prompt. The transcript goes last."""
+    return f"""Analysis:
+- Word count: {rules.get('word_count', 0)}
+- Too long: {rules.get('too_long', False)}
+- Has structure: {rules.get('has_structure', False)}
+- Filler-word rate: {rules.get('filler_rate', 0):.0%}
+- Lexical diversity (unique/total words): {rules.get('lexical_diversity', 0):.2f}
+- Resume skills mentioned: {rules.get('technical_terms', 0)} ({rules.get('technical_density', 0):.0%} of words)
+- Repeated phrases: {rules.get('repetition_rate', 0):.0%}
+- Speaking rate: {_format_rate(rules.get('speaking_rate_wpm'))}
+
+Candidate's Answer:
+\"\"\"{transcript}\"\"\""""
+
+
+def generate_payload(prompt: str) -> Dict:
+    """/api/generate request body."""
+    return {
+        "model": OLLAMA_MODEL,
+        "system": SYSTEM_PROMPT,
+        "prompt": prompt,
+        "format": "json",
+        "stream": False,
+        "keep_alive": OLLAMA_KEEP_ALIVE,
+        "options": OPTIONS
+    }
+
+
+def _format_rate(wpm: Optional[float]) -> str:
+    return f"{wpm:.0f} words/min" if wpm else "unknown"
@@ -0,0 +1,85 @@
+# evaluation/records.py
+
+"""
+INTERVIEW RECORDS
+- One JSON line per finished interview session
+- Append-only, one file per day: RECORDS_DIR/interviews-YYYY-MM-DD.jsonl
+- Holds everything needed to re-grade offline: questions, final
+  transcripts, rules output, evaluation, model and prompt version
+"""
+
+import json
+import os
+import threading
+import time
+from typing import Dict, Iterator, List, Optional
+
+from backend.config import RECORDS_DIR, OLLAMA_MODEL, WHISPER_MODEL
+
+RECORD_VERSION = 1
+
+_write_lock = threading.Lock()
+
+
+def build_record(session_id: str, started_at: float, questions: List[str],
+                 answers: List[Dict], parsed_resume: Optional[Dict],
+                 prompt_version: str) -> Dict:
+    """
+    Assemble the persisted form of one interview session.
+    """
+    return {
+        "record_version": RECORD_VERSION,
+        "record_id": session_id,
+        "started_at": started_at,
+        "ended_at": time.time(),
+        "llm_model": OLLAMA_MODEL,
+        "prompt_version": prompt_version,
+        "whisper_model": WHISPER_MODEL,
+        "parsed_resume": parsed_resume,
+        "questions": questions,
+        "answers": answers,
+    }
+
+
+def write_record(record: Dict, directory: str = RECORDS_DIR) -> str:
+    """
+    Append a record to today's file. Safe to call from several threads.
+    """
+    os.makedirs(directory, exist_ok=True)
+    day = time.strftime("%Y-%m-%d", time.gmtime(record.get("ended_at", time.time())))
+    path = os.path.join(directory, f"interviews-{day}.jsonl")
+    line = json.dumps(record, ensure_ascii=False) + "\n"
+
+    with _write_lock:
+        with open(path, "a", encoding="utf-8") as f:
+            f.write(line)
+            f.flush()
+            os.fsync(f.fileno())
+
+    return path
+
+
+def iter_records(path: str) -> Iterator[Dict]:
+    """
+    Stream records from a .jsonl file, or from every .jsonl file in a
+    directory (in name order). Truncated trailing lines are skipped.
+    """
+    if os.path.isdir(path):
+        files = [
+            os.path.join(path, name)
+            for name in sorted(os.listdir(path))
+            if name.endswith(".jsonl")
+        ]
+    else:
+        files = [path]
+
+    for file_path in files:
+        with open(file_path, encoding="utf-8") as f:
+            for line_no, line in enumerate(f, 1):
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    yield json.loads(line)
+                except json.JSONDecodeError:
+                    print(f"Skipping malformed record {file_path}:{line_no}")
@@ -0,0 +1,285 @@
+# evaluation/report.py
+
+"""
+INTERVIEW REPORT
+Built INCREMENTALLY while the interview runs: each graded answer updates
+running totals (overall, per question kind, per resume skill) and renders
+its own HTML row, so finishing the interview needs no summary pass and
+no re-evaluation.
+
+- Skill questions count for their skill; project and experience
+  questions count for every resume skill their topic mentions
+- Only real grades are aggregated: skipped answers and failed or
+  unavailable evaluations are listed but not scored
+- Formats: JSON (dict), HTML, PDF (only when reportlab is installed)
+- On disk: REPORTS_DIR/report-<session_id>.{json,html,pdf}
+"""
+
+import html
+import json
+import os
+import re
+import time
+from typing import Dict, List, Optional
+
+from backend.config import REPORTS_DIR
+
+try:
+    from reportlab.lib import colors
+    from reportlab.lib.pagesizes import A4
+    from reportlab.lib.styles import getSampleStyleSheet
+    from reportlab.platypus import Paragraph, SimpleDocTemplate, Spacer, Table, TableStyle
+except ImportError:  # optional dependency, JSON and HTML still work
+    SimpleDocTemplate = None
+
+REPORT_VERSION = 1
+
+# Results with these graded_by values are real scores
+GRADED = ("llm", "rules")
+
+
+class Aggregate:
+    """
+    Running count / mean / min / max of scores.
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.min: Optional[float] = None
+        self.max: Optional[float] = None
+
+    def add(self, score: float):
+        self.count += 1
+        self.total += score
+        self.min = score if self.min is None else min(self.min, score)
+        self.max = score if self.max is None else max(self.max, score)
+
+    def summary(self) -> Dict:
+        return {
+            "answered": self.count,
+            "average_score": round(self.total / self.count, 2) if self.count else None,
+            "min_score": self.min,
+            "max_score": self.max,
+        }
+
+
+def question_skills(item: Dict, skills: List[str]) -> List[str]:
+    """Resume skills a planned question covers."""
+    if item.get("kind") == "skill":
+        return [item["topic"]]
+    topic = (item.get("topic") or "").lower()
+    return [
+        skill for skill in skills
+        if re.search(rf"(?<!\w){re.escape(skill.lower())}(?!\w)", topic)
+    ]
+
+
+class ReportBuilder:
+    """
+    Accumulates ONE session's results into its report.
+    """
+
+    def __init__(self, session_id: str, plan: List[Dict],
+                 parsed_resume: Optional[Dict] = None,
+                 started_at: Optional[float] = None):
+        self.session_id = session_id
+        self.plan = plan
+        self.started_at = started_at or time.time()
+        self.skills: List[str] = list((parsed_resume or {}).get("skills", []))
+
+        # Skills per question are resolved once, up front
+        self.covers = [question_skills(item, self.skills) for item in plan]
+
+        self.overall = Aggregate()
+        self.by_skill: Dict[str, Aggregate] = {skill: Aggregate() for skill in self.skills}
+        self.by_kind: Dict[str, Aggregate] = {}
+        self.graded_by: Dict[str, int] = {}
+        self.skipped = 0
+        self.deferred = 0
+
+        self.questions: List[Dict] = []
+        self._rows: List[str] = []
+
+    def add(self, question_index: int, transcript: str, result: Dict) -> Dict:
+        """Fold in one processed question. Returns its report entry."""
+        item = self.plan[question_index] if question_index < len(self.plan) else {}
+        graded_by = result.get("graded_by")
+        scored = bool(transcript) and graded_by in GRADED
+
+        entry = {
+            "index": question_index,
+            "question": item.get("text"),
+            "kind": item.get("kind"),
+            "topic": item.get("topic"),
+            "skills": self.covers[question_index] if question_index < len(self.covers) else [],
+            "answered": bool(transcript),
+            "scored": scored,
+            "score": result.get("score") if scored else None,
+            "clarity": result.get("clarity"),
+            "depth": result.get("depth"),
+            "feedback": result.get("feedback"),
+            "graded_by": graded_by,
+        }
+
+        if not transcript:
+            self.skipped += 1
+        if graded_by:
+            self.graded_by[graded_by] = self.graded_by.get(graded_by, 0) + 1
+        if result.get("deferred_rescore"):
+            self.deferred += 1
+
+        if scored:
+            score = float(entry["score"])
+            self.overall.add(score)
+            self.by_kind.setdefault(entry["kind"] or "general", Aggregate()).add(score)
+            for skill in entry["skills"]:
+                self.by_skill[skill].add(score)
+
+        self.questions.append(entry)
+        self._rows.append(_html_row(entry))
+        return entry
+
+    def report(self, completed: bool = True) -> Dict:
+        """The report as it stands (cheap: totals are already kept)."""
+        return {
+            "report_version": REPORT_VERSION,
+            "session_id": self.session_id,
+            "started_at": self.started_at,
+            "ended_at": time.time(),
+            "completed": completed,
+            "overall": {
+                **self.overall.summary(),
+                "questions": len(self.plan),
+                "processed": len(self.questions),
+                "skipped": self.skipped,
+                "deferred_rescore": self.deferred,
+                "graded_by": dict(self.graded_by),
+            },
+            "skills": [
+                {"skill": skill, **aggregate.summary()}
+                for skill, aggregate in self.by_skill.items()
+            ],
+            "kinds": {kind: aggregate.summary() for kind, aggregate in self.by_kind.items()},
+            "questions": self.questions,
+        }
+
+    def html(self, report: Dict) -> str:
+        """Full HTML page; question rows were rendered as answers came in."""
+        overall = report["overall"]
+        skill_rows = "".join(
+            f"<tr><td>{html.escape(s['skill'])}</td><td>{s['answered']}</td>"
+            f"<td>{_fmt(s['average_score'])}</td><td>{_fmt(s['min_score'])}</td>"
+            f"<td>{_fmt(s['max_score'])}</td></tr>"
+            for s in report["skills"]
+        )
+        status = "Completed" if report["completed"] else "Incomplete"
+        started = time.strftime("%Y-%m-%d %H:%M UTC", time.gmtime(report["started_at"]))
+
+        return (
+            "<!DOCTYPE html><html><head><meta charset=\"utf-8\">"
+            f"<title>Interview report {html.escape(report['session_id'])}</title>"
+            f"<style>{_CSS}</style></head><body>"
+            f"<h1>Interview report</h1>"
+            f"<p>{status} &middot; started {started} &middot; "
+            f"{overall['processed']}/{overall['questions']} questions, "
+            f"{overall['skipped']} skipped</p>"
+            f"<p class=\"score\">Average score: {_fmt(overall['average_score'])}/10</p>"
+            "<h2>Skills</h2>"
+            "<table><tr><th>Skill</th><th>Answered</th><th>Average</th><th>Min</th><th>Max</th></tr>"
+            f"{skill_rows}</table>"
+            "<h2>Questions</h2>"
+            "<table><tr><th>#</th><th>Question</th><th>Score</th><th>Clarity</th>"
+            "<th>Depth</th><th>Feedback</th></tr>"
+            f"{''.join(self._rows)}</table>"
+            "</body></html>"
+        )
+
+
+_CSS = (
+    "body{font-family:-apple-system,Segoe UI,Roboto,sans-serif;margin:2em;color:#333}"
+    "table{border-collapse:collapse;width:100%;margin-bottom:1.5em}"
+    "th,td{border:1px solid #ddd;padding:6px 8px;text-align:left;vertical-align:top}"
+    "th{background:#667eea;color:#fff}.score{font-size:1.4em;font-weight:bold}"
+)
+
+
+def _fmt(value) -> str:
+    return "-" if value is None else f"{value:g}"
+
+
+def _html_row(entry: Dict) -> str:
+    score = _fmt(entry["score"]) if entry["scored"] else ("skipped" if not entry["answered"] else "not graded")
+    return (
+        f"<tr><td>{entry['index'] + 1}</td><td>{html.escape(entry['question'] or '')}</td>"
+        f"<td>{score}</td><td>{html.escape(str(entry['clarity'] or ''))}</td>"
+        f"<td>{html.escape(str(entry['depth'] or ''))}</td>"
+        f"<td>{html.escape(str(entry['feedback'] or ''))}</td></tr>"
+    )
+
+
+def render_pdf(report: Dict, path: str) -> bool:
+    """Write a PDF version. False when reportlab is not installed."""
+    if SimpleDocTemplate is None:
+        return False
+
+    styles = getSampleStyleSheet()
+    cell = styles["BodyText"]
+    overall = report["overall"]
+
+    def table(rows):
+        t = Table(rows, repeatRows=1)
+        t.setStyle(TableStyle([
+            ("BACKGROUND", (0, 0), (-1, 0), colors.HexColor("#667eea")),
+            ("TEXTCOLOR", (0, 0), (-1, 0), colors.white),
+            ("GRID", (0, 0), (-1, -1), 0.5, colors.lightgrey),
+            ("VALIGN", (0, 0), (-1, -1), "TOP"),
+        ]))
+        return t
+
+    story = [
+        Paragraph("Interview report", styles["Title"]),
+        Paragraph(
+            f"{overall['processed']}/{overall['questions']} questions, {overall['skipped']} skipped. "
+            f"Average score: {_fmt(overall['average_score'])}/10",
+            cell
+        ),
+        Spacer(1, 12),
+        Paragraph("Skills", styles["Heading2"]),
+        table([["Skill", "Answered", "Average", "Min", "Max"]] + [
+            [Paragraph(html.escape(s["skill"]), cell), s["answered"], _fmt(s["average_score"]),
+             _fmt(s["min_score"]), _fmt(s["max_score"])]
+            for s in report["skills"]
+        ]),
+        Spacer(1, 12),
+        Paragraph("Questions", styles["Heading2"]),
+        table([["#", "Question", "Score", "Feedback"]] + [
+            [q["index"] + 1, Paragraph(html.escape(q["question"] or ""), cell),
+             _fmt(q["score"]), Paragraph(html.escape(str(q["feedback"] or "")), cell)]
+            for q in report["questions"]
+        ]),
+    ]
+    SimpleDocTemplate(path, pagesize=A4).build(story)
+    return True
+
+
+def write_report(report: Dict, page: str, directory: str = REPORTS_DIR) -> Dict[str, str]:
+    """
+    Write the JSON, HTML and (if possible) PDF report. Returns the paths.
+    """
+    os.makedirs(directory, exist_ok=True)
+    base = os.path.join(directory, f"report-{report['session_id']}")
+    paths = {"json": base + ".json", "html": base + ".html"}
+
+    with open(paths["json"], "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    with open(paths["html"], "w", encoding="utf-8") as f:
+        f.write(page)
+
+    try:
+        if render_pdf(report, base + ".pdf"):
+            paths["pdf"] = base + ".pdf"
+    except Exception as e:
+        print(f"PDF report error: {e}")
+
+    return paths
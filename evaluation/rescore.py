@@ -0,0 +1,171 @@
+# evaluation/rescore.py
+
+"""
+OFFLINE RE-SCORING
+Streams stored interview records through the CURRENT rules + LLM
+evaluator (e.g. after changing OLLAMA_MODEL or the prompt), so grading
+can be redone off-peak.
+
+- Records are read lazily; at most --concurrency are in flight
+- Results are appended to --output as JSON lines
+- Finished record ids are appended to --checkpoint; rerunning the same
+  command skips them, so an interrupted job resumes where it stopped
+  (a record finished just before a crash may appear twice in the
+  output; consumers should keep the last line per record_id)
+- A record counts as re-scored only if EVERY answer was graded by the
+  LLM, except empty / too-short answers, which the rules always grade
+  the same way. Fallback grades (Ollama down, breaker open, HTTP error,
+  bad JSON) fail the record: nothing is written or checkpointed, and
+  the exit code is 1
+
+Usage:
+    python -m evaluation.rescore --input data/interviews --output rescored.jsonl
+    python -m evaluation.rescore --input data/interviews --output rescored.jsonl \\
+        --only-deferred --concurrency 2
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Dict, Set
+
+from backend.config import OLLAMA_MODEL
+from evaluation.llm_eval import evaluate_with_llm, PROMPT_VERSION
+from evaluation.records import iter_records
+from evaluation.rules import run_rules
+
+
+class RescoreError(Exception):
+    pass
+
+
+def needs_rescore(answer: Dict, only_deferred: bool) -> bool:
+    if not answer.get("transcript"):
+        return False
+    if not only_deferred:
+        return True
+    result = answer.get("result") or {}
+    return bool(result.get("deferred_rescore")) or result.get("graded_by") != "llm"
+
+
+def rescore_record(record: Dict, only_deferred: bool) -> Dict:
+    """Re-run rules and the LLM for every eligible answer in one record."""
+    rescored = []
+
+    for answer in record.get("answers", []):
+        if not needs_rescore(answer, only_deferred):
+            continue
+
+        rules = run_rules(
+            answer["transcript"],
+            duration_seconds=answer.get("speech_seconds"),
+            skills=(record.get("parsed_resume") or {}).get("skills")
+        )
+        result = evaluate_with_llm(
+            transcript=answer["transcript"], rules=rules, allow_rules_decision=False
+        )
+        # Empty and too-short answers never reach the LLM: that grade is final
+        by_rules = rules.get("empty_answer") or rules.get("too_short")
+        if result.get("deferred_rescore") or (result.get("graded_by") != "llm" and not by_rules):
+            raise RescoreError(
+                f"answer {answer.get('question_index')} not graded by the LLM "
+                f"(graded_by={result.get('graded_by')})"
+            )
+        rescored.append({
+            "question_index": answer.get("question_index"),
+            "previous": answer.get("result"),
+            "rules": rules,
+            "result": result,
+        })
+
+    return {
+        "record_id": record.get("record_id"),
+        "rescored_at": time.time(),
+        "llm_model": OLLAMA_MODEL,
+        "prompt_version": PROMPT_VERSION,
+        "source_llm_model": record.get("llm_model"),
+        "source_prompt_version": record.get("prompt_version"),
+        "answers": rescored,
+    }
+
+
+def load_checkpoint(path: str) -> Set[str]:
+    if not os.path.exists(path):
+        return set()
+    with open(path, encoding="utf-8") as f:
+        return {line.strip() for line in f if line.strip()}
+
+
+def run(input_path: str, output_path: str, checkpoint_path: str,
+        concurrency: int, only_deferred: bool, limit: int = 0) -> Dict[str, int]:
+    done = load_checkpoint(checkpoint_path)
+    stats = {"skipped": 0, "rescored": 0, "failed": 0, "answers": 0}
+
+    with open(output_path, "a", encoding="utf-8") as out, \
+            open(checkpoint_path, "a", encoding="utf-8") as ckpt, \
+            ThreadPoolExecutor(max_workers=concurrency) as pool:
+
+        in_flight = {}
+
+        def drain(block_until_below: int):
+            while len(in_flight) > block_until_below:
+                finished, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    record_id = in_flight.pop(future)
+                    try:
+                        result = future.result()
+                    except Exception as e:
+                        stats["failed"] += 1
+                        print(f"Re-scoring {record_id} failed: {e}", file=sys.stderr)
+                        continue
+
+                    # Output first, then checkpoint: at-least-once on crash
+                    out.write(json.dumps(result, ensure_ascii=False) + "\n")
+                    out.flush()
+                    ckpt.write(f"{record_id}\n")
+                    ckpt.flush()
+
+                    stats["rescored"] += 1
+                    stats["answers"] += len(result["answers"])
+
+        for record in iter_records(input_path):
+            record_id = record.get("record_id")
+            if not record_id or record_id in done:
+                stats["skipped"] += 1
+                continue
+            if limit and stats["rescored"] + len(in_flight) >= limit:
+                break
+
+            drain(concurrency - 1)
+            in_flight[pool.submit(rescore_record, record, only_deferred)] = record_id
+            done.add(record_id)
+
+        drain(0)
+
+    return stats
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Re-score stored interviews with the current evaluator")
+    parser.add_argument("--input", required=True, help="records .jsonl file or directory")
+    parser.add_argument("--output", required=True, help="append re-scored results here")
+    parser.add_argument("--checkpoint", help="default: <output>.checkpoint")
+    parser.add_argument("--concurrency", type=int, default=2, help="records evaluated at once")
+    parser.add_argument("--only-deferred", action="store_true",
+                        help="only answers not graded by the LLM (e.g. degraded tier)")
+    parser.add_argument("--limit", type=int, default=0, help="stop after N records (0 = all)")
+    args = parser.parse_args(argv)
+
+    checkpoint = args.checkpoint or args.output + ".checkpoint"
+    start = time.perf_counter()
+    stats = run(args.input, args.output, checkpoint, args.concurrency, args.only_deferred, args.limit)
+    stats["seconds"] = round(time.perf_counter() - start, 1)
+    print(json.dumps(stats))
+    return 1 if stats["failed"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
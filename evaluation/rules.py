@@ -4,17 +4,144 @@
 RULE-BASED EVALUATION
 Runs BEFORE LLM.
 Deterministic and fast.
+
+- One pass over the transcript collects raw counts
+- Derived features are computed with NumPy, for one answer or a batch
+- Features feed both the LLM prompt and fallback_evaluation
+- Resume skills of any length count as technical terms
+  ("python", "machine learning", "ruby on rails")
 """
 
-def run_rules(transcript: str) -> dict:
-    words = transcript.strip().split()
+from typing import Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
+
+FILLER_WORDS = {
+    "um", "uh", "er", "ah", "hmm", "like", "basically", "actually",
+    "literally", "so", "right", "okay"
+}
+
+FILLER_PHRASES = {("you", "know"), ("i", "mean"), ("kind", "of"), ("sort", "of")}
+
+_PUNCTUATION = ".,!?;:\"'()[]{}"
+
+# Order of the raw count columns produced by _count()
+_COUNT_COLUMNS = ("words", "fillers", "unique", "technical", "bigrams", "repeated_bigrams")
+
+
+def _count(transcript: str, skill_words: set, skill_phrases: set) -> List[int]:
+    """
+    Single pass over the tokens of one transcript.
+    """
+    words = 0
+    fillers = 0
+    technical = 0
+    repeated_bigrams = 0
+    seen_words = set()
+    seen_bigrams = set()
+    prev = None
+    longest = max((len(p) for p in skill_phrases), default=0)
+    recent: List[str] = []      # last `longest` tokens, for multi-word skills
+
+    for raw in transcript.split():
+        words += 1
+        token = raw.strip(_PUNCTUATION).lower()
+        if not token:
+            prev = None
+            recent.clear()
+            continue
+
+        seen_words.add(token)
+
+        if token in FILLER_WORDS:
+            fillers += 1
+        if token in skill_words:
+            technical += 1
+
+        if prev is not None:
+            bigram = (prev, token)
+            if bigram in FILLER_PHRASES:
+                fillers += 1
+            if bigram in seen_bigrams:
+                repeated_bigrams += 1
+            else:
+                seen_bigrams.add(bigram)
+
+        if longest:
+            recent.append(token)
+            del recent[:-longest]
+            for n in range(2, len(recent) + 1):
+                if tuple(recent[-n:]) in skill_phrases:
+                    technical += 1
+
+        prev = token
+
+    bigrams = len(seen_bigrams) + repeated_bigrams
+    return [words, fillers, len(seen_words), technical, bigrams, repeated_bigrams]
+
+
+def _split_skills(skills: Optional[Iterable[str]]):
+    """Single-word skills, and multi-word skills as token tuples."""
+    skill_words, skill_phrases = set(), set()
+    for skill in skills or []:
+        parts = tuple(skill.lower().split())
+        if len(parts) == 1:
+            skill_words.add(parts[0])
+        elif parts:
+            skill_phrases.add(parts)
+    return skill_words, skill_phrases
+
+
+def run_rules_batch(transcripts: Sequence[str],
+                    durations: Optional[Sequence[Optional[float]]] = None,
+                    skills: Optional[Iterable[str]] = None) -> List[Dict]:
+    """
+    Score many transcripts at once.
+    durations: spoken seconds per transcript (None where unknown).
+    skills: resume skills used for technical-term density.
+    """
+    skill_words, skill_phrases = _split_skills(skills)
+
+    counts = np.array(
+        [_count(t, skill_words, skill_phrases) for t in transcripts],
+        dtype=np.float64
+    ).reshape(len(transcripts), len(_COUNT_COLUMNS))
+    words, fillers, unique, technical, bigrams, repeated = counts.T
+
+    safe_words = np.maximum(words, 1)
+    filler_rate = fillers / safe_words
+    lexical_diversity = unique / safe_words
+    technical_density = technical / safe_words
+    repetition_rate = repeated / np.maximum(bigrams, 1)
+
+    if durations is None:
+        durations = [None] * len(transcripts)
+    seconds = np.array([d if d else np.nan for d in durations], dtype=np.float64)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        speaking_rate = words / (seconds / 60)
+
+    results = []
+    for i in range(len(transcripts)):
+        word_count = int(words[i])
+        rate = speaking_rate[i]
+        results.append({
+            "word_count": word_count,
+            "empty_answer": word_count == 0,
+            "too_short": word_count < 20,
+            "too_long": word_count > 500,
+            "has_structure": word_count >= 40,
+            "filler_count": int(fillers[i]),
+            "filler_rate": round(float(filler_rate[i]), 4),
+            "lexical_diversity": round(float(lexical_diversity[i]), 4),
+            "technical_terms": int(technical[i]),
+            "technical_density": round(float(technical_density[i]), 4),
+            "repetition_rate": round(float(repetition_rate[i]), 4),
+            "speaking_rate_wpm": round(float(rate), 1) if np.isfinite(rate) else None,
+        })
+
+    return results
 
-    word_count = len(words)
 
-    return {
-        "word_count": word_count,
-        "empty_answer": word_count == 0,
-        "too_short": word_count < 20,
-        "too_long": word_count > 500,
-        "has_structure": word_count >= 40
-    }
+def run_rules(transcript: str, duration_seconds: Optional[float] = None,
+              skills: Optional[Iterable[str]] = None) -> dict:
+    return run_rules_batch([transcript], [duration_seconds], skills)[0]
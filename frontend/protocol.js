@@ -0,0 +1,109 @@
+// frontend/protocol.js
+
+/*
+ * WEBSOCKET PROTOCOL (browser side)
+ * - Message type names, kept in sync with backend/protocol.py
+ * - Minimal MessagePack decoder for the optional binary encoding
+ *   (/ws?encoding=msgpack). Client -> server messages stay JSON.
+ */
+
+const Protocol = (() => {
+    const MessageType = Object.freeze({
+        // Server -> client
+        HELLO: "hello",
+        QUEUED: "queued",
+        STATUS: "status",
+        QUESTION: "question",
+        AUDIO_START: "audio_start",
+        AUDIO_CHUNK: "audio_chunk",
+        AUDIO_END: "audio_end",
+        TRANSCRIPT_DELTA: "transcript_delta",
+        TRANSCRIPT_SNAPSHOT: "transcript_snapshot",
+        RESULT: "result",
+        REPORT: "report",
+        REPORT_HTML: "report_html",
+
+        // Client -> server
+        RESUME_PDF: "resume_pdf",
+        RESUME: "resume",
+        PROCESS: "process",
+        TRANSCRIPT_RESYNC: "transcript_resync",
+    });
+
+    const textDecoder = new TextDecoder();
+
+    function decodeMsgpack(buffer) {
+        const bytes = new Uint8Array(buffer);
+        const view = new DataView(bytes.buffer, bytes.byteOffset, bytes.byteLength);
+        let pos = 0;
+
+        function str(length) {
+            const value = textDecoder.decode(bytes.subarray(pos, pos + length));
+            pos += length;
+            return value;
+        }
+
+        function bin(length) {
+            const value = bytes.slice(pos, pos + length);
+            pos += length;
+            return value;
+        }
+
+        function array(length) {
+            const value = new Array(length);
+            for (let i = 0; i < length; i++) value[i] = read();
+            return value;
+        }
+
+        function map(length) {
+            const value = {};
+            for (let i = 0; i < length; i++) {
+                const key = read();
+                value[key] = read();
+            }
+            return value;
+        }
+
+        function read() {
+            const byte = bytes[pos++];
+
+            if (byte <= 0x7f) return byte;                              // positive fixint
+            if (byte >= 0xe0) return byte - 0x100;                       // negative fixint
+            if ((byte & 0xf0) === 0x80) return map(byte & 0x0f);         // fixmap
+            if ((byte & 0xf0) === 0x90) return array(byte & 0x0f);       // fixarray
+            if ((byte & 0xe0) === 0xa0) return str(byte & 0x1f);         // fixstr
+
+            let value;
+            switch (byte) {
+                case 0xc0: return null;
+                case 0xc2: return false;
+                case 0xc3: return true;
+                case 0xc4: value = bytes[pos]; pos += 1; return bin(value);
+                case 0xc5: value = view.getUint16(pos); pos += 2; return bin(value);
+                case 0xc6: value = view.getUint32(pos); pos += 4; return bin(value);
+                case 0xca: value = view.getFloat32(pos); pos += 4; return value;
+                case 0xcb: value = view.getFloat64(pos); pos += 8; return value;
+                case 0xcc: value = view.getUint8(pos); pos += 1; return value;
+                case 0xcd: value = view.getUint16(pos); pos += 2; return value;
+                case 0xce: value = view.getUint32(pos); pos += 4; return value;
+                case 0xcf: value = Number(view.getBigUint64(pos)); pos += 8; return value;
+                case 0xd0: value = view.getInt8(pos); pos += 1; return value;
+                case 0xd1: value = view.getInt16(pos); pos += 2; return value;
+                case 0xd2: value = view.getInt32(pos); pos += 4; return value;
+                case 0xd3: value = Number(view.getBigInt64(pos)); pos += 8; return value;
+                case 0xd9: value = bytes[pos]; pos += 1; return str(value);
+                case 0xda: value = view.getUint16(pos); pos += 2; return str(value);
+                case 0xdb: value = view.getUint32(pos); pos += 4; return str(value);
+                case 0xdc: value = view.getUint16(pos); pos += 2; return array(value);
+                case 0xdd: value = view.getUint32(pos); pos += 4; return array(value);
+                case 0xde: value = view.getUint16(pos); pos += 2; return map(value);
+                case 0xdf: value = view.getUint32(pos); pos += 4; return map(value);
+            }
+            throw new Error("Unsupported MessagePack byte 0x" + byte.toString(16));
+        }
+
+        return read();
+    }
+
+    return { MessageType, decodeMsgpack };
+})();
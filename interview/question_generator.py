@@ -14,43 +14,63 @@ def generate_questions(parsed_resume: Dict) -> List[str]:
     """
     Generate interview questions from parsed resume.
     """
+    return [item["text"] for item in generate_question_plan(parsed_resume)]
 
-    questions: List[str] = []
+
+def generate_question_plan(parsed_resume: Dict) -> List[Dict]:
+    """
+    Same questions as generate_questions(), each with what it is about:
+    {"text", "kind": project|skill|experience|general, "topic"}
+    (topic is the project, skill or experience line; None for general).
+    """
+
+    plan: List[Dict] = []
 
     # ------------------------
     # 1. PROJECT QUESTIONS
     # ------------------------
     projects = parsed_resume.get("projects", [])
     for project in projects:
-        questions.extend(generate_project_questions(project))
+        plan.extend(
+            {"text": text, "kind": "project", "topic": project}
+            for text in generate_project_questions(project)
+        )
 
     # ------------------------
     # 2. SKILL QUESTIONS
     # ------------------------
     skills = parsed_resume.get("skills", [])
     for skill in skills:
-        questions.extend(generate_skill_questions(skill))
+        plan.extend(
+            {"text": text, "kind": "skill", "topic": skill}
+            for text in generate_skill_questions(skill)
+        )
 
     # ------------------------
     # 3. EXPERIENCE QUESTIONS
     # ------------------------
     experience = parsed_resume.get("experience", [])
     for exp in experience:
-        questions.append(
-            f"Can you describe your experience related to: {exp}?"
-        )
+        plan.append({
+            "text": f"Can you describe your experience related to: {exp}?",
+            "kind": "experience",
+            "topic": exp
+        })
 
     # ------------------------
     # 4. FALLBACK QUESTIONS
     # ------------------------
-    if not questions:
-        questions = [
-            "Tell me about yourself.",
-            "What are your strengths as an engineer?",
-            "What kind of problems do you enjoy solving?"
+    if not plan:
+        plan = [
+            {"text": text, "kind": "general", "topic": None}
+            for text in (
+                "Tell me about yourself.",
+                "What are your strengths as an engineer?",
+                "What kind of problems do you enjoy solving?"
+            )
         ]
 
-    return questions
+    return plan
 
 
 # =================================
@@ -5,7 +5,7 @@ Main entry point to start the FastAPI server
 """
 
 import uvicorn
-from backend.config import HOST, PORT
+from backend.config import HOST, PORT, WS_PER_MESSAGE_DEFLATE
 
 if __name__ == "__main__":
     print(f"Starting AI Interview System on {HOST}:{PORT}")
@@ -15,5 +15,6 @@ if __name__ == "__main__":
         "backend.main:app",
         host=HOST,
         port=PORT,
+        ws_per_message_deflate=WS_PER_MESSAGE_DEFLATE,
         reload=True
     )
\ No newline at end of file
@@ -0,0 +1,292 @@
+# speech/audio_store.py
+
+"""
+AUDIO ARCHIVE (OPT-IN)
+Keeps a session's answer audio so transcription bugs can be reproduced
+and answers re-transcribed with a better model.
+
+- Only when AUDIO_STORE_ENABLED and the client connects with /ws?archive=1
+- Audio is stored decoded: 16 kHz mono int16 PCM
+- One preallocated, memory-mapped file per session: session-<id>.pcm
+- Segment index next to it: session-<id>.json
+  (byte offset, length, timestamps, VAD flag, question index)
+- Readers get NumPy views straight into the mapping (no copies)
+- Per-session size cap, plus retention by age and total size
+
+Usage:
+    python -m speech.audio_store data/audio/session-<id>.json
+    python -m speech.audio_store data/audio/session-<id>.json --transcribe medium
+"""
+
+import argparse
+import io
+import json
+import mmap
+import os
+import subprocess
+import sys
+import threading
+import time
+import wave
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from backend.config import (
+    AUDIO_STORE_DIR,
+    AUDIO_STORE_SESSION_BYTES,
+    AUDIO_STORE_MAX_BYTES,
+    AUDIO_STORE_RETENTION_DAYS,
+    AUDIO_VAD_THRESHOLD,
+)
+
+SAMPLE_RATE = 16000
+BYTES_PER_SAMPLE = 2
+VAD_FRAME = SAMPLE_RATE * 30 // 1000     # 30 ms frames
+
+
+def decode_pcm(audio_bytes: bytes) -> np.ndarray:
+    """
+    Decode a browser audio chunk (WebM/Opus, or WAV from the benchmarks)
+    to 16 kHz mono int16 samples. Raises on undecodable input.
+    """
+    if audio_bytes[:4] == b"RIFF":
+        with wave.open(io.BytesIO(audio_bytes)) as w:
+            if (w.getframerate(), w.getnchannels(), w.getsampwidth()) == (SAMPLE_RATE, 1, 2):
+                return np.frombuffer(w.readframes(w.getnframes()), dtype=np.int16)
+
+    # Same conversion Whisper's load_audio() does, but through pipes
+    out = subprocess.run(
+        ["ffmpeg", "-nostdin", "-loglevel", "error", "-i", "pipe:0",
+         "-f", "s16le", "-ac", "1", "-ar", str(SAMPLE_RATE), "pipe:1"],
+        input=audio_bytes, capture_output=True, check=True
+    ).stdout
+    return np.frombuffer(out, dtype=np.int16)
+
+
+def decode_chunks(chunks: List[bytes]) -> np.ndarray:
+    """
+    Decode several chunks as one clip. Each chunk is its own file
+    (WAV header, WebM container), so they are decoded one by one and
+    joined as samples, never as bytes.
+    """
+    if len(chunks) == 1:
+        return decode_pcm(chunks[0])
+    return np.concatenate([decode_pcm(chunk) for chunk in chunks])
+
+
+def voice_activity(pcm: np.ndarray) -> Tuple[bool, float]:
+    """Energy VAD: (any voiced frame, fraction of voiced 30 ms frames)."""
+    frames = len(pcm) // VAD_FRAME
+    if frames == 0:
+        return False, 0.0
+
+    blocks = pcm[:frames * VAD_FRAME].astype(np.float32).reshape(frames, VAD_FRAME)
+    rms = np.sqrt(np.mean(blocks * blocks, axis=1))
+    voiced = float(np.mean(rms >= AUDIO_VAD_THRESHOLD))
+    return voiced > 0, round(voiced, 3)
+
+
+class AudioStore:
+    """
+    Append-only PCM archive for ONE session.
+    """
+
+    def __init__(self, session_id: str, directory: str = AUDIO_STORE_DIR,
+                 capacity: int = AUDIO_STORE_SESSION_BYTES):
+        os.makedirs(directory, exist_ok=True)
+        self.session_id = session_id
+        self.directory = directory
+        self.pcm_path = os.path.join(directory, f"session-{session_id}.pcm")
+        self.index_path = os.path.join(directory, f"session-{session_id}.json")
+        self.capacity = capacity - capacity % BYTES_PER_SAMPLE
+        self.created_at = time.time()
+
+        self.used = 0
+        self.full = False
+        self.segments: List[Dict] = []
+        self._lock = threading.Lock()
+
+        self._file = open(self.pcm_path, "w+b")
+        try:
+            os.posix_fallocate(self._file.fileno(), 0, self.capacity)
+        except (AttributeError, OSError):
+            self._file.truncate(self.capacity)
+        self._mm = mmap.mmap(self._file.fileno(), self.capacity)
+
+    def append(self, pcm: np.ndarray, question_index: Optional[int] = None,
+               received_at: Optional[float] = None) -> Optional[Dict]:
+        """
+        Copy one decoded chunk into the mapping and index it.
+        Returns the segment, or None once the session cap is reached.
+        """
+        data = memoryview(np.ascontiguousarray(pcm, dtype=np.int16)).cast("B")
+        vad, voiced_ratio = voice_activity(pcm)
+
+        with self._lock:
+            if self._mm is None or self.used + len(data) > self.capacity:
+                if not self.full:
+                    self.full = True
+                    print(f"Audio archive full for session {self.session_id}")
+                return None
+
+            offset = self.used
+            self._mm[offset:offset + len(data)] = data
+            self.used += len(data)
+
+            segment = {
+                "index": len(self.segments),
+                "offset": offset,
+                "length": len(data),
+                "start": offset / BYTES_PER_SAMPLE / SAMPLE_RATE,
+                "duration": len(pcm) / SAMPLE_RATE,
+                "received_at": received_at or time.time(),
+                "vad": vad,
+                "voiced_ratio": voiced_ratio,
+                "question_index": question_index,
+            }
+            self.segments.append(segment)
+            return segment
+
+    def slice(self, segment: Dict) -> np.ndarray:
+        """Zero-copy view of a segment's samples. Drop views before close()."""
+        return np.frombuffer(
+            self._mm, dtype=np.int16,
+            count=segment["length"] // BYTES_PER_SAMPLE, offset=segment["offset"]
+        )
+
+    def close(self):
+        """Write the index, shrink the file to the used size, apply retention."""
+        with self._lock:
+            if self._mm is None:
+                return
+            self._mm.flush()
+            self._mm.close()
+            self._mm = None
+            self._file.truncate(self.used)
+            self._file.close()
+
+            index = {
+                "session_id": self.session_id,
+                "sample_rate": SAMPLE_RATE,
+                "sample_format": "s16le",
+                "created_at": self.created_at,
+                "closed_at": time.time(),
+                "bytes": self.used,
+                "truncated": self.full,
+                "pcm_file": os.path.basename(self.pcm_path),
+                "segments": self.segments,
+            }
+            tmp_path = self.index_path + ".tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(index, f)
+            os.replace(tmp_path, self.index_path)
+
+        if not self.used:
+            remove_session(self.index_path)
+
+        enforce_retention(self.directory)
+
+
+class ArchivedSession:
+    """
+    Read-only view of a closed session (re-transcription, benchmark replay).
+    """
+
+    def __init__(self, index_path: str):
+        with open(index_path, encoding="utf-8") as f:
+            self.index = json.load(f)
+        self.segments: List[Dict] = self.index["segments"]
+
+        pcm_path = os.path.join(os.path.dirname(index_path), self.index["pcm_file"])
+        self._file = open(pcm_path, "rb")
+        self._mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ) if self.index["bytes"] else None
+
+    def slice(self, segment: Dict) -> np.ndarray:
+        return np.frombuffer(
+            self._mm, dtype=np.int16,
+            count=segment["length"] // BYTES_PER_SAMPLE, offset=segment["offset"]
+        )
+
+    def iter_segments(self, voiced_only: bool = False) -> Iterator[Tuple[Dict, np.ndarray]]:
+        for segment in self.segments:
+            if voiced_only and not segment["vad"]:
+                continue
+            yield segment, self.slice(segment)
+
+    def close(self):
+        if self._mm is not None:
+            try:
+                self._mm.close()
+            except BufferError:
+                pass    # slices still referenced; the mapping goes with them
+        self._file.close()
+
+
+def remove_session(index_path: str):
+    pcm_path = index_path[:-len(".json")] + ".pcm"
+    for path in (pcm_path, index_path):
+        try:
+            os.unlink(path)
+        except FileNotFoundError:
+            pass
+
+
+def enforce_retention(directory: str = AUDIO_STORE_DIR,
+                      max_age_days: float = AUDIO_STORE_RETENTION_DAYS,
+                      max_bytes: int = AUDIO_STORE_MAX_BYTES):
+    """
+    Delete archived sessions older than max_age_days, then the oldest
+    ones until the archive fits in max_bytes.
+    """
+    sessions = []
+    for name in os.listdir(directory):
+        if not (name.startswith("session-") and name.endswith(".json")):
+            continue
+        index_path = os.path.join(directory, name)
+        pcm_path = index_path[:-len(".json")] + ".pcm"
+        try:
+            size = os.path.getsize(pcm_path) if os.path.exists(pcm_path) else 0
+            sessions.append((os.path.getmtime(index_path), size, index_path))
+        except OSError:
+            continue
+
+    sessions.sort()
+    cutoff = time.time() - max_age_days * 86400
+    total = sum(size for _, size, _ in sessions)
+
+    for mtime, size, index_path in sessions:
+        if mtime >= cutoff and total <= max_bytes:
+            break
+        remove_session(index_path)
+        total -= size
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Inspect or re-transcribe an archived session")
+    parser.add_argument("index", help="session-<id>.json")
+    parser.add_argument("--transcribe", metavar="MODEL", help="re-transcribe with this Whisper model")
+    parser.add_argument("--voiced-only", action="store_true", help="skip segments without voice activity")
+    args = parser.parse_args(argv)
+
+    session = ArchivedSession(args.index)
+    model = None
+    if args.transcribe:
+        from speech.stt import get_model
+        model = get_model(args.transcribe)
+
+    try:
+        for segment, pcm in session.iter_segments(args.voiced_only):
+            line = {k: segment[k] for k in ("index", "question_index", "start", "duration", "vad")}
+            if model is not None:
+                audio = pcm.astype(np.float32) / 32768.0
+                line["text"] = model.transcribe(audio, fp16=False, language="en")["text"].strip()
+            print(json.dumps(line))
+    finally:
+        session.close()
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,164 @@
+# speech/model_manager.py
+
+"""
+STT MODEL MANAGER
+PyTorch models must not be called from two threads at once, so each
+Whisper replica is owned by exactly ONE worker thread:
+
+- Each model name is loaded from disk ONCE (guarded) into a pristine
+  base that never runs inference; every replica, and CLI callers outside
+  replicas, get a deep copy made under the same lock
+- STT_REPLICAS replicas, each a single-thread executor whose thread sets
+  torch.set_num_threads(STT_THREADS_PER_REPLICA) for its own work
+- Jobs go to the least-busy replica (queued + running)
+- Per-replica busy time, jobs and queue depth are exported as metrics
+
+Replicas cost memory: the base plus one copy of each model name per
+replica (~0.5 GB each for "small").
+"""
+
+import asyncio
+import copy
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional
+
+from backend.config import STT_REPLICAS, STT_THREADS_PER_REPLICA
+from backend.metrics import Counter, Gauge
+
+REPLICA_QUEUE = Gauge(
+    "stt_replica_queue",
+    "Transcriptions queued or running per STT replica",
+    labels=["replica"]
+)
+
+REPLICA_BUSY_SECONDS = Counter(
+    "stt_replica_busy_seconds_total",
+    "Seconds each STT replica spent working (rate() = utilization)",
+    labels=["replica"]
+)
+
+REPLICA_JOBS = Counter(
+    "stt_replica_jobs_total",
+    "Transcriptions completed per STT replica",
+    labels=["replica"]
+)
+
+# Models as loaded from disk. Only ever deep-copied, never run: inference
+# registers hooks and caches on a model that a copy would carry along
+_base_models: Dict[str, object] = {}
+_load_lock = threading.Lock()
+
+# Copies for callers outside replica threads (CLI tools)
+_shared_models: Dict[str, object] = {}
+
+_local = threading.local()
+
+
+def _copy_model(name: str):
+    """A private copy of model `name`, loading the base on first use."""
+    with _load_lock:
+        base = _base_models.get(name)
+        if base is None:
+            import whisper
+            print(f"Loading Whisper model: {name}")
+            base = _base_models[name] = whisper.load_model(name)
+        return copy.deepcopy(base)
+
+
+class Replica:
+    """
+    One worker thread and the model copies only it may use.
+    """
+
+    def __init__(self, index: int, threads: int):
+        self.index = index
+        self.label = str(index)
+        self.threads = threads
+        self.models: Dict[str, object] = {}
+        self.pending = 0
+        self.executor = ThreadPoolExecutor(
+            max_workers=1,
+            thread_name_prefix=f"stt-{index}",
+            initializer=self._init_thread
+        )
+        REPLICA_QUEUE.set(0, replica=self.label)
+
+    def _init_thread(self):
+        _local.replica = self
+        try:
+            import torch
+            torch.set_num_threads(self.threads)
+        except ImportError:
+            pass    # stub STT backend, no torch installed
+
+    def model(self, name: str):
+        """Called on this replica's thread only."""
+        model = self.models.get(name)
+        if model is None:
+            model = self.models[name] = _copy_model(name)
+        return model
+
+    def run(self, fn: Callable, *args):
+        start = time.perf_counter()
+        try:
+            return fn(*args)
+        finally:
+            REPLICA_BUSY_SECONDS.inc(time.perf_counter() - start, replica=self.label)
+            REPLICA_JOBS.inc(replica=self.label)
+
+
+class ModelManager:
+    """
+    Dispatches transcription jobs across replicas.
+    """
+
+    def __init__(self, replicas: int = STT_REPLICAS, threads: int = STT_THREADS_PER_REPLICA):
+        self.replicas: List[Replica] = [Replica(i, threads) for i in range(max(1, replicas))]
+        self._lock = threading.Lock()
+
+    def _acquire(self) -> Replica:
+        with self._lock:
+            replica = min(self.replicas, key=lambda r: r.pending)
+            replica.pending += 1
+            REPLICA_QUEUE.set(replica.pending, replica=replica.label)
+            return replica
+
+    def _release(self, replica: Replica):
+        with self._lock:
+            replica.pending -= 1
+            REPLICA_QUEUE.set(replica.pending, replica=replica.label)
+
+    async def run(self, fn: Callable, *args):
+        """Run fn(*args) on the least-busy replica's thread."""
+        replica = self._acquire()
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(replica.executor, replica.run, fn, *args)
+        finally:
+            self._release(replica)
+
+
+def current_replica() -> Optional[Replica]:
+    return getattr(_local, "replica", None)
+
+
+def get_model(name: str):
+    """
+    The calling replica's copy of a model; outside replica threads
+    (CLI tools) one shared copy, never the base.
+    """
+    replica = current_replica()
+    if replica is not None:
+        return replica.model(name)
+
+    model = _shared_models.get(name)
+    if model is None:
+        model = _copy_model(name)
+        with _load_lock:
+            model = _shared_models.setdefault(name, model)
+    return model
+
+
+manager = ModelManager()
@@ -3,71 +3,219 @@
 """
 STT MODULE
 - Transcribes EACH audio chunk independently
-- No audio is stored
-- Text is returned immediately
+- Audio is decoded to 16 kHz PCM in memory (no temp files)
+- No audio is stored, unless the session opted in to the archive
+  (speech/audio_store.py)
+- Returns segments with word timings and confidence; the session drops
+  unreliable ones (is_reliable) before they reach the transcript
+- STT_BACKEND="stub" returns canned text (load tests, no model needed)
+- transcribe_async() runs transcription on the least-busy Whisper
+  replica (speech/model_manager.py)
 """
 
-import tempfile
-import os
-import whisper
-from backend.config import WHISPER_MODEL
+import time
+from typing import Dict, List, Optional, Sequence, Tuple, Union
 
-# Load model ONCE (important for performance)
-_model = None
+import numpy as np
 
-def get_model():
-    """Lazy load the Whisper model"""
-    global _model
-    if _model is None:
-        print(f"Loading Whisper model: {WHISPER_MODEL}")
-        _model = whisper.load_model(WHISPER_MODEL)
-    return _model
+from backend.config import WHISPER_MODEL, STT_BACKEND, STT_STUB_DELAY
+from backend.config import (
+    STT_NO_SPEECH_THRESHOLD, STT_LOGPROB_THRESHOLD, STT_COMPRESSION_RATIO_THRESHOLD
+)
+from backend.metrics import Counter
+from backend import profiler
+from speech.audio_store import AudioStore, decode_chunks
+from speech import model_manager
 
+DROPPED_SEGMENTS = Counter(
+    "stt_dropped_segments_total",
+    "Whisper segments dropped before reaching the transcript",
+    labels=["reason"]
+)
 
-def transcribe_chunk(audio_bytes: bytes) -> str:
+def get_model(name: str = WHISPER_MODEL):
     """
-    Convert a single audio chunk (WebM) to text.
+    Lazy load a Whisper model ("small", "base", ...). On an STT worker
+    thread this is that replica's own copy.
+    """
+    return model_manager.get_model(name)
+
+
+_STUB_WORDS = (
+    "i designed the service with a queue and a worker pool so that "
+    "requests were processed in parallel and we measured latency"
+).split()
+
+
+def stub_transcribe(chunks: Sequence[bytes]) -> List[Dict]:
+    """
+    Deterministic stand-in for Whisper used by the benchmark harness.
+    One segment per chunk, roughly one word per 2 KB of audio, after an
+    optional simulated delay (once per call, like one Whisper run).
+    Words are spread evenly over the chunk (16 kHz 16-bit WAV, or 1 s).
+    """
+    if STT_STUB_DELAY:
+        time.sleep(STT_STUB_DELAY)
+
+    segments = []
+    offset = 0.0
+    for audio_bytes in chunks:
+        count = max(1, min(len(_STUB_WORDS), len(audio_bytes) // 2048))
+        duration = len(audio_bytes) / 32000 if audio_bytes[:4] == b"RIFF" else 1.0
+        step = duration / count
+
+        words = [
+            {"word": " " + w, "start": round(offset + i * step, 3),
+             "end": round(offset + (i + 1) * step, 3), "probability": 0.9}
+            for i, w in enumerate(_STUB_WORDS[:count])
+        ]
+        segments.append({
+            "text": " ".join(_STUB_WORDS[:count]),
+            "start": round(offset, 3),
+            "end": round(offset + duration, 3),
+            "avg_logprob": -0.3,
+            "no_speech_prob": 0.01,
+            "compression_ratio": 1.2,
+            "words": words,
+        })
+        offset += duration
+    return segments
+
+
+def transcribe_segments(audio: Union[bytes, Sequence[bytes]], model_name: str = WHISPER_MODEL,
+                        store: Optional[AudioStore] = None,
+                        question_index: Optional[int] = None) -> List[Dict]:
+    """
+    Convert an audio chunk (WebM), or a batch of chunks transcribed as
+    one clip, to Whisper segments: text, start/end (seconds into the
+    clip), avg_logprob, no_speech_prob, compression_ratio and per-word
+    timings with probabilities.
 
     NOTE:
     - Browser sends WebM/Opus
-    - Whisper expects audio file
-    - We temporarily write chunk to disk
-
-    TODO:
-    - Proper WebM → PCM conversion for better accuracy
+    - Each chunk is decoded to 16 kHz mono PCM (ffmpeg), the format
+      Whisper works on, then the batch is joined as samples
+    - With a store, the decoded PCM is also archived
+    - Nothing is filtered here; see is_reliable()
     """
 
-    if not audio_bytes or len(audio_bytes) < 100:
-        return ""
+    chunks = [audio] if isinstance(audio, bytes) else list(audio)
+    chunks = [chunk for chunk in chunks if chunk and len(chunk) >= 100]
+    if not chunks:
+        return []
 
-    try:
-        # Create temporary file with .webm extension
-        with tempfile.NamedTemporaryFile(suffix=".webm", delete=False) as tmp:
-            tmp_path = tmp.name
-            tmp.write(audio_bytes)
-            tmp.flush()
-
-        try:
-            model = get_model()
-            
-            # Transcribe with error handling
-            result = model.transcribe(
-                tmp_path, 
-                fp16=False,
-                language="en",
-                task="transcribe"
-            )
-            
-            text = result.get("text", "").strip()
-            return text
-            
-        finally:
-            # Clean up temporary file
+    received_at = time.time()
+
+    if STT_BACKEND == "stub":
+        if store is not None:
             try:
-                os.unlink(tmp_path)
-            except:
-                pass
+                store.append(decode_chunks(chunks), question_index, received_at)
+            except Exception as e:
+                print(f"Audio archive error: {e}")
+        return stub_transcribe(chunks)
+
+    try:
+        pcm = decode_chunks(chunks)
+        if store is not None:
+            store.append(pcm, question_index, received_at)
+
+        model = get_model(model_name)
+
+        # Transcribe with error handling
+        result = model.transcribe(
+            pcm.astype(np.float32) / 32768.0,
+            fp16=False,
+            language="en",
+            task="transcribe",
+            word_timestamps=True
+        )
+
+        return [
+            {
+                "text": seg.get("text", "").strip(),
+                "start": seg.get("start", 0.0),
+                "end": seg.get("end", 0.0),
+                "avg_logprob": seg.get("avg_logprob", 0.0),
+                "no_speech_prob": seg.get("no_speech_prob", 0.0),
+                "compression_ratio": seg.get("compression_ratio", 1.0),
+                "words": [
+                    {
+                        "word": w["word"],
+                        "start": w["start"],
+                        "end": w["end"],
+                        "probability": w.get("probability", 1.0),
+                    }
+                    for w in seg.get("words", [])
+                ],
+            }
+            for seg in result.get("segments", [])
+        ]
 
     except Exception as e:
         print(f"STT transcription error: {e}")
-        return ""
\ No newline at end of file
+        return []
+
+
+def is_reliable(segment: Dict) -> Tuple[bool, str]:
+    """
+    (keep, reason). Drops Whisper's typical hallucinations: text produced
+    over silence, low-confidence decodes and repetition loops.
+    """
+    if not segment["text"]:
+        return False, "empty"
+    if segment["no_speech_prob"] > STT_NO_SPEECH_THRESHOLD and segment["avg_logprob"] < STT_LOGPROB_THRESHOLD:
+        return False, "no_speech"
+    if segment["avg_logprob"] < STT_LOGPROB_THRESHOLD - 0.5:
+        return False, "low_confidence"
+    if segment["compression_ratio"] > STT_COMPRESSION_RATIO_THRESHOLD:
+        return False, "repetition"
+    return True, ""
+
+
+def filter_segments(segments: List[Dict]) -> Tuple[List[Dict], int]:
+    """(reliable segments, number dropped)"""
+    kept = []
+    for segment in segments:
+        keep, reason = is_reliable(segment)
+        if keep:
+            kept.append(segment)
+        else:
+            DROPPED_SEGMENTS.inc(reason=reason)
+    return kept, len(segments) - len(kept)
+
+
+def speech_seconds(segments: List[Dict]) -> float:
+    """Time actually spent speaking: first word start to last word end, per segment."""
+    total = 0.0
+    for segment in segments:
+        words = segment.get("words")
+        if words:
+            total += max(0.0, words[-1]["end"] - words[0]["start"])
+        else:
+            total += max(0.0, segment["end"] - segment["start"])
+    return total
+
+
+def transcribe_chunk(audio_bytes: bytes, model_name: str = WHISPER_MODEL,
+                     store: Optional[AudioStore] = None,
+                     question_index: Optional[int] = None) -> str:
+    """
+    Convert a single audio chunk (WebM) to text (all segments, unfiltered).
+    """
+    segments = transcribe_segments(audio_bytes, model_name, store, question_index)
+    return " ".join(seg["text"] for seg in segments if seg["text"])
+
+
+async def transcribe_async(audio: Union[bytes, Sequence[bytes]], model_name: str = WHISPER_MODEL,
+                           store: Optional[AudioStore] = None,
+                           question_index: Optional[int] = None,
+                           session_id: Optional[str] = None) -> List[Dict]:
+    """
+    transcribe_segments() on the least-busy STT replica, so the event
+    loop keeps serving other sessions while Whisper runs. session_id
+    lets that session's profiler sample the replica thread.
+    """
+    return await model_manager.manager.run(
+        profiler.run_tagged, session_id,
+        transcribe_segments, audio, model_name, store, question_index
+    )
@@ -2,37 +2,256 @@
 
 """
 TTS MODULE
-- Uses Edge TTS locally
-- Converts question text → spoken audio
+- Converts question text → audio bytes (async, never blocks the event loop)
+- Pluggable engines: Edge TTS (network) or espeak-ng (local, offline)
+- Audio is cached on disk by (text, voice) hash with LRU eviction
+  (cache file I/O runs in worker threads)
+- Audio is streamed to the browser, nothing is played on the server
 """
 
-import subprocess
-import tempfile
+import asyncio
+import hashlib
 import os
+import threading
+from collections import OrderedDict
+from typing import AsyncIterator, Dict, Iterable, Optional, Tuple
 
+from backend.config import (
+    TTS_ENGINE,
+    TTS_VOICE,
+    TTS_LOCAL_VOICE,
+    TTS_CACHE_DIR,
+    TTS_CACHE_MAX_BYTES,
+)
 
-def speak(text: str):
+
+# =================================
+# ENGINES
+# =================================
+
+class EdgeTTSEngine:
+    """
+    Microsoft Edge TTS through the edge-tts library (needs network).
+    """
+    name = "edge"
+    mime = "audio/mpeg"
+    extension = ".mp3"
+
+    def __init__(self, voice: str = TTS_VOICE):
+        self.voice = voice
+
+    async def stream(self, text: str) -> AsyncIterator[bytes]:
+        import edge_tts
+
+        communicate = edge_tts.Communicate(text, self.voice)
+        async for chunk in communicate.stream():
+            if chunk["type"] == "audio":
+                yield chunk["data"]
+
+
+class LocalTTSEngine:
+    """
+    espeak-ng writing WAV to stdout. Works fully offline.
+    """
+    name = "local"
+    mime = "audio/wav"
+    extension = ".wav"
+
+    def __init__(self, voice: str = TTS_LOCAL_VOICE):
+        self.voice = voice
+
+    async def stream(self, text: str) -> AsyncIterator[bytes]:
+        proc = await asyncio.create_subprocess_exec(
+            # "--": question text starting with "-" is not an option
+            "espeak-ng", "--stdout", "-v", self.voice, "--", text,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.DEVNULL
+        )
+
+        while True:
+            chunk = await proc.stdout.read(64 * 1024)
+            if not chunk:
+                break
+            yield chunk
+
+        if await proc.wait() != 0:
+            raise RuntimeError(f"espeak-ng exited with code {proc.returncode}")
+
+
+ENGINES = {
+    EdgeTTSEngine.name: EdgeTTSEngine,
+    LocalTTSEngine.name: LocalTTSEngine,
+}
+
+
+# =================================
+# DISK CACHE (LRU)
+# =================================
+
+class AudioCache:
+    """
+    Stores synthesized audio as one file per key.
+    Least recently used files are evicted once max_bytes is exceeded.
+    Blocking; safe to call from several threads.
+    """
+
+    def __init__(self, directory: str, max_bytes: int):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.total_bytes = 0
+        self._index: "OrderedDict[str, int]" = OrderedDict()
+        self._lock = threading.Lock()
+
+        os.makedirs(directory, exist_ok=True)
+
+        # Rebuild LRU order from modification times left by previous runs
+        entries = []
+        for name in os.listdir(directory):
+            path = os.path.join(directory, name)
+            if name.endswith(".tmp") or not os.path.isfile(path):
+                continue
+            stat = os.stat(path)
+            entries.append((stat.st_mtime, name, stat.st_size))
+
+        for _, name, size in sorted(entries):
+            self._index[name] = size
+            self.total_bytes += size
+
+    def get(self, name: str) -> Optional[bytes]:
+        with self._lock:
+            if name not in self._index:
+                return None
+
+        path = os.path.join(self.directory, name)
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+        except OSError:
+            with self._lock:
+                if name in self._index:
+                    self.total_bytes -= self._index.pop(name)
+            return None
+
+        with self._lock:
+            if name in self._index:
+                self._index.move_to_end(name)
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return data
+
+    def put(self, name: str, data: bytes):
+        path = os.path.join(self.directory, name)
+        tmp_path = path + ".tmp"
+
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+
+        with self._lock:
+            if name in self._index:
+                self.total_bytes -= self._index.pop(name)
+            self._index[name] = len(data)
+            self.total_bytes += len(data)
+
+            self._evict()
+
+    def _evict(self):
+        """Called with the lock held."""
+        while self.total_bytes > self.max_bytes and len(self._index) > 1:
+            name, size = self._index.popitem(last=False)
+            self.total_bytes -= size
+            try:
+                os.unlink(os.path.join(self.directory, name))
+            except OSError:
+                pass
+
+
+# =================================
+# PUBLIC API
+# =================================
+
+_engine = None
+_cache: Optional[AudioCache] = None
+_cache_lock = threading.Lock()
+_inflight: Dict[str, "asyncio.Task"] = {}
+
+
+def get_engine():
+    """Lazy create the configured TTS engine"""
+    global _engine
+    if _engine is None:
+        if TTS_ENGINE not in ENGINES:
+            raise ValueError(f"Unknown TTS engine: {TTS_ENGINE}")
+        _engine = ENGINES[TTS_ENGINE]()
+    return _engine
+
+
+def get_cache() -> AudioCache:
+    """Lazy open the on-disk audio cache"""
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = AudioCache(TTS_CACHE_DIR, TTS_CACHE_MAX_BYTES)
+    return _cache
+
+
+def cache_key(text: str, voice: str, engine_name: str) -> str:
+    digest = hashlib.sha256(f"{engine_name}|{voice}|{text}".encode("utf-8"))
+    return digest.hexdigest()
+
+
+async def synthesize(text: str) -> Tuple[bytes, str]:
     """
-    Speak the given text aloud using Edge TTS.
-    Blocking call (acceptable for MVP).
+    Return (audio_bytes, mime_type) for the given text.
+    Served from cache when possible; concurrent requests for the
+    same text share a single synthesis. The synthesis runs in its own
+    task, so a caller that times out or is cancelled never fails the
+    others (or the cache write).
     """
+    engine = get_engine()
+    cache = get_cache() if _cache is not None else await asyncio.to_thread(get_cache)
+    name = cache_key(text, engine.voice, engine.name) + engine.extension
+
+    cached = await asyncio.to_thread(cache.get, name)
+    if cached is not None:
+        return cached, engine.mime
+
+    task = _inflight.get(name)
+    if task is None:
+        task = _inflight[name] = asyncio.create_task(_synthesize(engine, cache, name, text))
+        task.add_done_callback(lambda done: _finished(name, done))
+
+    return await asyncio.shield(task), engine.mime
 
-    try:
-        with tempfile.NamedTemporaryFile(suffix=".mp3", delete=False) as tmp:
-            audio_path = tmp.name
 
-        subprocess.run([
-            "edge-tts",
-            "--voice", "en-US-AriaNeural",
-            "--text", text,
-            "--write-media", audio_path
-        ], check=True)
+async def _synthesize(engine, cache: AudioCache, name: str, text: str) -> bytes:
+    parts = []
+    async for chunk in engine.stream(text):
+        parts.append(chunk)
+    audio = b"".join(parts)
 
-        # Play audio (platform dependent)
-        if os.name == "nt":  # Windows
-            os.system(f'start {audio_path}')
-        else:  # Linux / Mac
-            os.system(f'afplay {audio_path}')
+    if not audio:
+        raise RuntimeError("TTS engine returned no audio")
 
-    except Exception as e:
-        print("TTS failed:", e)
+    await asyncio.to_thread(cache.put, name, audio)
+    return audio
+
+
+def _finished(name: str, task: "asyncio.Task"):
+    del _inflight[name]
+    # Mark retrieved so a failure nobody is waiting for does not warn
+    if not task.cancelled():
+        task.exception()
+
+
+async def prefetch(texts: Iterable[str]):
+    """
+    Warm the cache for upcoming questions. Failures are ignored.
+    """
+    for text in dict.fromkeys(texts):
+        try:
+            await synthesize(text)
+        except Exception as e:
+            print(f"TTS prefetch failed: {e}")
@@ -228,6 +228,481 @@ def test_rules():
         return False
 
 
+def test_rules_features():
+    """Test the extended rule features (fillers, diversity, skills, rate)"""
+    print("\nTesting rule features...")
+
+    from evaluation.rules import run_rules, run_rules_batch
+
+    text = "um so I built the api with python and docker um and the api used python"
+    result = run_rules(text, duration_seconds=6, skills=["python", "docker", "machine learning"])
+
+    assert result["word_count"] == 16
+    assert result["filler_count"] == 3                  # um, so, um
+    assert result["technical_terms"] == 3               # python, docker, python
+    assert result["repetition_rate"] == round(1 / 15, 4)  # "the api" twice
+    assert result["speaking_rate_wpm"] == 160.0
+
+    assert run_rules(text)["speaking_rate_wpm"] is None
+    assert run_rules("", skills=["python"])["empty_answer"]
+    assert run_rules("I used machine learning", skills=["machine learning"])["technical_terms"] == 1
+    long_skills = ["Ruby on Rails", "Google Cloud Platform", "rails"]
+    result = run_rules("We moved the Ruby on Rails app to google cloud platform.", skills=long_skills)
+    assert result["technical_terms"] == 3               # ruby on rails, rails, google cloud platform
+    assert run_rules("ruby - on rails", skills=["ruby on rails"])["technical_terms"] == 0  # broken phrase
+
+    # Batch and single scoring agree
+    texts = [text, "", "We shipped it on kubernetes in two weeks"]
+    assert run_rules_batch(texts, [6, None, 3], ["python"]) == [
+        run_rules(t, d, ["python"]) for t, d in zip(texts, [6, None, 3])
+    ]
+    print("✓ Rule features correct")
+
+
+def test_token_bucket():
+    """Test per-session rate limiting"""
+    print("\nTesting token bucket...")
+
+    from backend.admission import TokenBucket
+
+    bucket = TokenBucket(rate=100, burst=200)
+    assert bucket.consume(150)
+    assert not bucket.consume(100)          # only 50 left
+    assert bucket.consume(50)
+
+    bucket.updated -= 1.0                   # one second later: +100
+    assert bucket.consume(100)
+    assert not bucket.consume(1)
+
+    bucket.updated -= 10.0                  # refill is capped at burst
+    assert not bucket.consume(201)
+    assert bucket.consume(200)
+    print("✓ Token bucket working")
+
+
+def test_admission():
+    """Test admission slots, the wait queue, timeouts and release"""
+    print("\nTesting admission control...")
+
+    import asyncio
+    from backend.admission import AdmissionController
+
+    async def scenario():
+        controller = AdmissionController(max_active=1, max_queued=1, queue_timeout=0.3)
+        updates = []
+
+        async def on_update(position, wait):
+            updates.append(position)
+
+        assert await controller.acquire(on_update) is None      # admitted
+        assert controller.active == 1
+
+        queued = asyncio.create_task(controller.acquire(on_update))
+        await asyncio.sleep(0.05)
+        assert updates == [1]
+
+        # Queue full: rejected straight away with a wait estimate
+        assert await controller.acquire(on_update) > 0
+
+        # Release hands the slot to the queued session
+        controller.release(10)
+        assert await queued is None
+        assert controller.active == 1
+
+        # Nobody releases: the queued session times out
+        assert await controller.acquire(on_update) is not None
+        assert controller.active == 1 and not controller._waiters
+
+        controller.release(10)
+        assert controller.active == 0
+
+    async def disconnect_while_queued():
+        from backend.admission import ClientGone
+
+        controller = AdmissionController(max_active=1, max_queued=5, queue_timeout=5)
+
+        async def on_update(position, wait):
+            pass
+
+        def client():
+            closed = asyncio.Event()
+            return closed, closed.wait
+
+        assert await controller.acquire(on_update) is None      # A admitted
+
+        # B queues, then closes: it leaves the queue at once
+        b_closed, b_watch = client()
+        b = asyncio.create_task(controller.acquire(on_update, b_watch))
+        await asyncio.sleep(0.05)
+        b_closed.set()
+        try:
+            await asyncio.wait_for(b, 1.0)
+            assert False, "expected ClientGone"
+        except ClientGone:
+            pass
+        assert not controller._waiters
+
+        # A leaves: the slot is free, not held by the departed B
+        controller.release(10)
+        assert controller.active == 0
+        assert await controller.acquire(on_update) is None      # C admitted straight away
+
+        # D is handed the slot in the same tick it closes: E gets it instead
+        d_closed, d_watch = client()
+        d = asyncio.create_task(controller.acquire(on_update, d_watch))
+        e = asyncio.create_task(controller.acquire(on_update, client()[1]))
+        await asyncio.sleep(0.05)
+        controller.release(10)
+        d_closed.set()
+        try:
+            await d
+            assert False, "expected ClientGone"
+        except ClientGone:
+            pass
+        assert await e is None
+        assert controller.active == 1
+
+    asyncio.run(scenario())
+    asyncio.run(disconnect_while_queued())
+    print("✓ Admission control working")
+
+
+def test_transcript_protocol():
+    """Test transcript delta / snapshot sequencing"""
+    print("\nTesting transcript protocol...")
+
+    from backend.transcript import Transcript
+
+    transcript = Transcript(snapshot_every=3)
+    first = transcript.append(" hello ")
+    message = transcript.delta_message([first])
+    assert message == {"type": "transcript_delta", "seq": 1, "segments": [{"id": 0, "text": "hello"}]}
+
+    second = transcript.append("world")
+    assert transcript.delta_message([second])["seq"] == 2
+
+    # Every third message is a full snapshot
+    third = transcript.revise(0, "hi")
+    message = transcript.delta_message([third])
+    assert message["type"] == "transcript_snapshot" and message["seq"] == 3
+    assert [s["text"] for s in message["segments"]] == ["hi", "world"]
+    assert transcript.text() == "hi world"
+
+    # Resync on request; ids and seq keep increasing across answers
+    assert transcript.snapshot_message()["seq"] == 4
+    transcript.clear()
+    assert transcript.text() == ""
+    assert transcript.append("next")["id"] == 2
+    assert transcript.delta_message([])["seq"] == 5
+    print("✓ Transcript sequencing correct")
+
+
+def test_static_assets():
+    """Test precompressed static assets, ETags and 304s"""
+    print("\nTesting static assets...")
+
+    import gzip
+    from starlette.requests import Request
+    from backend.static import StaticAsset, choose_encoding, serve
+
+    asset = StaticAsset("app.js", b"console.log('interview');\n" * 100)
+    tiny = StaticAsset("tiny.js", b"x")
+
+    assert gzip.decompress(asset.variants["gzip"]) == asset.variants["identity"]
+    assert "gzip" not in tiny.variants                   # too small to compress
+    assert choose_encoding(asset, "gzip, deflate") == "gzip"
+    assert choose_encoding(asset, "gzip;q=0") == "identity"
+    assert choose_encoding(asset, None) == "identity"
+    assert choose_encoding(tiny, "gzip") == "identity"
+    if "br" in asset.variants:
+        assert choose_encoding(asset, "gzip, br") == "br"
+        assert choose_encoding(asset, "br;q=0, gzip") == "gzip"
+
+    def request(query: str = "", **headers):
+        return Request({
+            "type": "http", "method": "GET", "path": "/frontend/app.js",
+            "query_string": query.encode(),
+            "headers": [(k.replace("_", "-").encode(), v.encode()) for k, v in headers.items()],
+        })
+
+    response = serve(request(accept_encoding="gzip"), asset)
+    assert response.status_code == 200
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.headers["vary"] == "Accept-Encoding"
+    assert response.headers["cache-control"] == "no-cache"
+    assert response.headers["etag"] == asset.etag("gzip") != asset.etag("identity")
+
+    versioned = serve(request(f"v={asset.version}"), asset)
+    assert "immutable" in versioned.headers["cache-control"]
+
+    not_modified = serve(request(accept_encoding="gzip", if_none_match=asset.etag("gzip")), asset)
+    assert not_modified.status_code == 304 and not not_modified.body
+
+    # An ETag for another encoding does not match
+    assert serve(request(if_none_match=asset.etag("gzip")), asset).status_code == 200
+    print("✓ Static assets served correctly")
+
+
+def test_report_builder():
+    """Test incremental report aggregation"""
+    print("\nTesting report builder...")
+
+    from interview.question_generator import generate_question_plan
+    from evaluation.report import ReportBuilder
+
+    parsed_resume = {
+        "skills": ["python", "docker"],
+        "projects": ["Chat service in Python"],
+        "experience": [],
+    }
+    plan = generate_question_plan(parsed_resume)
+    builder = ReportBuilder("test", plan, parsed_resume)
+
+    builder.add(0, "answer", {"score": 8, "graded_by": "llm"})      # project, mentions python
+    builder.add(1, "", {"score": 0})                                # skipped
+    builder.add(5, "answer", {"score": 4, "graded_by": "rules"})    # first python question
+    builder.add(8, "answer", {"score": 6, "graded_by": "llm"})      # first docker question
+    builder.add(9, "answer", {"score": 5, "graded_by": "unavailable"})
+
+    report = builder.report(completed=False)
+    overall = report["overall"]
+    assert overall["answered"] == 3 and overall["processed"] == 5 and overall["skipped"] == 1
+    assert overall["average_score"] == 6.0 and overall["min_score"] == 4 and overall["max_score"] == 8
+    assert overall["graded_by"] == {"llm": 2, "rules": 1, "unavailable": 1}
+
+    skills = {s["skill"]: s for s in report["skills"]}
+    assert skills["python"]["answered"] == 2 and skills["python"]["average_score"] == 6.0
+    assert skills["docker"]["answered"] == 1 and skills["docker"]["average_score"] == 6.0
+    assert report["kinds"]["project"]["answered"] == 1
+    assert report["questions"][4]["score"] is None                  # listed, not scored
+
+    page = builder.html(report)
+    assert page.count("<tr>") == 1 + len(report["skills"]) + 1 + 5
+    print("✓ Report aggregates correct")
+
+
+def _fake_nodes(*servers):
+    """Ollama endpoints for fake servers, or for dead ports when None"""
+    import socket
+    from evaluation.ollama_client import Endpoint
+
+    nodes = []
+    for server in servers:
+        if server is None:
+            with socket.socket() as s:              # free port, closed again: refused
+                s.bind(("127.0.0.1", 0))
+                port = s.getsockname()[1]
+        else:
+            port = server.server_address[1]
+        nodes.append(Endpoint(f"http://127.0.0.1:{port}/api/generate"))
+    return nodes
+
+
+def test_ollama_routing():
+    """Test least-outstanding routing and retry on another node (fake Ollama)"""
+    print("\nTesting Ollama routing...")
+
+    from benchmarks.fake_ollama import start_in_background
+    from evaluation import ollama_client
+    from evaluation.ollama_client import ENDPOINT_REQUESTS
+
+    # Fresh servers per case: the request counters are labelled by URL
+    healthy = [start_in_background() for _ in range(4)]
+    failing = start_in_background(failure_rate=1.0)
+    saved = ollama_client.endpoints
+    payload = {"model": "llama3", "prompt": "test", "stream": False}
+
+    def ok(node):
+        return ENDPOINT_REQUESTS.value(endpoint=node.name, outcome="ok")
+
+    def errors(node):
+        return ENDPOINT_REQUESTS.value(endpoint=node.name, outcome="error")
+
+    try:
+        # Least outstanding first, whatever the list order or latency
+        busy, idle = ollama_client.endpoints = _fake_nodes(*healthy[:2])
+        busy.outstanding = 2
+        idle.latency_ewma = 5.0
+        assert ollama_client.generate(payload).status_code == 200
+        assert ok(idle) == 1 and ok(busy) == 0
+        busy.outstanding = 0
+
+        # Ties go to the lower latency EWMA
+        assert ollama_client.generate(payload).status_code == 200
+        assert ok(busy) == 1
+
+        # HTTP 5xx: retried on the other node
+        bad, good = ollama_client.endpoints = _fake_nodes(failing, healthy[2])
+        good.latency_ewma = 1.0
+        assert ollama_client.generate(payload).status_code == 200
+        assert errors(bad) == 1 and ok(good) == 1
+        assert bad.breaker.consecutive_failures == 1 and bad.outstanding == 0
+
+        # Refused connection: retried on the other node
+        dead, good = ollama_client.endpoints = _fake_nodes(None, healthy[3])
+        good.latency_ewma = 1.0
+        assert ollama_client.generate(payload).status_code == 200
+        assert errors(dead) == 1 and ok(good) == 1
+
+        # Every node failing: the last 5xx goes back to the caller
+        dead, bad = ollama_client.endpoints = _fake_nodes(None, failing)
+        bad.latency_ewma = 1.0
+        assert ollama_client.generate(payload).status_code == 500
+    finally:
+        ollama_client.endpoints = saved
+        for server in healthy + [failing]:
+            server.shutdown()
+            server.server_close()
+
+    print("✓ Ollama routing working")
+
+
+def test_ollama_breaker():
+    """Test breaker transitions: closed -> open -> half-open via /api/tags -> closed"""
+    print("\nTesting Ollama circuit breaker...")
+
+    import time
+    from benchmarks.fake_ollama import start_in_background
+    from evaluation import ollama_client
+    from evaluation.ollama_client import CLOSED, HALF_OPEN, OPEN, CircuitOpenError
+
+    server = start_in_background(failure_rate=1.0)
+    saved = ollama_client.endpoints
+    payload = {"model": "llama3", "prompt": "test", "stream": False}
+
+    def wait_for(state):
+        deadline = time.monotonic() + 3.0
+        while breaker.state != state and time.monotonic() < deadline:
+            time.sleep(0.02)
+        return breaker.state == state
+
+    try:
+        (node,) = ollama_client.endpoints = _fake_nodes(server)
+        breaker = node.breaker
+        breaker.probe_interval = 0.1
+
+        # Consecutive failures open the breaker
+        for _ in range(breaker.failure_threshold):
+            assert breaker.state == CLOSED
+            assert ollama_client.generate(payload).status_code == 500
+        assert breaker.state == OPEN
+
+        # Open: fail fast without calling the node
+        try:
+            ollama_client.generate(payload)
+            assert False, "expected CircuitOpenError"
+        except CircuitOpenError:
+            pass
+        assert ollama_client.health()["state"] == OPEN
+
+        # /api/tags answers: half-open; the failed trial request opens it again
+        assert wait_for(HALF_OPEN)
+        assert ollama_client.generate(payload).status_code == 500
+        assert breaker.state == OPEN
+
+        # Node recovered: next probe half-opens it, the trial request closes it
+        server.RequestHandlerClass.failure_rate = 0.0
+        assert wait_for(HALF_OPEN)
+        assert ollama_client.generate(payload).status_code == 200
+        assert breaker.state == CLOSED and breaker.consecutive_failures == 0
+        assert ollama_client.health()["state"] == CLOSED
+    finally:
+        ollama_client.endpoints = saved
+        server.shutdown()
+        server.server_close()
+
+    print("✓ Ollama circuit breaker working")
+
+
+def test_rescore():
+    """Test offline re-scoring: short answers are final, LLM fallbacks fail the record"""
+    print("\nTesting offline re-scoring...")
+
+    import json
+    import tempfile
+    from benchmarks.fake_ollama import start_in_background
+    from evaluation import ollama_client
+    from evaluation.rescore import run
+
+    record = {
+        "record_id": "abc",
+        "parsed_resume": {"skills": ["python"]},
+        "answers": [
+            {"question_index": 0, "transcript": "I don't know really",
+             "result": {"score": 2, "graded_by": "rules"}},
+            {"question_index": 1, "transcript": (
+                "I built a Python service that parsed uploaded files, validated them "
+                "against a schema and stored the results, then I added caching because "
+                "the same files were uploaded many times by different users."
+            ), "result": {"score": 6, "graded_by": "rules", "deferred_rescore": True}},
+        ],
+    }
+
+    server = start_in_background()
+    saved = ollama_client.endpoints
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            records = os.path.join(tmp, "records.jsonl")
+            output = os.path.join(tmp, "out.jsonl")
+            checkpoint = output + ".checkpoint"
+            with open(records, "w", encoding="utf-8") as f:
+                f.write(json.dumps(record) + "\n")
+
+            # LLM fallback (HTTP 500): the record fails and is not checkpointed
+            failing = start_in_background(failure_rate=1.0)
+            ollama_client.endpoints = _fake_nodes(failing)
+            stats = run(records, output, checkpoint, 1, only_deferred=True)
+            failing.shutdown()
+            failing.server_close()
+            assert stats["failed"] == 1 and stats["rescored"] == 0
+            assert not os.path.getsize(checkpoint)
+
+            # Ollama up: the short answer keeps its rules grade, the rest is LLM-graded
+            ollama_client.endpoints = _fake_nodes(server)
+            for only_deferred in (True, False):
+                os.remove(checkpoint)
+                stats = run(records, output, checkpoint, 1, only_deferred=only_deferred)
+                assert stats["failed"] == 0 and stats["rescored"] == 1 and stats["answers"] == 2
+
+            with open(output, encoding="utf-8") as f:
+                graded = [a["result"]["graded_by"] for a in json.loads(f.readline())["answers"]]
+            assert graded == ["rules", "llm"]
+
+            # Rerun: checkpointed records are skipped
+            assert run(records, output, checkpoint, 1, only_deferred=False)["skipped"] == 1
+    finally:
+        ollama_client.endpoints = saved
+        server.shutdown()
+        server.server_close()
+
+    print("✓ Re-scoring working")
+
+
+def test_decision_probability():
+    """Test the rules classifier's probability stays finite for extreme models"""
+    print("\nTesting decision probability...")
+
+    import numpy as np
+    from evaluation.decision import FEATURES, acceptable_probability
+    from evaluation.rules import run_rules
+
+    rules = run_rules("I built the api with python and docker and tested it well " * 3)
+    model = {
+        "intercept": 0.0,
+        "coefficients": np.full(len(FEATURES), 1e4),
+        "mean": np.zeros(len(FEATURES)),
+        "scale": np.ones(len(FEATURES)),
+    }
+    assert acceptable_probability(rules, model) == 1.0
+
+    model["coefficients"] = -model["coefficients"]     # z far below -709
+    assert acceptable_probability(rules, model) == 0.0
+
+    model["coefficients"] = np.zeros(len(FEATURES))
+    assert acceptable_probability(rules, model) == 0.5
+    print("✓ Decision probability stable")
+
+
 def test_file_structure():
     """Test if all required files exist"""
     print("\nTesting file structure...")
@@ -263,6 +738,18 @@ def test_file_structure():
         return False
 
 
+def _check(test) -> bool:
+    """Run an assert-based test for the summary below"""
+    try:
+        test()
+        return True
+    except AssertionError as e:
+        print(f"✗ {test.__name__} failed: {e}")
+    except Exception as e:
+        print(f"✗ {test.__name__} errored: {e!r}")
+    return False
+
+
 def main():
     print("=" * 60)
     print("AI Interview System - Component Test")
@@ -278,6 +765,16 @@ def main():
     results.append(("Resume Parser", test_resume_parser()))
     results.append(("Question Generator", test_question_generator()))
     results.append(("Rules", test_rules()))
+    results.append(("Rule Features", _check(test_rules_features)))
+    results.append(("Token Bucket", _check(test_token_bucket)))
+    results.append(("Admission", _check(test_admission)))
+    results.append(("Transcript", _check(test_transcript_protocol)))
+    results.append(("Static Assets", _check(test_static_assets)))
+    results.append(("Report Builder", _check(test_report_builder)))
+    results.append(("Ollama Routing", _check(test_ollama_routing)))
+    results.append(("Ollama Breaker", _check(test_ollama_breaker)))
+    results.append(("Re-scoring", _check(test_rescore)))
+    results.append(("Decision", _check(test_decision_probability)))
     
     # Summary
     print("\n" + "=" * 60)